@@ -0,0 +1,58 @@
+"""
+Measures how long the spatial dispersion measures take on a big batch of
+random points handed over as NumPy arrays.
+
+    $ python benchmarks/dispersion.py
+    standard_distance                        112.4 ms
+    standard_deviational_ellipse             110.1 ms
+    standard_deviational_ellipse, weighted   234.0 ms
+"""
+import os
+import sys
+import time
+
+import numpy
+
+# Run the checkout this script sits in, not whatever is installed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import calculate  # noqa: E402
+
+N = 10000000
+RUNS = 5
+
+
+def time_it(func, *args, **kwargs):
+    """
+    Returns the fastest number of seconds the function took across a few
+    runs.
+    """
+    results = []
+    for i in range(RUNS):
+        start = time.time()
+        func(*args, **kwargs)
+        results.append(time.time() - start)
+    return min(results)
+
+
+if __name__ == '__main__':
+    rng = numpy.random.RandomState(0)
+    xs = rng.normal(-118.25, 0.1, N)
+    ys = 0.5 * xs + rng.normal(34.05, 0.05, N)
+    weights = rng.random_sample(N)
+    coords = calculate.Coordinates(xs, ys)
+    cases = [
+        ('standard_distance', calculate.standard_distance, {}),
+        (
+            'standard_deviational_ellipse',
+            calculate.standard_deviational_ellipse,
+            {}
+        ),
+        (
+            'standard_deviational_ellipse, weighted',
+            calculate.standard_deviational_ellipse,
+            {'weight': weights}
+        ),
+    ]
+    for label, func, kwargs in cases:
+        elapsed = time_it(func, coords, **kwargs)
+        print('%-38s %7.1f ms' % (label, elapsed * 1000))
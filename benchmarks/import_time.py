@@ -0,0 +1,61 @@
+"""
+Measures how long it takes to import calculate in a fresh interpreter.
+
+The functions are loaded the first time they're used, so a plain import
+should be quick. For comparison, the script also times loading everything,
+which is about what every import used to cost, and loading one function,
+which is about what a typical short-lived script pays.
+
+    $ python benchmarks/import_time.py
+    import calculate                         4.9 ms
+    import calculate; calculate.age          7.2 ms
+    import calculate; load everything      171.5 ms
+"""
+import os
+import subprocess
+import sys
+
+# Run the checkout this script sits in, not whatever is installed
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RUNS = 15
+
+CASES = [
+    ('import calculate', 'import calculate'),
+    ('import calculate; calculate.age', 'import calculate; calculate.age'),
+    (
+        'import calculate; load everything',
+        'import calculate\n'
+        'for name in calculate.DJANGO_MODULES:\n'
+        '    getattr(calculate, name)\n'
+        'calculate.HAS_GEODJANGO'
+    ),
+]
+
+TIMER = '''
+import time
+start = time.perf_counter()
+%s
+print(time.perf_counter() - start)
+'''
+
+
+def time_it(code):
+    """
+    Returns the median number of seconds the code took across many
+    fresh interpreters.
+    """
+    results = []
+    for i in range(RUNS):
+        output = subprocess.check_output(
+            [sys.executable, '-c', TIMER % code],
+            cwd=ROOT,
+        )
+        results.append(float(output))
+    results.sort()
+    return results[len(results) // 2]
+
+
+if __name__ == '__main__':
+    for label, code in CASES:
+        print('%-38s %7.1f ms' % (label, time_it(code) * 1000))
@@ -0,0 +1,153 @@
+"""
+Compares handing querysets to calculate with the database doing the work
+against loading every row into Python first.
+
+It builds a throwaway SQLite database in memory. If GeoDjango and the
+SpatiaLite extension are installed, the database is a SpatiaLite one and
+the spatial functions are timed too.
+
+    $ python benchmarks/querysets.py
+    rows: 100000
+                                   database     python
+    competition_rank                 9.2 ms   943.3 ms
+    ordinal_rank                    11.0 ms   969.7 ms
+    competition_ranks              213.0 ms   995.6 ms
+    ordinal_ranks                  355.6 ms   957.8 ms
+"""
+import os
+import random
+import sys
+import time
+
+import django
+from django.conf import settings
+
+# Run the checkout this script sits in, not whatever is installed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import calculate  # noqa: E402
+from calculate import querysets  # noqa: E402
+
+ROWS = 100000
+RUNS = 3
+
+SPATIAL = calculate.HAS_GEODJANGO
+settings.configure(
+    DATABASES={
+        'default': {
+            'ENGINE': 'django.contrib.gis.db.backends.spatialite'
+            if SPATIAL else 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+        }
+    },
+    INSTALLED_APPS=['django.contrib.gis'] if SPATIAL else [],
+)
+django.setup()
+
+from django.db import connection, models  # noqa: E402
+
+if SPATIAL:
+    from django.contrib.gis.db.models import PointField
+    from django.contrib.gis.geos import Point
+
+
+class Player(models.Model):
+    name = models.CharField(max_length=30)
+    home_runs = models.IntegerField()
+    if SPATIAL:
+        point = PointField()
+
+    class Meta:
+        app_label = 'benchmarks'
+
+
+def build():
+    """
+    Makes the table and fills it with random rows.
+    """
+    if SPATIAL:
+        connection.cursor().execute('SELECT InitSpatialMetaData(1)')
+    with connection.schema_editor() as editor:
+        editor.create_model(Player)
+    rng = random.Random(0)
+    players = []
+    for i in range(ROWS):
+        player = Player(name=str(i), home_runs=rng.randint(0, 800))
+        if SPATIAL:
+            # Round some off so there are a few duplicates to nudge
+            player.point = Point(
+                round(rng.uniform(-118.5, -118.0), 3),
+                round(rng.uniform(33.7, 34.3), 3),
+                srid=4326
+            )
+        players.append(player)
+    Player.objects.bulk_create(players, batch_size=5000)
+
+
+def time_it(func):
+    """
+    Returns the fastest number of seconds the function took across a few
+    runs, with the database doing the work and without, along with what
+    it returned each way.
+    """
+    results = []
+    outputs = []
+    for enabled in [True, False]:
+        querysets.ENABLED = enabled
+        runs = []
+        for i in range(RUNS):
+            start = time.time()
+            output = func()
+            runs.append(time.time() - start)
+        results.append(min(runs))
+        outputs.append(output)
+    querysets.ENABLED = True
+    return results, outputs
+
+
+if __name__ == '__main__':
+    build()
+    # A fresh queryset every time, so the rows aren't cached
+    qs = Player.objects.all
+    player = qs().get(pk=ROWS // 2)
+    cases = [
+        (
+            'competition_rank',
+            lambda: calculate.competition_rank(qs(), player, 'home_runs')
+        ),
+        (
+            'ordinal_rank',
+            lambda: calculate.ordinal_rank(qs(), player, 'home_runs')
+        ),
+        (
+            'competition_ranks',
+            lambda: calculate.competition_ranks(qs(), 'home_runs')
+        ),
+        (
+            'ordinal_ranks',
+            lambda: calculate.ordinal_ranks(qs(), 'home_runs')
+        ),
+    ]
+    if SPATIAL:
+        cases += [
+            ('mean_center', lambda: calculate.mean_center(qs())),
+            (
+                'standard_deviation_distance',
+                lambda: calculate.standard_deviation_distance(qs())
+            ),
+            (
+                'nudge_points',
+                lambda: calculate.nudge_points(qs(), changed_only=True)
+            ),
+        ]
+    print('rows: %s' % ROWS)
+    print('%-28s %10s %10s' % ('', 'database', 'python'))
+    for label, func in cases:
+        (database, python), outputs = time_it(func)
+        # The ranks should come out exactly the same either way
+        if 'rank' in label:
+            assert outputs[0] == outputs[1], label
+        print('%-28s %7.1f ms %7.1f ms' % (
+            label,
+            database * 1000,
+            python * 1000
+        ))
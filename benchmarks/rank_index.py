@@ -0,0 +1,78 @@
+"""
+Measures how long it takes to keep ranks current as batches of returns
+come in, by re-ranking the whole list each time or by keeping a
+calculate.RankIndex up to date.
+
+    $ python benchmarks/rank_index.py
+    re-rank the whole list, per batch         301.7 ms
+    update a RankIndex, per batch              54.9 ms
+"""
+import os
+import random
+import sys
+import time
+
+# Run the checkout this script sits in, not whatever is installed
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import calculate  # noqa: E402
+
+N = 100000
+BATCH = 1000
+BATCHES = 20
+
+
+class Precinct(object):
+
+    def __init__(self, votes):
+        self.votes = votes
+
+
+def batches(precincts, rng):
+    """
+    Yields lists of precincts that have just reported more votes.
+    """
+    for i in range(BATCHES):
+        batch = rng.sample(precincts, BATCH)
+        for precinct in batch:
+            precinct.votes += rng.randint(0, 500)
+        yield batch
+
+
+def rerank(precincts, rng):
+    for batch in batches(precincts, rng):
+        ranks = calculate.competition_ranks(precincts, 'votes')
+        percentiles = calculate.percentile_many(
+            [p.votes for p in precincts],
+            [p.votes for p in batch]
+        )
+        assert ranks and percentiles
+
+
+def incremental(precincts, rng):
+    index = calculate.RankIndex(precincts, 'votes')
+    for batch in batches(precincts, rng):
+        for precinct in batch:
+            index.update(precinct)
+        ranks = [index.competition_rank(p) for p in batch]
+        percentiles = [index.percentile(p.votes) for p in batch]
+        assert ranks and percentiles
+
+
+def time_it(func):
+    """
+    Returns the number of seconds the function took on a fresh list.
+    """
+    rng = random.Random(0)
+    precincts = [Precinct(rng.randint(0, 10000)) for i in range(N)]
+    start = time.time()
+    func(precincts, rng)
+    return time.time() - start
+
+
+if __name__ == '__main__':
+    for label, func in [
+        ('re-rank the whole list, per batch', rerank),
+        ('update a RankIndex, per batch', incremental),
+    ]:
+        elapsed = time_it(func) / BATCHES
+        print('%-40s %6.1f ms' % (label, elapsed * 1000))
@@ -1,112 +1,150 @@
 from __future__ import absolute_import
-from .age import age
-from .adjusted_monthly_value import adjusted_monthly_value
-from .at_percentile import at_percentile
-from .benfords_law import benfords_law
-from .competition_rank import competition_rank
-from .date_range import date_range
-from .decile import decile
-from .elfi import elfi
-from .equal_sized_breakpoints import equal_sized_breakpoints
-from .margin_of_victory import margin_of_victory
-from .mean import mean
-from .median import median
-from .mode import mode
-from .ordinal_rank import ordinal_rank
-from .pearson import pearson
-from .per_capita import per_capita
-from .per_sqmi import per_sqmi
-from .percentage_change import percentage_change
-from .percentage import percentage
-from .percentile import percentile
-from .range import range
-from .split_at_breakpoints import split_at_breakpoints
-from .standard_deviation import standard_deviation
-from .summary_stats import summary_stats
-from .variation_coefficient import variation_coefficient
+import sys
+from importlib import import_module
 
 DJANGO_MODULES = [
     'age',
     'adjusted_monthly_value',
     'at_percentile',
     'benfords_law',
+    'benfords_law_by_group',
+    'breakpoint_bins',
+    'classify',
     'competition_rank',
+    'CompetitionRanker',
+    'competition_ranks',
+    'Coordinates',
     'date_range',
     'decile',
     'elfi',
+    'equal_interval_breakpoints',
     'equal_sized_breakpoints',
+    'head_tail_breakpoints',
+    'jenks_breakpoints',
     'margin_of_victory',
+    'mean_center',
+    'mean_centers',
     'mean',
     'median',
+    'mmap_column',
     'mode',
+    'nudge_points',
     'ordinal_rank',
+    'ordinal_ranks',
     'pearson',
+    'PearsonAccumulator',
+    'pearson_matrix',
     'per_capita',
     'per_sqmi',
     'percentage_change',
     'percentage',
     'percentile',
+    'PercentileIndex',
+    'percentile_many',
     'range',
+    'QuantileSketch',
+    'random_point',
+    'random_points',
+    'RankIndex',
+    'Sample',
+    'SampleCache',
     'split_at_breakpoints',
     'standard_deviation',
+    'standard_deviation_breakpoints',
+    'standard_deviation_distance',
+    'standard_deviational_ellipse',
+    'standard_distance',
+    'SummaryAccumulator',
     'summary_stats',
+    'values_array',
     'variation_coefficient',
 ]
+
+# Every function works without GeoDjango, so the same names are always
+# exported and "from calculate import *" can use the list as is
 __all__ = DJANGO_MODULES
 
-# Test whether Django is installed
-try:
-    import django
-    assert django
-    HAS_DJANGO = True
-    from django.conf import settings
-    if not settings.configured:
-        settings.configure(DEBUG=True, TEMPLATE_DEBUG=True, TEMPLATE_DIRS=())
+# The few names that don't live in a module of their own name
+_SOURCES = {
+    'CompetitionRanker': 'competition_ranker',
+    'Coordinates': 'geometry',
+    'PearsonAccumulator': 'pearson_accumulator',
+    'PercentileIndex': 'percentile_index',
+    'QuantileSketch': 'sketch',
+    'RankIndex': 'rank_index',
+    'Sample': 'sample',
+    'SampleCache': 'sample',
+    'SummaryAccumulator': 'summary_accumulator',
+}
+
+
+def _has_django():
+    # Test whether Django is installed, without configuring it
     try:
-        from django.contrib.gis.geos.libgeos import geos_version
-        from django.contrib.gis.geos.libgeos import geos_version_info
-        assert geos_version
-        assert geos_version_info
-        HAS_GEODJANGO = True
+        import django
+        assert django
+    except ImportError:
+        return False
+    return True
+
+
+def _has_geodjango():
+    # Test whether GeoDjango and the GEOS library it needs are installed
+    if not _has_django():
+        return False
+    try:
+        from django.core.exceptions import ImproperlyConfigured
     except ImportError:
-        HAS_GEODJANGO = False
-except ImportError:
-    HAS_DJANGO, HAS_GEODJANGO = False, False
-
-# If it is, import all the functions that, at least for now, require GeoDjango
-if HAS_DJANGO and HAS_GEODJANGO:
-    __all__ = [
-        'age',
-        'adjusted_monthly_value',
-        'at_percentile',
-        'benfords_law',
-        'competition_rank',
-        'date_range',
-        'decile',
-        'elfi',
-        'equal_sized_breakpoints',
-        'margin_of_victory',
-        'mean',
-        'median',
-        'mode',
-        'ordinal_rank',
-        'pearson',
-        'per_capita',
-        'per_sqmi',
-        'percentage_change',
-        'percentage',
-        'percentile',
-        'range',
-        'split_at_breakpoints',
-        'standard_deviation',
-        'summary_stats',
-        'random_point',
-        'mean_center',
-        'nudge_points',
-        'standard_deviation_distance',
-        'variation_coefficient',
-    ]
-    from .random_point import random_point
-    from .mean_center import mean_center
-    from .nudge_points import nudge_points
-    from .standard_deviation_distance import standard_deviation_distance
+        return False
+    # Make sure the libraries can actually be loaded. Newer versions of
+    # Django go looking for GDAL as soon as GEOS is imported.
+    try:
+        from django.contrib.gis.geos.libgeos import geos_version_info
+        geos_version_info()
+    except (ImportError, OSError, ImproperlyConfigured):
+        return False
+    return True
+
+
+def _load(name):
+    # Import the module and pull out the function or class
+    module = import_module('.' + _SOURCES.get(name, name), __name__)
+    obj = getattr(module, name)
+    # Stash it here so we don't come back, replacing the module
+    # the import system just left under the same name
+    globals()[name] = obj
+    return obj
+
+
+def __getattr__(name):
+    """
+    Imports the functions and classes the first time they're used, which
+    keeps "import calculate" quick.
+
+    Django isn't imported, or configured, until HAS_DJANGO or HAS_GEODJANGO
+    is checked, or GeoDjango objects are handed to the spatial functions.
+    """
+    if name in DJANGO_MODULES:
+        return _load(name)
+    if name == 'HAS_DJANGO':
+        globals()[name] = _has_django()
+        return globals()[name]
+    if name == 'HAS_GEODJANGO':
+        globals()[name] = _has_geodjango()
+        return globals()[name]
+    raise AttributeError(
+        "module '%s' has no attribute '%s'" % (__name__, name)
+    )
+
+
+def __dir__():
+    return sorted(set(globals()) | set(DJANGO_MODULES) | set(
+        ['HAS_DJANGO', 'HAS_GEODJANGO']
+    ))
+
+
+# Versions of Python before 3.7 don't support __getattr__ on modules,
+# so everything has to be loaded up front.
+if sys.version_info < (3, 7):
+    for _name in DJANGO_MODULES + ['HAS_DJANGO', 'HAS_GEODJANGO']:
+        __getattr__(_name)
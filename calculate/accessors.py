@@ -0,0 +1,39 @@
+from operator import attrgetter
+from types import FunctionType
+
+
+def get_accessor(obj_list, key):
+    """
+    Accepts a list of objects and the key used to pull a value out of them.
+    Returns a function that accepts one object and returns its value.
+
+    The way the value is retrieved is chosen once, up front, rather than
+    being figured out again for every object.
+
+        1. If the key is a function or a lambda, it is called with
+           the object.
+
+        2. If the objects are dictionaries, the key is looked up
+           with get().
+
+        3. Otherwise the objects are assumed to have an attribute
+           with the name of the key.
+
+    h3. Example usage
+
+        >> from calculate.accessors import get_accessor
+        >> gettr = get_accessor([{'value': 1}], 'value')
+        >> gettr({'value': 2})
+        2
+    """
+    # If we've passed in a lambda or function as
+    # our key, we need to act accordingly.
+    if isinstance(key, FunctionType):
+        return key
+    # If the objects are dicts we'll need to pull keys
+    if obj_list and isinstance(obj_list[0], type({})):
+        def getkey(obj):
+            return obj.get(key)
+        return getkey
+    # ... otherwise just assume the list is full of objects with attributes
+    return attrgetter(key)
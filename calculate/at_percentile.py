@@ -1,4 +1,9 @@
 import math
+import calculate
+from calculate import columns
+from calculate import numpy_backend
+from calculate import sample
+from calculate import selection
 
 
 def at_percentile(data_list, value, interpolation='fraction'):
@@ -23,6 +28,16 @@ def at_percentile(data_list, value, interpolation='fraction'):
 
             The higher of the two bordering values.
 
+    You can also provide a list of percentiles, in which case a list of
+    values is returned. They are all found together with one pass of
+    calculate.selection, which is much faster than sorting the whole list.
+
+    A calculate.Sample or calculate.RankIndex, which are already sorted,
+    can be passed in place of the list.
+
+    If the data are too big to hold in memory, you can pass in a
+    calculate.QuantileSketch instead and get back estimates.
+
     h3. Example usage
 
         >>> import calculate
@@ -32,6 +47,8 @@ def at_percentile(data_list, value, interpolation='fraction'):
         3.0
         >>> calculate.at_percentile([1, 2, 3, 4], 75, interpolation='higher')
         4.0
+        >>> calculate.at_percentile([1, 2, 3, 4], [25, 50, 75])
+        [1.75, 2.5, 3.25]
 
     h3. Documentation
 
@@ -42,38 +59,94 @@ def at_percentile(data_list, value, interpolation='fraction'):
         This function is a modification of scipy.stats.scoreatpercentile. The
         only major difference is that I eliminated the numpy dependency.
     """
-    # Convert all the values to floats and test to make sure there aren't
-    # any strings in there
-    try:
-        data_list = list(map(float, data_list))
-    except ValueError:
-        raise ValueError('Input values should contain numbers')
+    # Validate the interpolation method up front
+    if interpolation not in ['fraction', 'lower', 'higher']:
+        raise ValueError("The interpolation kwarg must be 'fraction', 'lower' \
+or 'higher'. You can also opt to leave it out and rely on the default method.")
 
-    # Sort the list
-    data_list.sort()
+    # A sketch can estimate the values for us
+    if isinstance(data_list, calculate.QuantileSketch):
+        return data_list.at_percentile(value, interpolation=interpolation)
+
+    # Allow for a list of percentiles, but remember if we got just one
+    if isinstance(value, (list, tuple)):
+        percentile_list = value
+    else:
+        percentile_list = [value]
+
+    # Use a sorted sample or index, if we've been handed one or have
+    # one cached
+    data_list = sample.cached(data_list)
+    if isinstance(data_list, (calculate.Sample, calculate.RankIndex)):
+        data_list = data_list.values
+        array = None
+        presorted = True
+    else:
+        # Arrays and other buffers can be handed off to NumPy,
+        # if it's installed
+        array = numpy_backend.as_array(data_list)
+        presorted = False
+    if array is None and not presorted:
+        # Convert all the values to floats and test to make sure there
+        # aren't any strings in there
+        try:
+            data_list = columns.floats(data_list)
+        except ValueError:
+            raise ValueError('Input values should contain numbers')
 
     # Find the number of values in the sample
-    n = float(len(data_list))
-
-    # Find the index of the provided percentile
-    i = ((n - 1) / float(100)) * float(value)
-
-    # Test if that index has a remainder after the decimal point
-    remainder = str(i - int(i))[1:]
-
-    # If it doesn't just pull the number at the index
-    if remainder == '.0':
-        return data_list[int(i)]
-
-    # If it does, interpolate a result using the method provided
-    l = data_list[int(math.floor(i))]
-    h = data_list[int(math.ceil(i))]
-    if interpolation == 'fraction':
-        return l + ((h - l) * float(remainder))
-    elif interpolation == 'lower':
-        return l
-    elif interpolation == 'higher':
-        return h
+    if array is None:
+        n = float(len(data_list))
     else:
-        raise ValueError("The interpolation kwarg must be 'fraction', 'lower' \
-or 'higher'. You can also opt to leave it out and rely on the default method.")
+        n = float(array.size)
+
+    # Find the index of each of the provided percentiles
+    index_list = [
+        ((n - 1) / float(100)) * float(percentile)
+        for percentile in percentile_list
+    ]
+
+    # Figure out the positions of the values bordering each index.
+    # Rounding can push the index of the 100th percentile a hair past
+    # the end of the list, so the upper position is kept inside it.
+    bounds_list = [
+        (int(math.floor(i)), min(int(math.ceil(i)), int(n) - 1))
+        for i in index_list
+    ]
+    position_list = sorted(set(p for bounds in bounds_list for p in bounds))
+
+    # Pull out the values at all of those positions in a single pass,
+    # rather than sorting the entire list.
+    if presorted:
+        value_list = [data_list[position] for position in position_list]
+    elif array is None:
+        value_list = selection.select_many(
+            data_list,
+            position_list,
+            overwrite=True
+        )
+    else:
+        value_list = numpy_backend.select_many(array, position_list)
+    values_by_position = dict(zip(position_list, map(float, value_list)))
+
+    results = []
+    for i, (low, high) in zip(index_list, bounds_list):
+        l = values_by_position[low]
+        h = values_by_position[high]
+        # Test if that index has a remainder after the decimal point
+        remainder = i - int(i)
+        # If it doesn't just pull the number at the index
+        if not remainder:
+            results.append(l)
+        # If it does, interpolate a result using the method provided
+        elif interpolation == 'fraction':
+            results.append(l + ((h - l) * remainder))
+        elif interpolation == 'lower':
+            results.append(l)
+        elif interpolation == 'higher':
+            results.append(h)
+
+    # Pass out a single value if that's what we were given
+    if isinstance(value, (list, tuple)):
+        return results
+    return results[0]
@@ -0,0 +1,353 @@
+"""
+The machinery behind calculate.benfords_law.
+
+Each number is boiled down to its first two significant digits and its last
+digit. Those two tallies are enough to run every test below, so the data
+only has to be read once. Negative numbers are treated like positive ones.
+Zeros have no significant digits, so they only count toward the last digit
+test. Numbers with a single significant digit, like 5 or 300, count as
+having a second digit of zero.
+
+The significant digits are exact. Integers and decimals are read digit by
+digit, and floats are read as the shortest decimal that Python prints for
+them, so 1999999999.99 starts with 19, not 20. Most floats are handled with
+quick arithmetic, and only the ones that land too close to the next digit
+up for it to be trusted are read out digit by digit.
+
+The last digit is the units digit, the one just in front of the decimal
+point, so 12.75 has a last digit of 2. Before calculate.benford, the last
+printed character was used instead, which gave 5.
+
+The expected distributions are worked out once, when the module is loaded.
+
+    >> from calculate import benford
+    >> counts = benford.DigitCounts([1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
+    >> counts.test('first_digit').mad
+    0.04490222029510274
+
+Sources:
+
+    "Benford's Law":http://en.wikipedia.org/wiki/Benford%27s_law
+    "Nigrini, Benford's Law: Applications for Forensic Accounting, Auditing,\
+ and Fraud Detection":http://www.nigrini.com/benfordslaw.htm
+"""
+import math
+import six
+from decimal import Decimal, InvalidOperation
+from collections import namedtuple
+import calculate
+from calculate import numpy_backend
+
+METHODS = ('first_digit', 'second_digit', 'first_two_digits', 'last_digit')
+
+# The digits each test looks at
+DIGITS = {
+    'first_digit': tuple(range(1, 10)),
+    'second_digit': tuple(range(0, 10)),
+    'first_two_digits': tuple(range(10, 100)),
+    'last_digit': tuple(range(0, 10)),
+}
+
+# How often Benford's Law says each of those digits should turn up
+FIRST_TWO_DIGITS_EXPECTED = tuple(
+    math.log10(1 + 1 / float(d)) for d in DIGITS['first_two_digits']
+)
+FIRST_DIGIT_EXPECTED = tuple(
+    math.log10(1 + 1 / float(d)) for d in DIGITS['first_digit']
+)
+SECOND_DIGIT_EXPECTED = tuple(
+    sum(math.log10(1 + 1 / float(10 * f + s)) for f in range(1, 10))
+    for s in DIGITS['second_digit']
+)
+# Last digits should be spread out evenly
+LAST_DIGIT_EXPECTED = (0.1,) * 10
+
+EXPECTED = {
+    'first_digit': FIRST_DIGIT_EXPECTED,
+    'second_digit': SECOND_DIGIT_EXPECTED,
+    'first_two_digits': FIRST_TWO_DIGITS_EXPECTED,
+    'last_digit': LAST_DIGIT_EXPECTED,
+}
+
+# How close the arithmetic can come to the next digit up before the
+# digits have to be read out exactly
+TOLERANCE = 1e-6
+
+# Nigrini's cutoffs for the mean absolute deviation that separate close,
+# acceptable and marginal conformity from nonconformity
+MAD_CUTOFFS = {
+    'first_digit': (0.006, 0.012, 0.015),
+    'second_digit': (0.008, 0.010, 0.012),
+    'first_two_digits': (0.0012, 0.0018, 0.0022),
+}
+CONFORMITY = ('close', 'acceptable', 'marginal', 'nonconformity')
+
+# A row in the results for each digit. The expected and actual figures
+# are percentages.
+BenfordDigit = namedtuple(
+    'BenfordDigit',
+    ['digit', 'count', 'expected', 'actual', 'z']
+)
+
+BenfordResult = namedtuple(
+    'BenfordResult',
+    [
+        'method',
+        'n',
+        'pearsons_r',
+        'chi_square',
+        'degrees_of_freedom',
+        'mad',
+        'conformity',
+        'digits',
+    ]
+)
+
+# The same, with the key for a group of numbers up front
+BenfordGroupResult = namedtuple(
+    'BenfordGroupResult',
+    ('key',) + BenfordResult._fields
+)
+
+
+def _to_number(value):
+    # Strings are read as decimals, so they keep all their digits.
+    # Everything else is left as is, so big integers do too.
+    if isinstance(value, six.string_types):
+        try:
+            value = Decimal(value.strip())
+        except InvalidOperation:
+            raise ValueError('Input values must contain numbers')
+    return abs(value)
+
+
+def significant_digits(number):
+    """
+    Returns the first two significant digits of a number as an integer
+    between 10 and 99. Returns None for zero, infinity and NaN.
+
+    Integers and decimals are read exactly. Floats are read as the
+    shortest decimal Python prints for them.
+    """
+    number = _to_number(number)
+    if isinstance(number, six.integer_types):
+        digits = str(number)
+    else:
+        if not isinstance(number, Decimal):
+            number = float(number)
+            if math.isinf(number) or math.isnan(number):
+                return None
+            # repr gives the shortest decimal that reads back as the float
+            number = Decimal(repr(number))
+        if not number.is_finite():
+            return None
+        digits = ''.join(str(d) for d in number.as_tuple().digits)
+    digits = digits.lstrip('0')
+    if not digits:
+        return None
+    # Pad numbers with one significant digit, like 5 or 300
+    return int((digits + '0')[:2])
+
+
+def last_digit(number):
+    """
+    Returns the units digit of a number, the one just in front of the
+    decimal point. For 12.75 that's 2. Returns None for infinity and NaN.
+    """
+    if isinstance(number, float) and \
+            (math.isinf(number) or math.isnan(number)):
+        return None
+    if isinstance(number, Decimal) and not number.is_finite():
+        return None
+    return abs(int(number)) % 10
+
+
+def _tally(records, counters):
+    """
+    Tallies up the digits of the numbers in an iterable of (key, number)
+    pairs, adding each to the DigitCounts for its key in the provided
+    dictionary. New keys are added as they turn up.
+    """
+    # Pull everything we need into local names to speed up the loop
+    log10 = math.log10
+    floor = math.floor
+    for key, number in records:
+        try:
+            counter = counters[key]
+        except KeyError:
+            counter = counters[key] = DigitCounts()
+        try:
+            number = _to_number(number)
+            # Handle ordinary floats right here, to save the function calls
+            if type(number) is float and 1e-290 < number < 1e290:
+                # Shift the decimal point so two digits sit in front of it.
+                # Dividing by a power of ten is less exact than
+                # multiplying, so only divide when we have to.
+                exponent = int(floor(log10(number))) - 1
+                if exponent >= 0:
+                    scaled = number / 10.0 ** exponent
+                else:
+                    scaled = number * 10.0 ** -exponent
+                # log10 can land on the wrong side of a power of ten
+                if scaled >= 100:
+                    scaled /= 10
+                elif scaled < 10:
+                    scaled *= 10
+                digits = int(scaled)
+                # Too close to call, so read the digits out exactly
+                if scaled - digits < TOLERANCE or \
+                        digits + 1 - scaled < TOLERANCE:
+                    digits = significant_digits(number)
+                counter.first_two[digits] += 1
+                counter.last[int(number) % 10] += 1
+                continue
+            digits = significant_digits(number)
+        except ValueError:
+            raise ValueError('Input values must contain numbers')
+        if digits is not None:
+            counter.first_two[digits] += 1
+        digit = last_digit(number)
+        if digit is not None:
+            counter.last[digit] += 1
+    return counters
+
+
+class DigitCounts(object):
+    """
+    Accepts an optional iterable of numbers and tallies up their digits
+    in a single pass, so that any of the Benford tests can be run.
+
+    More numbers can be added later with add() or update(), and the counts
+    from another batch can be folded in with merge().
+    """
+    def __init__(self, number_list=None):
+        # Indexed by the first two significant digits
+        self.first_two = [0] * 100
+        # Indexed by the last digit
+        self.last = [0] * 10
+        if number_list is not None:
+            self.update(number_list)
+
+    def add(self, number):
+        """
+        Adds a single number to the counts.
+        """
+        return self.update([number])
+
+    def update(self, number_list):
+        """
+        Adds every number in the provided iterable to the counts.
+        """
+        # Hand arrays and other buffers off to NumPy, if it's installed
+        array = numpy_backend.as_array(number_list)
+        if array is not None:
+            first_two, last = numpy_backend.digit_counts(
+                array,
+                significant_digits,
+                TOLERANCE,
+                numpy_backend.as_integer_array(number_list)
+            )
+            self.first_two = [a + b for a, b in zip(self.first_two, first_two)]
+            self.last = [a + b for a, b in zip(self.last, last)]
+            return self
+
+        _tally(((None, number) for number in number_list), {None: self})
+        return self
+
+    def merge(self, other):
+        """
+        Combines the counts from another DigitCounts into this one.
+
+        Returns this object so calls can be chained.
+        """
+        self.first_two = [a + b for a, b in zip(self.first_two,
+                                                other.first_two)]
+        self.last = [a + b for a, b in zip(self.last, other.last)]
+        return self
+
+    def counts(self, method):
+        """
+        Returns how many times each digit turned up for the provided
+        method, lined up with benford.DIGITS.
+        """
+        if method == 'first_digit':
+            return [sum(self.first_two[d * 10:d * 10 + 10])
+                    for d in DIGITS['first_digit']]
+        elif method == 'second_digit':
+            return [sum(self.first_two[f * 10 + s] for f in range(1, 10))
+                    for s in DIGITS['second_digit']]
+        elif method == 'first_two_digits':
+            return self.first_two[10:]
+        elif method == 'last_digit':
+            return list(self.last)
+        raise ValueError('The method you\'ve requested is not supported.')
+
+    def test(self, method='first_digit'):
+        """
+        Compares the counts for the provided method against Benford's Law.
+        Returns a BenfordResult.
+        """
+        counts = self.counts(method)
+        expected = EXPECTED[method]
+        n = sum(counts)
+        if not n:
+            raise ValueError('None of the values have the digits needed \
+for the %s test.' % method)
+
+        digits = []
+        chi_square = 0.0
+        total_deviation = 0.0
+        for digit, count, expected_share in zip(DIGITS[method], counts,
+                                                expected):
+            actual_share = count / float(n)
+            deviation = abs(actual_share - expected_share)
+            total_deviation += deviation
+
+            # How far the count strays from the expected count
+            expected_count = n * expected_share
+            chi_square += (count - expected_count) ** 2 / expected_count
+
+            # Nigrini's z-statistic, with the continuity correction only
+            # applied when it's smaller than the deviation
+            correction = 1 / (2.0 * n)
+            if correction < deviation:
+                deviation -= correction
+            z = deviation / math.sqrt(
+                expected_share * (1 - expected_share) / n
+            )
+
+            digits.append(BenfordDigit(
+                digit,
+                count,
+                expected_share * 100.0,
+                actual_share * 100.0,
+                z
+            ))
+
+        # Run the two percentage figures through Pearson's correlation
+        # coefficient to see how closely related they are
+        pearsons_r = calculate.pearson(
+            [d.actual for d in digits],
+            [d.expected for d in digits]
+        )
+
+        # Grade the mean absolute deviation, where there's a scale for it
+        mad = total_deviation / len(digits)
+        conformity = None
+        if method in MAD_CUTOFFS:
+            conformity = CONFORMITY[-1]
+            for label, cutoff in zip(CONFORMITY, MAD_CUTOFFS[method]):
+                if mad <= cutoff:
+                    conformity = label
+                    break
+
+        return BenfordResult(
+            method,
+            n,
+            pearsons_r,
+            chi_square,
+            len(digits) - 1,
+            mad,
+            conformity,
+            digits,
+        )
@@ -1,9 +1,9 @@
 from __future__ import print_function
-import math
-import calculate
+from calculate import benford
 
 
-def benfords_law(number_list, method='first_digit', verbose=True):
+def benfords_law(number_list, method='first_digit', verbose=True,
+                 details=False):
     """
     Accepts a list of numbers and applies a quick-and-dirty run
     against Benford's Law.
@@ -16,12 +16,34 @@ def benfords_law(number_list, method='first_digit', verbose=True):
     Datasets that greatly vary from the law are sometimes suspected of fraud.
 
     The function returns the Pearson correlation coefficient, also known as
-    Pearson's r,  which reports how closely the two datasets are related.
+    Pearson's r,  which reports how closely the actual and expected
+    distributions of digits are related.
+
+    To get the rest of the statistics, set the optional keyword argument
+    `details` to True. You'll get back a calculate.benford.BenfordResult with
+    Pearson's r, the chi-square statistic and its degrees of freedom, the mean
+    absolute deviation (MAD), Nigrini's conformity rating for that MAD and a
+    row for each digit with its count, the expected and actual percentages
+    and its z-statistic.
+
+    By default the first digit of each number is tested. Provide the keyword
+    argument `method` with the value 'second_digit' or 'first_two_digits' to
+    run those tests instead.
 
     This function also includes a variation on the classic Benford analysis
     popularized by blogger Nate Silver, who conducted an analysis of the final
     digits of polling data. To use Silver's variation, provide the keyward
-    argument `method` with the value 'last_digit'.
+    argument `method` with the value 'last_digit'. The last digit is the units
+    digit, the one just in front of the decimal point, so 12.75 counts as a
+    2. Earlier versions used the last character printed, which counted it
+    as a 5. Whole numbers get the same answer either way.
+
+    The significant digits are exact, so negative numbers, numbers below
+    one, numbers that print in scientific notation and numbers like
+    1999999999.99 that sit right below a power of ten all work. Floats are
+    read as the shortest decimal Python prints for them. Zeros are skipped
+    by all but the last digit test. The numbers are only read once, and
+    NumPy arrays are counted without looping in Python.
 
     To prevent the function from printing, set the optional keyword argument
     `verbose` to False.
@@ -35,23 +57,23 @@ def benfords_law(number_list, method='first_digit', verbose=True):
         >> calculate.benfords_law([1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
         BENFORD'S LAW: FIRST_DIGIT
 
-        Pearson's R: 0.86412304649
+        Pearson's r: 0.86412304649
+
+        Chi-square: 2.35033460105 (8 degrees of freedom)
+        Mean absolute deviation: 0.0449022202951 (nonconformity)
 
-        | Number | Count | Expected Percentage | Actual Percentage |
-        ------------------------------------------------------------
-        | 1      | 2     | 30.1029995664       | 20.0              |
-        | 2      | 1     | 17.6091259056       | 10.0              |
-        | 3      | 1     | 12.4938736608       | 10.0              |
-        | 4      | 1     | 9.69100130081       | 10.0              |
-        | 5      | 1     | 7.91812460476       | 10.0              |
-        | 6      | 1     | 6.69467896306       | 10.0              |
-        | 7      | 1     | 5.79919469777       | 10.0              |
-        | 8      | 1     | 5.11525224474       | 10.0              |
-        | 9      | 1     | 4.57574905607       | 10.0              |
+        | Number | Count | Expected Percentage | Actual Percentage | Z-st...
+        ---------------------------------------------------------------...
+        | 1      | 2     | 30.1029995664       | 20.0              | 0.35...
+        ...
 
         >> calculate.benfords_law([1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
             verbose=False)
-        -0.863801937698704
+        0.864123046489981
+        >> results = calculate.benfords_law([1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
+            verbose=False, details=True)
+        >> results.chi_square
+        2.3503346010548682
 
     h3. A Warning
 
@@ -98,55 +120,11 @@ exhibit-unusual.html
 2009/09/nate-silver-pollster-may-be-fraud.html
     """
     # Select the appropriate retrieval method
-    if method not in ['last_digit', 'first_digit']:
+    if method not in benford.METHODS:
         raise ValueError('The method you\'ve requested is not supported.')
 
-    def _get_first_digit(number):
-        return int(str(number)[0])
-
-    def _get_last_digit(number):
-        return int(str(number)[-1])
-
-    method_name = '_get_%s' % method
-    method_obj = locals()[method_name]
-
-    # Set the typical distributions we expect to find
-    typical_distributions = {
-        'first_digit': {},
-        'last_digit': {}
-    }
-    for number in range(1, 10):
-        log10 = math.log10(1 + 1 / float(number)) * 100.0
-        typical_distributions['first_digit'].update({number: log10})
-
-    typical_distributions['last_digit'].update({
-        0: 10.0, 1: 10.0, 2: 10.0, 3: 10.0, 4: 10.0,
-        5: 10.0, 6: 10.0, 7: 10.0, 8: 10.0, 9: 10.0,
-    })
-
-    # Fetch the digits we want to analyze
-    digit_list = []
-    for number in number_list:
-        digit = method_obj(number)
-        digit_list.append(digit)
-
-    # Loop through the data set and grab all the applicable numbers
-    results = []
-    for number in range(0, 10):
-        count = digit_list.count(number)
-        try:
-            expected_percentage = typical_distributions[method][number]
-        except KeyError:
-            continue
-        actual_percentage = count / float(len(digit_list)) * 100.0
-        results.append([number, count, expected_percentage, actual_percentage])
-
-    # Run the two percentage figures through
-    # Pearson's correlation coefficient to
-    # see how closely related they are.
-    list_one = [i[2] for i in results]
-    list_two = typical_distributions[method]
-    pearsons_r = calculate.pearson(list_one, list_two)
+    # Count up the digits and compare them against the law
+    results = benford.DigitCounts(number_list).test(method)
 
     # If the user has asked for verbosity,
     # print out this cutsey table with all
@@ -154,20 +132,35 @@ exhibit-unusual.html
     if verbose:
         from calculate import ptable
         # Convert results to strings
-        results = [list(map(str, i)) for i in results]
+        rows = [list(map(str, i)) for i in results.digits]
         # Print everything out using our pretty table module
         labels = [
-            'Number', 'Count', 'Expected Percentage', 'Actual Percentage'
+            'Number', 'Count', 'Expected Percentage', 'Actual Percentage',
+            'Z-statistic'
         ]
         print("BENFORD'S LAW: %s" % method.upper().replace('_', ' '))
         print("")
-        print("Pearson's r: %s" % (pearsons_r))
+        print("Pearson's r: %s" % (results.pearsons_r))
+        print("")
+        print("Chi-square: %s (%s degrees of freedom)" % (
+            results.chi_square,
+            results.degrees_of_freedom
+        ))
+        if results.conformity:
+            print("Mean absolute deviation: %s (%s)" % (
+                results.mad,
+                results.conformity
+            ))
+        else:
+            print("Mean absolute deviation: %s" % results.mad)
         print("")
         print(ptable.indent(
-            [labels] + results,
+            [labels] + rows,
             hasHeader=True,
             separateRows=False,
             prefix='| ', postfix=' |',
         ))
 
-    return pearsons_r
+    if details:
+        return results
+    return results.pearsons_r
@@ -0,0 +1,60 @@
+from calculate import benford
+
+
+def benfords_law_by_group(records, method='first_digit', min_count=1):
+    """
+    Accepts a list of (key, number) pairs and runs a Benford's Law test
+    on the numbers that share each key. Returns a list with a result for
+    each group, sorted so the groups that stray furthest from the law
+    come first.
+
+    This is a lot faster than calling calculate.benfords_law once for each
+    group. The records are read one at a time, in a single pass, so they
+    can come from a CSV reader, a Django queryset's values_list() or
+    anything else you can loop over.
+
+    Each result is a calculate.benford.BenfordGroupResult. It has the key
+    and everything calculate.benfords_law returns when `details` is True,
+    including the mean absolute deviation (MAD) the list is sorted by and
+    Nigrini's conformity rating for it.
+
+    The `method` keyword argument works the same as calculate.benfords_law.
+    Groups with fewer than `min_count` numbers that could be tested are
+    left out. Small groups rarely follow the law, even when nothing's wrong.
+
+    h3. Example usage
+
+        >> import calculate
+        >> records = Expenditure.objects.values_list('committee_id', 'amount')
+        >> results = calculate.benfords_law_by_group(records, min_count=500)
+        >> for row in results[:3]:
+        ..     print(row.key, row.n, row.mad, row.conformity)
+        C00431445 1872 0.0231 nonconformity
+        C00401224 933 0.0164 nonconformity
+        C00366484 5120 0.0138 marginal
+
+    h3. Documentation
+
+        * "Benford's Law":http://en.wikipedia.org/wiki/Benford%27s_law
+        * "Breaking the (Benford) Law: Statistical Fraud Detection in \
+Campaign Finance (pdf)":http://cho.pol.uiuc.edu/wendy/papers/tas.pdf
+    """
+    # Select the appropriate retrieval method
+    if method not in benford.METHODS:
+        raise ValueError('The method you\'ve requested is not supported.')
+
+    # Count up the digits for every group in one pass
+    counters = benford._tally(records, {})
+
+    # Test each group that has enough numbers to go on
+    results = []
+    for key, counter in counters.items():
+        if sum(counter.counts(method)) < max(min_count, 1):
+            continue
+        results.append(
+            benford.BenfordGroupResult(key, *counter.test(method))
+        )
+
+    # Put the worst offenders at the top
+    results.sort(key=lambda row: row.mad, reverse=True)
+    return results
@@ -0,0 +1,44 @@
+from bisect import bisect_right
+
+
+def breakpoint_bins(data_list, breakpoint_list):
+    """
+    Accepts a list of data values and a list of breakpoints. Returns a
+    generator with the zero-based index of the bin each value falls into,
+    in the same order as the data.
+
+    Each bin includes its lower breakpoint and runs up to, but doesn't
+    include, the next one. The last bin includes both its breakpoints.
+    Values outside the breakpoints raise a ValueError.
+
+    Each value is placed with a binary search of the breakpoints. The data
+    are read one at a time, so they can come from a generator, a file or
+    anything else you can loop over, without being loaded into memory.
+
+    h3. Example usage
+
+        >> import calculate
+        >> bins = calculate.breakpoint_bins([1, 7, 30, 12], [1, 7, 13, 30])
+        >> bins
+        <generator object _make at 0x7f5a58437d20>
+        >> list(bins)
+        [0, 1, 2, 1]
+    """
+    # Sort a copy of the breakpoints, leaving the caller's list alone
+    breakpoint_list = sorted(breakpoint_list)
+    if len(breakpoint_list) < 2:
+        raise ValueError('At least two breakpoints are required.')
+
+    def _make(data_list, breakpoint_list):
+        last_bin = len(breakpoint_list) - 2
+        low = breakpoint_list[0]
+        high = breakpoint_list[-1]
+        for value in data_list:
+            # Make sure the value fits
+            if value < low or value > high:
+                raise ValueError('%s falls outside the breakpoints.' % value)
+            # Find the last breakpoint at or below the value.
+            # The top breakpoint belongs to the last bin.
+            yield min(bisect_right(breakpoint_list, value) - 1, last_bin)
+
+    return _make(data_list, breakpoint_list)
@@ -0,0 +1,49 @@
+import calculate
+
+
+def classify(data_list, classes, method='jenks'):
+    """
+    Returns break points that divide a list of values into classes, using
+    the method of your choice.
+
+    Provide a list of data values, the number of classes you'd like the list
+    broken up into and one of these methods:
+
+        * "jenks" groups values that are alike. See
+          calculate.jenks_breakpoints.
+        * "equal_sized" puts the same number of values in each class, like
+          quintiles. See calculate.equal_sized_breakpoints.
+        * "equal_interval" gives each class the same width. See
+          calculate.equal_interval_breakpoints.
+        * "standard_deviation" spaces the breaks one standard deviation
+          apart. See calculate.standard_deviation_breakpoints.
+        * "head_tail" is made for long-tailed data. The number of classes is
+          treated as a maximum. See calculate.head_tail_breakpoints.
+
+    The breaks come back sorted, starting with the smallest value and
+    ending with the largest, so they can be handed straight to
+    calculate.split_at_breakpoints or calculate.breakpoint_bins. Some
+    methods can return fewer classes than you asked for.
+
+    h3. Example usage
+
+        >> import calculate
+        >> data = [1, 2, 3, 10, 11, 12, 20, 21, 22]
+        >> breaks = calculate.classify(data, 3, method='jenks')
+        >> breaks
+        [1.0, 10.0, 20.0, 22.0]
+        >> calculate.split_at_breakpoints(data, breaks)
+        [[1, 2, 3], [10, 11, 12], [20, 21, 22]]
+    """
+    methods = {
+        'jenks': calculate.jenks_breakpoints,
+        'equal_sized': calculate.equal_sized_breakpoints,
+        'equal_interval': calculate.equal_interval_breakpoints,
+        'standard_deviation': calculate.standard_deviation_breakpoints,
+        'head_tail': calculate.head_tail_breakpoints,
+    }
+    if method not in methods:
+        raise ValueError("The method kwarg must be 'jenks', 'equal_sized', \
+'equal_interval', 'standard_deviation' or 'head_tail'. You can also opt to \
+leave it out and rely on the default method.")
+    return methods[method](data_list, classes)
@@ -0,0 +1,51 @@
+"""
+The layer that gets numbers ready for the descriptive statistics functions.
+
+Arrays, memory-mapped files and anything else that supports the buffer
+protocol are read in place through a memoryview. The numbers are pulled
+out one at a time as they're needed, so a big column never turns into a
+list with a Python float for every value. Everything else is converted to
+a list of floats, just like before.
+
+When NumPy is installed, calculate.numpy_backend gets the first crack at
+buffers. This is what they fall back to when it isn't.
+
+    >> from array import array
+    >> from calculate import columns
+    >> columns.floats(array('d', [1, 2, 3]))
+    <memory at 0x7f8d1c2b3e80>
+    >> columns.floats(['1', 2, 3])
+    [1.0, 2.0, 3.0]
+"""
+# The memoryview formats for numbers, from array.array and the struct module
+FORMATS = set('bBhHiIlLqQfd')
+
+
+def as_view(data_list):
+    """
+    Returns a flat memoryview over the provided object if it supports
+    the buffer protocol and holds numbers. Otherwise returns None.
+    """
+    try:
+        view = memoryview(data_list)
+    except TypeError:
+        return None
+    # Native byte order can be spelled out with an @ up front
+    if view.ndim != 1 or view.format.lstrip('@') not in FORMATS:
+        return None
+    return view
+
+
+def floats(data_list):
+    """
+    Returns the provided values in a form that can be measured, indexed
+    and looped over more than once.
+
+    Buffers come back as a memoryview, without copying anything. Anything
+    else is converted to a list of floats, so it raises the same errors as
+    float() when it runs into something that isn't a number.
+    """
+    view = as_view(data_list)
+    if view is not None:
+        return view
+    return list(map(float, data_list))
@@ -1,4 +1,5 @@
-from types import FunctionType
+from calculate import querysets
+from calculate.accessors import get_accessor
 
 
 def competition_rank(obj_list, obj, order_by, direction='desc'):
@@ -10,6 +11,11 @@ def competition_rank(obj_list, obj, order_by, direction='desc'):
     In competition ranking equal numbers receive the same ranking and a gap
     is left before the next value (i.e. "1224").
 
+    If you need the rank of every object in the list, use
+    calculate.competition_ranks or calculate.CompetitionRanker, which
+    only sort the list once. If the list keeps changing, keep a
+    calculate.RankIndex up to date instead.
+
     h3. Example usage
 
         >> import calculate
@@ -36,51 +42,27 @@ def competition_rank(obj_list, obj, order_by, direction='desc'):
         * "standard competition rank":http://en.wikipedia.org/wiki/Ranking#\
 Standard_competition_ranking_.28.221224.22_ranking.29
     """
-    # Convert the object list to a list type, in case it's a Django queryset
-    obj_list = list(obj_list)
+    # Let the database do the counting, if it can
+    if querysets.is_queryset(obj_list):
+        rank = querysets.competition_rank(obj_list, obj, order_by, direction)
+        if rank is not querysets.UNSUPPORTED:
+            return rank
 
     # Validate the direction
     if direction not in ['desc', 'asc']:
         raise ValueError('Direction kwarg should be either asc or desc.')
 
-    # Figure out what type of objects we're dealing with
-    # and assign the proper way of accessing them.
-
-    # If we've passed in a lambda or function as
-    # our order_by, we need to act accordingly.
-    if isinstance(order_by, FunctionType):
-        def getfunc(obj, func):
-            return func(obj)
-        gettr = getfunc
-    # If the objects are dicts we'll need to pull keys
-    elif isinstance(obj_list[0], type({})):
-        def getkey(obj, key):
-            return obj.get(key)
-        gettr = getkey
-    # ... otherwise just assume the list is full of objects with attributes
-    else:
-        gettr = getattr
+    # If the submitted object isn't in the list, it doesn't have a rank
+    obj_list = list(obj_list)
+    if obj not in obj_list:
+        return None
 
-    # Reorder list
+    # For a single lookup, counting the values ahead of the object's
+    # in one pass beats sorting the whole list
+    gettr = get_accessor(obj_list, order_by)
+    value = gettr(obj)
     if direction == 'desc':
-        obj_list.sort(key=lambda x: gettr(x, order_by), reverse=True)
-    elif direction == 'asc':
-        obj_list.sort(key=lambda x: gettr(x, order_by))
-
-    # Set up some globals
-    rank = 0
-    tie_count = 1
-
-    # Loop through the list
-    for i, x in enumerate(obj_list):
-        # And keep counting ...
-        if (i != 0 and
-                gettr(obj_list[i], order_by) ==
-                gettr(obj_list[i - 1], order_by)):
-            tie_count += 1
-        else:
-            rank = rank + tie_count
-            tie_count = 1
-        # ... Until we hit the submitted object
-        if obj == x:
-            return rank
+        ahead = sum(1 for i in obj_list if gettr(i) > value)
+    else:
+        ahead = sum(1 for i in obj_list if gettr(i) < value)
+    return ahead + 1
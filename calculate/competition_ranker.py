@@ -0,0 +1,77 @@
+from bisect import bisect_left, bisect_right
+from calculate.accessors import get_accessor
+
+
+class CompetitionRanker(object):
+    """
+    Accepts a list plus the value and direction to order by. Sorts the
+    values once so that the competition rank of any object can be found
+    with a binary search, rather than by resorting and walking the list.
+
+    In competition ranking equal numbers receive the same ranking and a gap
+    is left before the next value (i.e. "1224").
+
+    The order_by argument can be an attribute name, a dictionary key or a
+    function, just like calculate.competition_rank.
+
+    h3. Example usage
+
+        >> import calculate
+        >> ranker = calculate.CompetitionRanker(
+            Player.objects.all(),
+            'career_home_runs',
+            direction='desc'
+        )
+        >> ranker.rank(ernie)
+        21
+        >> ranker.rank_value(500)
+        22
+
+    h3. Documentation
+
+        * "standard competition rank":http://en.wikipedia.org/wiki/Ranking#\
+Standard_competition_ranking_.28.221224.22_ranking.29
+    """
+    def __init__(self, obj_list, order_by, direction='desc'):
+        # Validate the direction
+        if direction not in ['desc', 'asc']:
+            raise ValueError('Direction kwarg should be either asc or desc.')
+        self.direction = direction
+
+        # Convert the object list to a list type, in case it's a Django
+        # queryset, and figure out how to pull the values we're ranking by
+        self.obj_list = list(obj_list)
+        self.gettr = get_accessor(self.obj_list, order_by)
+
+        # Fetch each value once and sort them
+        self.values = [self.gettr(obj) for obj in self.obj_list]
+        self.sorted_values = sorted(self.values)
+
+    def __len__(self):
+        return len(self.values)
+
+    def rank_value(self, value):
+        """
+        Returns the competition rank the provided value would have
+        in the list.
+        """
+        if self.direction == 'desc':
+            # One more than the number of values bigger than this one
+            return len(self.sorted_values) - \
+                bisect_right(self.sorted_values, value) + 1
+        else:
+            # One more than the number of values smaller than this one
+            return bisect_left(self.sorted_values, value) + 1
+
+    def rank(self, obj):
+        """
+        Returns the competition rank of the provided object.
+        """
+        return self.rank_value(self.gettr(obj))
+
+    def ranks(self):
+        """
+        Returns the competition rank of every object, in the same
+        order as the list that was provided.
+        """
+        return [self.rank_value(value) for value in self.values]
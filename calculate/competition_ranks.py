@@ -0,0 +1,54 @@
+import calculate
+from calculate import querysets
+
+
+def competition_ranks(obj_list, order_by, direction='desc'):
+    """
+    Accepts a list plus the value and direction to order by. Returns
+    a list with the competition rank of every object, in the same order
+    as the list that was provided.
+
+    In competition ranking equal numbers receive the same ranking and a gap
+    is left before the next value (i.e. "1224").
+
+    The list is only sorted once, so this is much faster than calling
+    calculate.competition_rank for every object.
+
+    Querysets that aren't ordered are ranked in primary key order.
+
+    h3. Example usage
+
+        >> import calculate
+        >> dict_list = [
+            {'name': 'Joan', 'value': 1},
+            {'name': 'Jane', 'value': 2},
+            {'name': 'Mary', 'value': 2},
+            {'name': 'Josh', 'value': 3},
+        ]
+        >> calculate.competition_ranks(dict_list, 'value')
+        [4, 2, 2, 1]
+        >> calculate.competition_ranks(dict_list, 'value', direction='asc')
+        [1, 2, 2, 4]
+
+    h3. Documentation
+
+        * "standard competition rank":http://en.wikipedia.org/wiki/Ranking#\
+Standard_competition_ranking_.28.221224.22_ranking.29
+    """
+    # Querysets without an ordering are ranked in primary key order,
+    # so the ranks come out the same whichever way they're worked out
+    if querysets.is_queryset(obj_list):
+        obj_list = querysets.ordered(obj_list)
+
+    # Let the database do the ranking, if it can
+    if querysets.is_queryset(obj_list):
+        ranks = querysets.competition_ranks(obj_list, order_by, direction)
+        if ranks is not querysets.UNSUPPORTED:
+            return ranks
+
+    ranker = calculate.CompetitionRanker(
+        obj_list,
+        order_by,
+        direction=direction
+    )
+    return ranker.ranks()
@@ -12,11 +12,18 @@ def decile(data_list, score, kind='weak'):
     alternative methods, refer to the calculate.percentile
     function.
 
+    A calculate.PercentileIndex, calculate.Sample or calculate.RankIndex
+    can be passed in place of the list to score many values against the
+    same sample without resorting it.
+
     h3. Example usage
 
         >> import calculate
         >> calculate.decile([1, 2, 3, 3, 4], 3)
         9
+        >> index = calculate.PercentileIndex([1, 2, 3, 3, 4])
+        >> [calculate.decile(index, i) for i in [1, 3, 4]]
+        [3, 9, 10]
 
     h3. Documentation
 
@@ -0,0 +1,135 @@
+"""
+The machinery behind the measures of how spread out a set of points is.
+
+Everything comes down to five numbers: the total weight of the points,
+their weighted mean x and y, and the weighted sums of the squared and
+multiplied distances from that mean. They're gathered in one pass over the
+points, or in two passes over whole arrays with NumPy, and every measure
+is worked out from them.
+
+    >> from calculate import dispersion
+    >> dispersion.moments([(0, 0), (2, 0), (0, 2), (2, 2)])
+    Moments(template=(0, 0), weight=4.0, x=1.0, y=1.0, xx=4.0, yy=4.0, xy=0.0)
+"""
+import math
+from collections import namedtuple
+from calculate import geometry
+from calculate import numpy_backend
+
+Moments = namedtuple(
+    'Moments',
+    ['template', 'weight', 'x', 'y', 'xx', 'yy', 'xy']
+)
+
+Ellipse = namedtuple(
+    'Ellipse',
+    ['center', 'major_axis', 'minor_axis', 'rotation']
+)
+
+
+def moments(obj_list, point_attribute_name='point', weight=None):
+    """
+    Accepts the same points as calculate.mean_center, plus an optional
+    weight for each. Returns their Moments.
+
+    The weight can be an attribute name, a dictionary key or a function
+    that accepts an object. When the points come in a Coordinates object,
+    it's a parallel list of numbers instead.
+    """
+    # Hand arrays and other buffers off to NumPy, if it's installed
+    if isinstance(obj_list, geometry.Coordinates):
+        if not len(obj_list):
+            raise ValueError('At least one point is required')
+        array_x = numpy_backend.as_array(obj_list.xs)
+        array_y = numpy_backend.as_array(obj_list.ys)
+        array_w = None
+        if weight is not None:
+            if len(weight) != len(obj_list):
+                raise ValueError('The weights you provided do not have the \
+same number of entries as the coordinates.')
+            array_w = numpy_backend.as_array(weight)
+        if array_x is not None and array_y is not None and \
+                (weight is None or array_w is not None):
+            return Moments(
+                None,
+                *numpy_backend.spatial_moments(array_x, array_y, array_w)
+            )
+        if weight is not None:
+            weight = iter(weight)
+            obj_list = [(x, y, next(weight)) for x, y in obj_list]
+
+            def get_weight(obj):
+                return obj[2]
+            weight = get_weight
+
+    # Keep running totals of the distances from the first point, which
+    # are smaller than the coordinates and lose less to rounding
+    template = None
+    x0 = y0 = 0.0
+    total_w = total_x = total_y = total_xx = total_yy = total_xy = 0.0
+    for x, y, _, w, point in geometry.iter_points(obj_list,
+                                                  point_attribute_name,
+                                                  weight=weight):
+        if template is None:
+            template = point
+            x0 = x
+            y0 = y
+        if w is None:
+            w = 1.0
+        dx = x - x0
+        dy = y - y0
+        wx = w * dx
+        wy = w * dy
+        total_w += w
+        total_x += wx
+        total_y += wy
+        total_xx += wx * dx
+        total_yy += wy * dy
+        total_xy += wx * dy
+
+    if not total_w > 0:
+        raise ValueError('The weights of the points have to add up to more \
+than zero')
+
+    # Shift everything over to the mean
+    mean_x = total_x / total_w
+    mean_y = total_y / total_w
+    return Moments(
+        template,
+        total_w,
+        x0 + mean_x,
+        y0 + mean_y,
+        max(total_xx - total_w * mean_x * mean_x, 0.0),
+        max(total_yy - total_w * mean_y * mean_y, 0.0),
+        total_xy - total_w * mean_x * mean_y,
+    )
+
+
+def standard_distance(m):
+    """
+    Returns the standard distance of the provided Moments.
+    """
+    return math.sqrt((m.xx + m.yy) / m.weight)
+
+
+def ellipse(m, standard_deviations=1):
+    """
+    Returns the standard deviational Ellipse of the provided Moments.
+    """
+    # The variances along the major and minor axes are the eigenvalues
+    # of the covariance matrix
+    var_x = m.xx / m.weight
+    var_y = m.yy / m.weight
+    cov = m.xy / m.weight
+    middle = (var_x + var_y) / 2.0
+    spread = math.hypot((var_x - var_y) / 2.0, cov)
+    major = math.sqrt(middle + spread)
+    minor = math.sqrt(max(middle - spread, 0.0))
+    # The major axis is turned this far counterclockwise from the x axis
+    rotation = 0.5 * math.atan2(2 * cov, var_x - var_y)
+    return Ellipse(
+        geometry.make_point(m.x, m.y, m.template),
+        major * standard_deviations,
+        minor * standard_deviations,
+        rotation,
+    )
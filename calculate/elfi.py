@@ -1,4 +1,6 @@
 import math
+from calculate import columns
+from calculate import numpy_backend
 
 
 def elfi(data_list):
@@ -19,11 +21,16 @@ def elfi(data_list):
         0.64500000000000002
 
     """
+    # Hand arrays and other buffers off to NumPy, if it's installed
+    array = numpy_backend.as_array(data_list)
+    if array is not None:
+        return numpy_backend.elfi(array)
+
     # Convert all the values to floats and test to make sure
     # there aren't any strings in there
     try:
-        data_list = list(map(float, data_list))
+        data_list = columns.floats(data_list)
     except ValueError:
         raise ValueError('Input values should contain numbers')
     # Calculate the ELFI
-    return 1 - sum([math.pow(i, 2) for i in data_list])
+    return 1 - sum(math.pow(i, 2) for i in data_list)
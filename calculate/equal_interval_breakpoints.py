@@ -0,0 +1,43 @@
+def equal_interval_breakpoints(data_list, classes):
+    """
+    Returns break points that divide the range of the values into
+    groups of equal width.
+
+    Provide a list of data values and the number of classes you'd like the list
+    broken up into. The classes will cover the same span of values, but may
+    hold very different numbers of them.
+
+    h3. Example usage
+
+        >> import calculate
+        >> calculate.equal_interval_breakpoints([0, 1, 2, 10], 5)
+        [0.0, 2.0, 4.0, 6.0, 8.0, 10.0]
+
+    h3. Documentation
+
+        * "Equal interval":http://wiki.gis.com/wiki/index.php/\
+Equal_Interval_classification
+    """
+    # Make sure we've got a sensible number of classes
+    if classes < 1:
+        raise ValueError('The number of classes should be at least 1')
+
+    # Convert all the values to floats and test to make sure
+    # there aren't any strings in there
+    try:
+        data_list = list(map(float, data_list))
+    except ValueError:
+        raise ValueError('Input values must contain numbers')
+    if not data_list:
+        raise ValueError('The list should contain at least one value')
+
+    # Find the ends and how wide each class should be
+    minimum = min(data_list)
+    maximum = max(data_list)
+    width = (maximum - minimum) / float(classes)
+
+    # Step up from the bottom, then tack the maximum on the end
+    # so it isn't thrown off by rounding
+    breaks = [minimum + (width * i) for i in range(classes)]
+    breaks.append(maximum)
+    return breaks
@@ -1,3 +1,7 @@
+import calculate
+from calculate import sample
+
+
 def equal_sized_breakpoints(data_list, classes):
     """
     Returns break points for groups of equal size, known as quartiles,
@@ -7,6 +11,13 @@ def equal_sized_breakpoints(data_list, classes):
     broken up into.
 
     No flashy math, just sorts them in order and makes the cuts.
+    The list you provide is not modified.
+
+    For other ways of drawing the breaks, see calculate.classify.
+
+    If the data are too big to hold in memory, you can pass in a
+    calculate.QuantileSketch instead and get back estimates. A
+    calculate.Sample, which is already sorted, can also be passed in.
 
     h3. Example usage
 
@@ -15,8 +26,17 @@ def equal_sized_breakpoints(data_list, classes):
         [1.0, 21.0, 41.0, 61.0, 81.0, 100.0]
 
     """
-    # Sort the list
-    data_list.sort()
+    # A sketch can estimate the breaks for us
+    if isinstance(data_list, calculate.QuantileSketch):
+        return data_list.equal_sized_breakpoints(classes)
+
+    # Use a sorted sample if we've been handed one or have one cached.
+    # Otherwise sort a copy of the list, leaving the caller's alone.
+    data_list = sample.cached(data_list)
+    if isinstance(data_list, calculate.Sample):
+        data_list = data_list.values
+    else:
+        data_list = sorted(data_list)
 
     # Get the total number of values
     n = len(data_list)
@@ -35,7 +55,11 @@ def equal_sized_breakpoints(data_list, classes):
         # Calc the reminder between the two
         r = a - aa
         # Find the value
-        breakpoint = (1 - r) * data_list[aa] + r * data_list[aa + 1]
+        breakpoint = (1 - r) * data_list[aa]
+        # If the cut falls between two values, blend in the next one up.
+        # It can't run past the end of the list.
+        if r:
+            breakpoint += r * data_list[min(aa + 1, n - 1)]
         # Add it to the list
         breaks.append(breakpoint)
 
@@ -0,0 +1,381 @@
+"""
+The plain arithmetic behind the spatial functions.
+
+Points can arrive as GeoDjango Point objects, as (x, y) tuples, as XY named
+tuples or, to skip making an object for every point, as two parallel lists
+of coordinates wrapped up in a Coordinates object. They can sit in a list
+on their own, or in an attribute or dictionary key of the objects in a list.
+
+Nothing here needs Django or the GEOS library. They're only loaded when
+points come in as GeoDjango objects, so that the same kind of object can be
+handed back.
+
+    >> import calculate
+    >> calculate.mean_center([(0, 0), (2, 4)])
+    XY(x=1.0, y=2.0)
+    >> xs = numpy.array([0.0, 2.0])
+    >> ys = numpy.array([0.0, 4.0])
+    >> calculate.mean_center(calculate.Coordinates(xs, ys))
+    XY(x=1.0, y=2.0)
+"""
+import math
+import itertools
+from collections import namedtuple
+from operator import attrgetter
+from calculate import numpy_backend
+from calculate.accessors import get_accessor
+
+
+class XY(namedtuple('XY', ['x', 'y'])):
+    """
+    A lightweight point, returned by the spatial functions when they
+    aren't working with GeoDjango objects.
+    """
+    __slots__ = ()
+
+    def distance(self, other):
+        """
+        Returns the straight-line distance to another point.
+        """
+        dx = self.x - other[0]
+        dy = self.y - other[1]
+        return math.sqrt(dx * dx + dy * dy)
+
+
+class Coordinates(object):
+    """
+    Accepts two parallel lists of x and y coordinates, so they can be handed
+    to the spatial functions in place of a list of points.
+
+    The lists can be NumPy arrays, array.array objects or anything else with
+    a length. If NumPy is installed, arrays are crunched without a Python loop.
+
+    h3. Example usage
+
+        >> import calculate
+        >> coords = calculate.Coordinates([0, 2, 4], [0, 4, 8])
+        >> calculate.mean_center(coords)
+        XY(x=2.0, y=4.0)
+        >> list(coords)
+        [XY(x=0, y=0), XY(x=2, y=4), XY(x=4, y=8)]
+    """
+    def __init__(self, xs, ys):
+        if len(xs) != len(ys):
+            raise ValueError('The x and y coordinates you provided do not \
+have the same number of entries.')
+        self.xs = xs
+        self.ys = ys
+
+    def __len__(self):
+        return len(self.xs)
+
+    def __iter__(self):
+        for x, y in zip(self.xs, self.ys):
+            yield XY(x, y)
+
+
+def is_geos(obj):
+    """
+    Returns True if the object is a GeoDjango geometry. The check doesn't
+    import Django, so it's safe to make when Django isn't installed.
+    """
+    return type(obj).__module__.startswith('django.contrib.gis')
+
+
+def get_points(obj_list, point_attribute_name='point'):
+    """
+    Returns a list of the points in the provided list. They're pulled out of
+    the attribute or dictionary key named by point_attribute_name. If the
+    objects don't have it, they're assumed to be points already.
+    """
+    obj_list = list(obj_list)
+    if not obj_list:
+        raise ValueError('At least one point is required')
+    first = obj_list[0]
+    if isinstance(first, dict):
+        return [obj.get(point_attribute_name) for obj in obj_list]
+    if hasattr(first, point_attribute_name):
+        return [getattr(obj, point_attribute_name) for obj in obj_list]
+    return obj_list
+
+
+def coordinates(obj_list, point_attribute_name='point'):
+    """
+    Accepts a list of points, or of objects or dictionaries holding points,
+    or a Coordinates object. Returns a list of the x coordinates, a list of
+    the y coordinates and the first point, to serve as a template for any
+    points that are returned.
+    """
+    if isinstance(obj_list, Coordinates):
+        if not len(obj_list):
+            raise ValueError('At least one point is required')
+        return obj_list.xs, obj_list.ys, None
+    points = get_points(obj_list, point_attribute_name)
+    template = points[0]
+    # Each coordinate of a GeoDjango point is a trip into the GEOS library,
+    # so get them both in one go
+    if is_geos(template):
+        points = [p.coords for p in points]
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    return xs, ys, template
+
+
+def make_point(x, y, template=None):
+    """
+    Returns a point at x and y. If the template is a GeoDjango geometry, it's
+    a GeoDjango Point with the same spatial reference. Otherwise it's an XY.
+    """
+    if template is not None and is_geos(template):
+        from django.contrib.gis.geos import Point
+        return Point(x, y, srid=template.srid)
+    return XY(x, y)
+
+
+def mean_xy(xs, ys):
+    """
+    Returns the average x and y coordinates.
+    """
+    # Hand arrays and other buffers off to NumPy, if it's installed
+    array_x = numpy_backend.as_array(xs)
+    array_y = numpy_backend.as_array(ys)
+    if array_x is not None and array_y is not None:
+        return numpy_backend.mean(array_x), numpy_backend.mean(array_y)
+
+    # Add them up in order, the same way GEOS finds a centroid
+    n = 0
+    total_x = 0.0
+    total_y = 0.0
+    for x, y in zip(xs, ys):
+        total_x += x
+        total_y += y
+        n += 1
+    return total_x / n, total_y / n
+
+
+def distances(xs, ys, x, y):
+    """
+    Returns the straight-line distance from each point to x and y.
+    """
+    # Hand arrays and other buffers off to NumPy, if it's installed
+    array_x = numpy_backend.as_array(xs)
+    array_y = numpy_backend.as_array(ys)
+    if array_x is not None and array_y is not None:
+        dx = array_x - x
+        dy = array_y - y
+        return numpy_backend.numpy.sqrt(dx * dx + dy * dy)
+
+    # This is the same formula GEOS uses, so the answers match
+    sqrt = math.sqrt
+    return [
+        sqrt((px - x) * (px - x) + (py - y) * (py - y))
+        for px, py in zip(xs, ys)
+    ]
+
+
+class CenterSums(object):
+    """
+    Running totals of the weighted x and y coordinates of a group of
+    points, so their mean center can be found in a single pass.
+
+    If keep is True, the coordinates and weights are held on to as well,
+    for measures like the standard deviation distance that need them.
+    """
+    def __init__(self, template=None, keep=False):
+        self.template = template
+        self.total_x = 0.0
+        self.total_y = 0.0
+        self.total_weight = 0.0
+        if keep:
+            self.xs = []
+            self.ys = []
+            self.weights = []
+        else:
+            self.xs = self.ys = self.weights = None
+
+    def add(self, x, y, weight=None):
+        # Unweighted points are summed up as is, so the answers
+        # match calculate.mean_center exactly
+        if weight is None:
+            self.total_x += x
+            self.total_y += y
+            self.total_weight += 1
+        else:
+            self.total_x += weight * x
+            self.total_y += weight * y
+            self.total_weight += weight
+        if self.xs is not None:
+            self.xs.append(x)
+            self.ys.append(y)
+            self.weights.append(1 if weight is None else weight)
+
+    def mean_xy(self):
+        if not self.total_weight:
+            raise ValueError('The weights of a group of points can not add \
+up to zero')
+        return (
+            self.total_x / self.total_weight,
+            self.total_y / self.total_weight
+        )
+
+    def center(self):
+        x, y = self.mean_xy()
+        return make_point(x, y, self.template)
+
+
+def iter_points(obj_list, point_attribute_name='point', group_by=None,
+                weight=None):
+    """
+    Reads through a list of points, or of objects or dictionaries holding
+    points, and yields an (x, y, group, weight, point) tuple for each one.
+
+    The group_by and weight arguments can each be an attribute name, a
+    dictionary key or a function that accepts an object. When they're None,
+    the group and weight that come out are None too.
+    """
+    if isinstance(obj_list, Coordinates):
+        obj_list = iter(obj_list)
+    iterator = iter(obj_list)
+    try:
+        first = next(iterator)
+    except StopIteration:
+        raise ValueError('At least one point is required')
+    iterator = itertools.chain([first], iterator)
+
+    # Figure out where the points are kept
+    if isinstance(first, dict):
+        def get_point(obj):
+            return obj.get(point_attribute_name)
+    elif hasattr(first, point_attribute_name):
+        get_point = attrgetter(point_attribute_name)
+    else:
+        def get_point(obj):
+            return obj
+    geos = is_geos(get_point(first))
+
+    # ... and the groups and weights
+    get_group = None
+    if group_by is not None:
+        get_group = get_accessor([first], group_by)
+    get_weight = None
+    if weight is not None:
+        get_weight = get_accessor([first], weight)
+
+    for obj in iterator:
+        point = get_point(obj)
+        if geos:
+            x, y = point.coords
+        else:
+            x, y = point[0], point[1]
+        yield (
+            x,
+            y,
+            get_group(obj) if get_group is not None else None,
+            float(get_weight(obj)) if get_weight is not None else None,
+            point
+        )
+
+
+def group_points(obj_list, point_attribute_name='point', group_by=None,
+                 weight=None, keep=False):
+    """
+    Reads through a list of points, or of objects or dictionaries holding
+    points, once. Returns a dictionary with a CenterSums for each group.
+
+    The group_by and weight arguments work the same as for iter_points.
+    When group_by is None, everything goes into a single group with the
+    key None.
+    """
+    groups = {}
+    for x, y, key, w, point in iter_points(obj_list, point_attribute_name,
+                                           group_by, weight):
+        try:
+            sums = groups[key]
+        except KeyError:
+            sums = groups[key] = CenterSums(point, keep=keep)
+        sums.add(x, y, w)
+    return groups
+
+
+def polygon_rings(polygon):
+    """
+    Returns every ring in the provided polygon as a list of (x, y) pairs.
+
+    The polygon can be a GeoDjango Polygon or MultiPolygon. It can also be
+    a single ring of (x, y) pairs, a list of rings with the outside first
+    and any holes after, or a list of those for a multipolygon.
+    """
+    if is_geos(polygon):
+        if polygon.geom_type == 'Polygon':
+            return list(polygon.coords)
+        elif polygon.geom_type == 'MultiPolygon':
+            return [ring for part in polygon.coords for ring in part]
+        raise ValueError('A Polygon or MultiPolygon is required, not a %s' %
+                         polygon.geom_type)
+
+    # Figure out how deeply the coordinates are nested
+    try:
+        if not hasattr(polygon[0][0], '__getitem__'):
+            return [polygon]
+        elif not hasattr(polygon[0][0][0], '__getitem__'):
+            return list(polygon)
+        return [ring for part in polygon for ring in part]
+    except (IndexError, TypeError):
+        raise ValueError('The polygon you provided has no coordinates')
+
+
+def trapezoids(rings):
+    """
+    Slices the area inside the provided rings into trapezoids with flat tops
+    and bottoms. Holes and separate parts are handled by the even-odd rule,
+    so the rings of a simple polygon or multipolygon can be mixed together.
+
+    Returns a list of (y, height, bottom left x, top left x, bottom right x,
+    top right x) tuples.
+    """
+    # Gather up every edge that isn't flat as (bottom y, top y, x at the
+    # bottom, change in x for each step up)
+    edges = []
+    ys = set()
+    for ring in rings:
+        ring = [(float(p[0]), float(p[1])) for p in ring]
+        if ring and ring[0] != ring[-1]:
+            ring.append(ring[0])
+        for (x1, y1), (x2, y2) in zip(ring, ring[1:]):
+            ys.add(y1)
+            if y1 == y2:
+                continue
+            if y1 > y2:
+                x1, y1, x2, y2 = x2, y2, x1, y1
+            edges.append((y1, y2, x1, (x2 - x1) / (y2 - y1)))
+    edges.sort()
+    ys = sorted(ys)
+
+    # Sweep up through the bands between each pair of vertex heights,
+    # keeping track of the edges that cross the current band
+    out_list = []
+    active = []
+    i = 0
+    for bottom, top in zip(ys, ys[1:]):
+        while i < len(edges) and edges[i][0] <= bottom:
+            active.append(edges[i])
+            i += 1
+        active = [e for e in active if e[1] > bottom]
+
+        # Line the edges up from left to right across the middle of the band
+        middle = (bottom + top) / 2.0
+        crossings = sorted(
+            (
+                x + slope * (middle - y),
+                x + slope * (bottom - y),
+                x + slope * (top - y)
+            )
+            for y, _, x, slope in active
+        )
+
+        # Every other gap between them is inside the polygon
+        for left, right in zip(crossings[::2], crossings[1::2]):
+            out_list.append(
+                (bottom, top - bottom, left[1], left[2], right[1], right[2])
+            )
+    return out_list
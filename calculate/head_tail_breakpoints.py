@@ -0,0 +1,52 @@
+def head_tail_breakpoints(data_list, classes=None, threshold=0.4):
+    """
+    Returns break points for data with a long tail, like incomes or
+    city populations, where there are far more small values than big ones.
+
+    The values are split at their mean. The values above it, the "head," are
+    split again at their own mean, and so on, for as long as the head makes
+    up no more than "threshold" of the values it was cut from.
+
+    The number of classes is picked by the data. Provide "classes" to cap it.
+
+    h3. Example usage
+
+        >> import calculate
+        >> calculate.head_tail_breakpoints([1, 1, 1, 2, 2, 3, 4, 8, 16, 64])
+        [1.0, 10.2, 40.0, 64.0]
+
+    h3. Documentation
+
+        * "Head/tail breaks":http://en.wikipedia.org/wiki/Head/tail_Breaks
+        * "Jiang, Head/tail breaks":https://arxiv.org/abs/1209.2801
+    """
+    # Make sure we've got a sensible number of classes
+    if classes is not None and classes < 1:
+        raise ValueError('The number of classes should be at least 1')
+
+    # Convert all the values to floats and test to make sure
+    # there aren't any strings in there
+    try:
+        data_list = list(map(float, data_list))
+    except ValueError:
+        raise ValueError('Input values must contain numbers')
+    if not data_list:
+        raise ValueError('The list should contain at least one value')
+
+    breaks = [min(data_list)]
+    maximum = max(data_list)
+    head = data_list
+    while classes is None or len(breaks) < classes:
+        # Split what's left at its mean
+        mean = sum(head) / float(len(head))
+        tail_size = len(head)
+        head = [i for i in head if i > mean]
+        # Stop once there's nothing left above the mean
+        if not head:
+            break
+        breaks.append(mean)
+        # ... or once the head is no longer the minority
+        if len(head) > threshold * tail_size:
+            break
+    breaks.append(maximum)
+    return breaks
@@ -0,0 +1,135 @@
+import random
+
+
+def jenks_breakpoints(data_list, classes, sample_size=10000, seed=None):
+    """
+    Returns break points for groups that are as internally alike as possible,
+    known as Jenks natural breaks.
+
+    Provide a list of data values and the number of classes you'd like the list
+    broken up into. The breaks are chosen so that the sum of the squared
+    distances between each value and the mean of its class is as small as it
+    can be. The list you provide is not modified.
+
+    The breaks are found exactly, using the dynamic programming method of
+    Fisher, sped up by dividing and conquering each round. Repeated values
+    are only considered once.
+
+    Lists with more than "sample_size" values are classified from a random
+    sample of that size, which keeps big lists fast at the cost of exactness.
+    The smallest and largest values always make it into the breaks. The "seed"
+    keyword argument makes the sample repeatable. Set "sample_size" to None
+    to always use every value.
+
+    If there are fewer different values than classes, you get back one class
+    for each value.
+
+    h3. Example usage
+
+        >> import calculate
+        >> calculate.jenks_breakpoints([1, 2, 3, 10, 11, 12, 20, 21, 22], 3)
+        [1.0, 10.0, 20.0, 22.0]
+
+    h3. Documentation
+
+        * "Jenks natural breaks":http://en.wikipedia.org/wiki/\
+Jenks_natural_breaks_optimization
+        * "Fisher, On grouping for maximum homogeneity":http://www.jstor.org/\
+stable/2281952
+        * "Ckmeans.1d.dp":https://journal.r-project.org/archive/2011-2/\
+RJournal_2011-2_Wang+Song.pdf
+    """
+    # Make sure we've got a sensible number of classes
+    if classes < 1:
+        raise ValueError('The number of classes should be at least 1')
+
+    # Convert all the values to floats and test to make sure
+    # there aren't any strings in there
+    try:
+        data_list = list(map(float, data_list))
+    except ValueError:
+        raise ValueError('Input values must contain numbers')
+    if not data_list:
+        raise ValueError('The list should contain at least one value')
+
+    minimum = min(data_list)
+    maximum = max(data_list)
+
+    # Cut big lists down to a sample, keeping the ends
+    if sample_size is not None and len(data_list) > sample_size:
+        data_list = random.Random(seed).sample(data_list, sample_size)
+        data_list.extend([minimum, maximum])
+
+    # Collapse the sorted values down to each unique value and
+    # how many times it appears
+    values = []
+    weights = []
+    for value in sorted(data_list):
+        if values and values[-1] == value:
+            weights[-1] += 1
+        else:
+            values.append(value)
+            weights.append(1)
+    m = len(values)
+    classes = min(int(classes), m)
+
+    # Keep running totals of the counts, sums and sums of squares, so the
+    # spread of any run of values can be figured in one step. The values are
+    # shifted toward zero first so the subtraction doesn't lose precision.
+    shift = values[m // 2]
+    w_totals = [0]
+    s_totals = [0.0]
+    ss_totals = [0.0]
+    for value, weight in zip(values, weights):
+        d = value - shift
+        w_totals.append(w_totals[-1] + weight)
+        s_totals.append(s_totals[-1] + weight * d)
+        ss_totals.append(ss_totals[-1] + weight * d * d)
+
+    def cost(i, j):
+        # Sum of squared distances from the mean for values[i:j]
+        w = w_totals[j] - w_totals[i]
+        s = s_totals[j] - s_totals[i]
+        return ss_totals[j] - ss_totals[i] - s * s / w
+
+    # The best we can do with one class covering the first j values
+    previous = [0.0] + [cost(0, j) for j in range(1, m + 1)]
+
+    # Where the last class starts in the best answer for each round
+    starts = []
+
+    for c in range(2, classes + 1):
+        current = [None] * (m + 1)
+        start = [0] * (m + 1)
+        # The best place to start the last class never moves left as the
+        # list gets longer, so each half can search a narrower range
+        stack = [(c, m, c - 1, m - 1)]
+        while stack:
+            lo, hi, opt_lo, opt_hi = stack.pop()
+            if lo > hi:
+                continue
+            j = (lo + hi) // 2
+            best = None
+            best_i = opt_lo
+            for i in range(opt_lo, min(j - 1, opt_hi) + 1):
+                total = previous[i] + cost(i, j)
+                if best is None or total < best:
+                    best = total
+                    best_i = i
+            current[j] = best
+            start[j] = best_i
+            stack.append((lo, j - 1, opt_lo, best_i))
+            stack.append((j + 1, hi, best_i, opt_hi))
+        previous = current
+        starts.append(start)
+
+    # Walk back through the rounds to find where each class starts
+    cuts = []
+    j = m
+    for start in reversed(starts):
+        j = start[j]
+        cuts.append(values[j])
+    cuts.reverse()
+
+    # Pass it all out
+    return [minimum] + cuts + [maximum]
@@ -1,3 +1,8 @@
+from calculate import columns
+from calculate import numpy_backend
+from calculate import querysets
+
+
 def mean(data_list):
     """
     Accepts a sample of values and returns their mean.
@@ -20,15 +25,23 @@ def mean(data_list):
 
         "mean":http://en.wikipedia.org/wiki/Arithmetic_mean
     """
+    # Stream querysets in a chunk at a time
+    data_list = querysets.as_numbers(data_list)
+
+    # Hand arrays and other buffers off to NumPy, if it's installed
+    array = numpy_backend.as_array(data_list)
+    if array is not None:
+        return numpy_backend.mean(array)
+
     # Convert all the values to floats and test to make sure
     # there aren't any strings in there
     try:
-        data_list = list(map(float, data_list))
+        data_list = columns.floats(data_list)
     except ValueError:
         raise ValueError('Input values should contain numbers')
     # Count the number of values in the sample
     n = len(data_list)
     # Sum up the values in the sample
-    sum_ = sum(data_list)
+    sum_ = float(sum(data_list))
     # Divide them to find the mean
     return sum_ / n
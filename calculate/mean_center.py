@@ -1,4 +1,5 @@
-from django.contrib.gis.geos import MultiPoint
+from calculate import geometry
+from calculate import querysets
 
 
 def mean_center(obj_list, point_attribute_name='point'):
@@ -8,6 +9,12 @@ def mean_center(obj_list, point_attribute_name='point'):
 
     Returns a Point object with the mean center of the provided points.
 
+    The points can also be (x, y) tuples, and they can be provided in a list
+    on their own. Or, to skip creating an object for every point, pass in a
+    calculate.Coordinates with parallel lists of x and y coordinates. GeoDjango
+    isn't needed for any of those, and you'll get back a calculate.geometry.XY
+    named tuple instead of a Point.
+
     The mean center is the average x and y of all those points.
 
     By default, the function expects the Point field on your model
@@ -21,11 +28,8 @@ def mean_center(obj_list, point_attribute_name='point'):
         >> import calculate
         >> calculate.mean_center(qs)
         <Point object at 0x77a1694>
-
-    h3. Dependencies
-
-        * "django":http://www.djangoproject.com/
-        * "geodjango":http://www.geodjango.org/
+        >> calculate.mean_center([(0, 0), (2, 4)])
+        XY(x=1.0, y=2.0)
 
     h3. Documentation
 
@@ -33,13 +37,15 @@ def mean_center(obj_list, point_attribute_name='point'):
 index.html#//005p00000018000000.htm
 
     """
-    # Figure out what type of objects we're dealing with
-    if isinstance(obj_list[0], type({})):
-        def getkey(obj, key):
-            return obj.get(key)
-        gettr = getkey
-    else:
-        gettr = getattr
+    # Let the database do the averaging, if it can
+    if querysets.is_queryset(obj_list):
+        center = querysets.mean_center(obj_list, point_attribute_name)
+        if center is not querysets.UNSUPPORTED:
+            return center
+
+    # Pull out the coordinates
+    xs, ys, template = geometry.coordinates(obj_list, point_attribute_name)
     # Crunch it
-    multipoint = MultiPoint([gettr(p, point_attribute_name) for p in obj_list])
-    return multipoint.centroid
+    x, y = geometry.mean_xy(xs, ys)
+    # Hand back the same kind of point we were given
+    return geometry.make_point(x, y, template)
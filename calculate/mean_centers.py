@@ -0,0 +1,52 @@
+from calculate import geometry
+
+
+def mean_centers(obj_list, point_attribute_name='point', group_by=None,
+                 weight=None):
+    """
+    Accepts a geoqueryset, list of objects or list of dictionaries, expected
+    to contain points as one of their attributes, and returns the mean center
+    of each group of points in a dictionary keyed by group.
+
+    The points are read once, keeping running totals for each group, so no
+    geometry has to be built to hold them all. They can be GeoDjango Points
+    or (x, y) tuples, the same as calculate.mean_center, and you get back
+    the same kind of point.
+
+    The "group_by" kwarg can be an attribute name, a dictionary key or a
+    function that accepts an object and returns its group. If it's left
+    out, every point goes into one group with the key None.
+
+    The "weight" kwarg works the same way, and pulls out a number that
+    counts for how much each point should pull the center its way. A
+    population center weights each place by how many people live there.
+
+    h3. Example usage
+
+        >> import calculate
+        >> calculate.mean_centers(
+            Tract.objects.all(),
+            group_by='district',
+            weight='population'
+        )
+        {1: <Point object at 0x77a1694>, 2: <Point object at 0x77a16d0>}
+        >> calculate.mean_centers(
+            [(0, 0), (2, 4)],
+            weight=lambda p: p[0] + 1
+        )
+        {None: XY(x=1.5, y=3.0)}
+
+    h3. Documentation
+
+        * "mean center":http://help.arcgis.com/en/arcgisdesktop/10.0/help/\
+index.html#//005p00000018000000.htm
+    """
+    # Add up the points in each group
+    groups = geometry.group_points(
+        obj_list,
+        point_attribute_name,
+        group_by=group_by,
+        weight=weight
+    )
+    # Crunch it
+    return dict((key, sums.center()) for key, sums in groups.items())
@@ -1,3 +1,11 @@
+import calculate
+from calculate import columns
+from calculate import numpy_backend
+from calculate import querysets
+from calculate import sample
+from calculate import selection
+
+
 def median(data_list):
     """
     Accepts a list of numbers and returns the median value.
@@ -9,6 +17,15 @@ def median(data_list):
     therefore no exact middle -- the two values nearest the middle
     are averaged and the mean returned.
 
+    The middle values are found with calculate.selection, which only
+    partially orders the list, rather than with a full sort.
+
+    A calculate.Sample, which is already sorted, can be passed in place of
+    the list.
+
+    If the data are too big to hold in memory, you can pass in a
+    calculate.QuantileSketch instead and get back an estimate.
+
     h3. Example usage
 
         >> import calculate
@@ -24,24 +41,48 @@ def median(data_list):
         * "median":http://en.wikipedia.org/wiki/Median
 
     """
+    # A sketch can estimate the median for us
+    if isinstance(data_list, calculate.QuantileSketch):
+        return data_list.median()
+
+    # Stream querysets in a chunk at a time
+    data_list = querysets.as_numbers(data_list)
+
+    # A sorted sample, handed to us or cached, has the middle ready to go
+    data_list = sample.cached(data_list)
+    if isinstance(data_list, calculate.Sample):
+        values = data_list.values
+        n = len(values)
+        if n & 1:
+            return values[n // 2]
+        return (values[n // 2 - 1] + values[n // 2]) / 2.0
+
+    # Hand arrays and other buffers off to NumPy, if it's installed
+    array = numpy_backend.as_array(data_list)
+    if array is not None:
+        return numpy_backend.median(array)
+
     # Convert all the values to floats and test to make sure there aren't
     # any strings in there
     try:
-        data_list = list(map(float, data_list))
+        data_list = columns.floats(data_list)
     except TypeError:
         raise TypeError('Input values should be a number')
     # Fetch the total number of values
     n = len(data_list)
-    # Sort the values from top to bottom
-    data_list.sort()
-    # Test whether the n is odd
+    # Rather than sorting everything, pick out just the
+    # value or two we need from the middle of the list.
+    # Any list was our own copy, so it can be overwritten.
+    # Arrays and other buffers are left alone.
     if n & 1:
-        # If is is, get the index simply by dividing it in half
-        index = n / 2
-        median = data_list[int(index)]
+        # If the n is odd, get the index simply by dividing it in half
+        median = float(selection.select(data_list, n // 2, overwrite=True))
     else:
         # If the n is even, average the two values at the center
-        low_index = (n / 2) - 1
-        high_index = n / 2
-        median = (data_list[int(low_index)] + data_list[int(high_index)]) / 2.0
+        low, high = selection.select_many(
+            data_list,
+            [n // 2 - 1, n // 2],
+            overwrite=True
+        )
+        median = (low + high) / 2.0
     return median
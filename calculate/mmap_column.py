@@ -0,0 +1,49 @@
+import mmap
+import os
+from array import array
+
+
+def mmap_column(path, typecode='d'):
+    """
+    Accepts the path to a binary file packed with numbers and returns a
+    memoryview of it that the other functions can read in place.
+
+    The file is memory-mapped rather than read, so it can be bigger than
+    the memory you have. Only the parts that are used get loaded, and no
+    Python object is made for each value. When NumPy is installed it reads
+    the file without copying it.
+
+    The "typecode" kwarg says what the file holds, using the codes from
+    Python's array module. The default, "d", is 64-bit floats in your
+    machine's byte order, which is what array.tofile() and NumPy's
+    tofile() write out. Use "q" for 64-bit integers.
+
+    Requires Python 3.
+
+    h3. Example usage
+
+        >> import calculate
+        >> numpy.arange(100000000, dtype='float64').tofile('column.bin')
+        >> column = calculate.mmap_column('column.bin')
+        >> calculate.median(column)
+        49999999.5
+
+    h3. Documentation
+
+        * "mmap":https://docs.python.org/3/library/mmap.html
+        * "array":https://docs.python.org/3/library/array.html
+    """
+    itemsize = array(typecode).itemsize
+
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size % itemsize:
+            raise ValueError('The file is %s bytes long, which is not a \
+multiple of %s, the size of each value.' % (size, itemsize))
+        # An empty file can't be mapped, but we can pass out an empty column
+        if not size:
+            return memoryview(array(typecode))
+        # The map keeps its own hold on the file, so ours can be closed
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    return memoryview(mapped).cast(typecode)
@@ -1,15 +1,25 @@
 import math
 import random
-from operator import attrgetter
-from django.contrib.gis.geos import Point
+from calculate import geometry
+from calculate import querysets
 
 
-def nudge_points(geoqueryset, point_attribute_name='point', radius=0.0001):
+def nudge_points(geoqueryset, point_attribute_name='point', radius=0.0001,
+                 tolerance=None, seed=None, changed_only=False,
+                 keep_order=False):
     """
     A utility that accepts a list of objects with a GeoDjango Point attribute
     and nudges slightly apart any identical points.
 
-    Returns the modified input as a list.
+    Returns the modified input as a list, sorted by where each point sat
+    before it was nudged. Points in the same spot keep the order they were
+    provided in. Set the "keep_order" kwarg to True to get the list back in
+    the order it was provided instead.
+
+    The points can also be (x, y) tuples, in an attribute, in a dictionary
+    key or on their own in the list. GeoDjango isn't needed for those.
+    Nudged points are replaced with the same kind of point they came in as:
+    a GeoDjango Point, or a calculate.geometry.XY named tuple otherwise.
 
     By default it looks for the point in an attribute named "point." If
     your point data attribute has a different name, submit it as a string
@@ -18,6 +28,19 @@ def nudge_points(geoqueryset, point_attribute_name='point', radius=0.0001):
     By default, the distance of the move is 0.0001 decimal degrees. You can
     modify it by submitting a "radius" kwarg.
 
+    Points are grouped with a single pass through the list. The first point
+    in each group stays put and the rest are spread evenly around a circle
+    of the provided radius, so they can't land on top of each other. By
+    default only points with exactly the same coordinates are grouped. Set
+    the "tolerance" kwarg to also group points that round off to the same
+    multiple of it.
+
+    The spacing is the same every time. Submit a "seed" to turn each circle
+    by a random, but repeatable, angle.
+
+    Set "changed_only" to True to get back only the objects that were moved,
+    which is handy for saving them with Django's bulk_update.
+
     I'm not sure if this will go wrong if your data is in a different unit
     of measurement.
 
@@ -31,11 +54,11 @@ def nudge_points(geoqueryset, point_attribute_name='point', radius=0.0001):
         >>> from models import FakePoint
         >>> qs = FakePoint.objects.all()
         >>> qs = calculate.nudge_points(qs)
+        >>> moved = calculate.nudge_points(qs, changed_only=True)
+        >>> FakePoint.objects.bulk_update(moved, ['point'])
 
     h3. Dependencies
 
-        * "django":http://www.djangoproject.com/
-        * "geodjango":http://www.geodjango.org/
         * "math":http://docs.python.org/library/math.html
 
     h3. Documentation
@@ -43,27 +66,91 @@ def nudge_points(geoqueryset, point_attribute_name='point', radius=0.0001):
         * "This code is translated from SQL by Francis Dupont":http://postgis.\
 refractions.net/pipermail/postgis-users/2008-June/020354.html
     """
-    previous_x = None
-    previous_y = None
+    if tolerance is not None and tolerance <= 0:
+        raise ValueError('The tolerance should be greater than zero')
     r = radius
     pan = point_attribute_name
-    sorted_gqs = sorted(list(geoqueryset), key=attrgetter(pan))
-
-    out_list = []
-    for obj in sorted_gqs:
-        x = getattr(obj, pan).x
-        y = getattr(obj, pan).y
-        if (x == previous_x and y == previous_y and
-                previous_x is not None and previous_y is not None):
+
+    # Only the objects that share a spot can change, so if that's all
+    # we want, ask the database for just them
+    if changed_only and tolerance is None and \
+            querysets.is_queryset(geoqueryset):
+        shared = querysets.shared_points(geoqueryset, pan)
+        if shared is not querysets.UNSUPPORTED:
+            geoqueryset = shared
+
+    # Figure out where the points are kept
+    obj_list = list(geoqueryset)
+    if not obj_list:
+        return obj_list
+    if isinstance(obj_list[0], dict):
+        def get_point(obj):
+            return obj.get(pan)
+
+        def set_point(obj, point):
+            obj[pan] = point
+            return obj
+    elif hasattr(obj_list[0], pan):
+        def get_point(obj):
+            return getattr(obj, pan)
+
+        def set_point(obj, point):
+            setattr(obj, pan, point)
+            return obj
+    else:
+        def get_point(obj):
+            return obj
+
+        def set_point(obj, point):
+            return point
+
+    # Pull out the coordinates once and group identical points together,
+    # remembering where each one sits in the list
+    groups = {}
+    coords = []
+    for i, obj in enumerate(obj_list):
+        point = get_point(obj)
+        if geometry.is_geos(point):
+            x, y = point.coords
+        else:
+            x, y = point[0], point[1]
+        coords.append((x, y))
+        if tolerance is None:
+            key = (x, y)
+        else:
+            key = (round(x / tolerance), round(y / tolerance))
+        try:
+            groups[key].append(i)
+        except KeyError:
+            groups[key] = [i]
+
+    # Leave the first point in each group where it is and space
+    # the rest out evenly around a circle
+    rng = random.Random(seed) if seed is not None else None
+    changed = []
+    for indexes in groups.values():
+        if len(indexes) < 2:
+            continue
+        x, y = coords[indexes[0]]
+        step = 2 * math.pi / (len(indexes) - 1)
+        offset = rng.random() * step if rng is not None else 0.0
+        for j, i in enumerate(indexes[1:]):
             # angle value in radian between 0 and 2pi
-            theta = random.random() * 2 * math.pi
-            new_point = Point(
+            theta = offset + j * step
+            new_point = geometry.make_point(
                 x + (math.cos(theta) * r),
-                y + (math.sin(theta) * r)
+                y + (math.sin(theta) * r),
+                get_point(obj_list[i])
             )
-            setattr(obj, pan, new_point)
-        else:
-            previous_x = x
-            previous_y = y
-        out_list.append(obj)
-    return out_list
+            obj_list[i] = set_point(obj_list[i], new_point)
+            changed.append(i)
+
+    # Put everything in order by where it started out, unless we've
+    # been asked to leave it be
+    if changed_only:
+        order = sorted(changed)
+    else:
+        order = range(len(obj_list))
+    if not keep_order:
+        order = sorted(order, key=coords.__getitem__)
+    return [obj_list[i] for i in order]
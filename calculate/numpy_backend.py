@@ -0,0 +1,260 @@
+"""
+Vectorized versions of the descriptive statistics functions.
+
+They are used automatically when NumPy is installed and the data arrive as
+a NumPy array, an array.array or any other object that supports the buffer
+protocol. The values are read straight out of the buffer, without copying
+them into a Python list.
+
+Lists, tuples and other iterables continue to use the pure-Python code.
+To force the pure-Python path for everything, flip the switch:
+
+    >> import calculate
+    >> calculate.numpy_backend.ENABLED = False
+"""
+try:
+    import numpy
+    HAS_NUMPY = True
+except ImportError:
+    numpy = None
+    HAS_NUMPY = False
+
+# Set this to False to always use the pure-Python implementations
+ENABLED = True
+
+
+def as_array(data_list):
+    """
+    Returns the provided data as a one-dimensional NumPy array of floats
+    if this backend can handle it. Otherwise returns None, which signals
+    the caller to fall back to the pure-Python implementation.
+    """
+    array = _raw_array(data_list)
+    if array is None:
+        return None
+
+    # This is a no-op for float64 data. Other numeric types are converted
+    # in C so the sums can't overflow.
+    return array.astype(numpy.float64, copy=False)
+
+
+def as_integer_array(data_list):
+    """
+    Returns the provided data as a one-dimensional NumPy array in its
+    original integer type, or None if it doesn't hold integers. Big
+    integers lose their last digits when they're converted to floats.
+    """
+    array = _raw_array(data_list)
+    if array is None or array.dtype.kind not in 'iu':
+        return None
+    return array
+
+
+def _raw_array(data_list):
+    if not ENABLED or not HAS_NUMPY:
+        return None
+
+    # Arrays are used as is, anything else has to offer up a buffer
+    if isinstance(data_list, numpy.ndarray):
+        array = data_list
+    else:
+        try:
+            array = numpy.asarray(memoryview(data_list))
+        except (TypeError, ValueError):
+            return None
+
+    # Leave anything that isn't a flat list of numbers to the Python code,
+    # which knows how to complain about it.
+    if array.ndim != 1 or array.dtype.kind not in 'biuf' or not array.size:
+        return None
+    return array
+
+
+def mean(array):
+    return float(array.sum()) / array.size
+
+
+def median(array):
+    return float(numpy.median(array))
+
+
+def select_many(array, positions):
+    # Make sure all of the positions actually exist
+    for position in positions:
+        if not 0 <= position < array.size:
+            raise IndexError('Position %s is out of range for a list with \
+%s values' % (position, array.size))
+    # Partition a copy of the array around every position at once
+    partitioned = numpy.partition(array, sorted(set(positions)))
+    return [float(partitioned[position]) for position in positions]
+
+
+def standard_deviation(array):
+    return float(array.std())
+
+
+def range(array):
+    if array.size < 2:
+        raise ValueError('Input must contain at least two values. \
+            You provided a list with %s values' % array.size)
+    return float(array.max() - array.min())
+
+
+def variation_coefficient(array):
+    return standard_deviation(array) / mean(array)
+
+
+def elfi(array):
+    return 1 - float(numpy.dot(array, array))
+
+
+def co_moments(array_one, array_two):
+    if array_one.size != array_two.size:
+        raise ValueError('The two lists you provided do not have the same \
+number of entries. Pearson\'s r can only be calculated with paired data.')
+
+    # Measure each value's distance from the mean of its list
+    mean_one = float(array_one.mean())
+    mean_two = float(array_two.mean())
+    deviations_one = array_one - mean_one
+    deviations_two = array_two - mean_two
+
+    # Return the means, the sums of squared deviations and the sum
+    # of the paired deviations multiplied together
+    return (
+        mean_one,
+        mean_two,
+        float(numpy.dot(deviations_one, deviations_one)),
+        float(numpy.dot(deviations_two, deviations_two)),
+        float(numpy.dot(deviations_one, deviations_two)),
+    )
+
+
+def digit_counts(array, exact_digits, tolerance, integers=None):
+    # Mirrors calculate.benford, one step at a time, for the whole array.
+    # If the numbers started out as integers, those are passed in too,
+    # so the digits floats can't hold are still read exactly.
+    values = numpy.abs(array[numpy.isfinite(array)])
+
+    # Tally the last digits
+    if integers is not None:
+        # fmod keeps the sign of the number, unlike %, and can't overflow
+        # the way abs() does on the most negative integer
+        last_digits = numpy.abs(numpy.fmod(integers, 10))
+    else:
+        last_digits = numpy.floor(values) % 10
+    last = numpy.bincount(last_digits.astype(numpy.intp), minlength=10)
+
+    # Shift the decimal point so two significant digits sit in front of it
+    positive = values > 0
+    values = values[positive]
+    if integers is not None:
+        originals = integers[positive]
+        read = int
+    else:
+        originals = values.copy()
+        read = float
+    values[values < 1e-290] *= 1e300
+    exponent = numpy.floor(numpy.log10(values)) - 1
+    power = numpy.power(10.0, numpy.abs(exponent))
+    shrink = exponent >= 0
+    scaled = values * numpy.where(shrink, 1.0, power)
+    scaled[shrink] /= power[shrink]
+    scaled = numpy.where(scaled >= 100, scaled / 10, scaled)
+    scaled = numpy.where(scaled < 10, scaled * 10, scaled)
+    digits = numpy.floor(scaled)
+
+    # Read out the ones that are too close to call exactly
+    close = (scaled - digits < tolerance) | (digits + 1 - scaled < tolerance)
+    digits[close] = [exact_digits(read(v)) for v in originals[close]]
+
+    # Tally the first two digits
+    first_two = numpy.bincount(digits.astype(numpy.intp), minlength=100)
+    return [int(i) for i in first_two], [int(i) for i in last]
+
+
+def pearson_matrix(columns):
+    # Line the columns up as the rows of one big matrix
+    matrix = numpy.array(columns, dtype=numpy.float64)
+
+    # Measure each value's distance from the mean of its column
+    deviations = matrix - matrix.mean(axis=1)[:, numpy.newaxis]
+
+    # Multiply every column against every other one in a single go
+    comoments = numpy.dot(deviations, deviations.T)
+    scale = numpy.sqrt(numpy.diag(comoments))
+    denominator = numpy.outer(scale, scale)
+
+    # Avoid dividing by zero, the same as calculate.pearson
+    zero = denominator == 0
+    denominator[zero] = 1
+    r = comoments / denominator
+    r[zero] = 0
+    return r.tolist()
+
+
+def random_points(pieces, areas, n, draws=None):
+    # Mirrors calculate.random_points, drawing every point in one go.
+    # The three random numbers for each point can be passed in, in turn,
+    # so a seed gives the same points with or without NumPy.
+    if draws is None:
+        draws = numpy.random.random_sample(3 * n)
+    draws = numpy.frombuffer(draws, dtype=numpy.float64).reshape(n, 3).T
+    pieces = numpy.array(pieces, dtype=numpy.float64).reshape(-1, 6)
+    totals = numpy.cumsum(areas)
+
+    # Pick a piece for every point, with the bigger ones more likely
+    k = numpy.searchsorted(totals, draws[0] * totals[-1], side='right')
+    k = numpy.minimum(k, len(totals) - 1)
+    y, height, l0, l1, r0, r1 = pieces[k].T
+    w0 = r0 - l0
+    w1 = r1 - l1
+
+    # Pick a height, favoring the wider end of each trapezoid
+    u = draws[1]
+    root = w0 + numpy.sqrt(w0 * w0 * (1 - u) + w1 * w1 * u)
+    t = u * (w0 + w1) / numpy.where(root > 0, root, 1)
+
+    # Then pick a spot across it at that height, and interleave them
+    coords = numpy.empty(2 * n)
+    coords[0::2] = l0 + (l1 - l0) * t + (w0 + (w1 - w0) * t) * draws[2]
+    coords[1::2] = y + height * t
+    return coords
+
+
+def spatial_moments(xs, ys, weights=None):
+    # Mirrors calculate.dispersion.moments, in two passes over the arrays
+    if weights is None:
+        total = float(xs.size)
+        mean_x = float(xs.mean())
+        mean_y = float(ys.mean())
+        dx = xs - mean_x
+        dy = ys - mean_y
+        wx = dx
+        wy = dy
+    else:
+        total = float(weights.sum())
+        if not total > 0:
+            raise ValueError('The weights of the points have to add up to \
+more than zero')
+        mean_x = float(numpy.dot(weights, xs)) / total
+        mean_y = float(numpy.dot(weights, ys)) / total
+        dx = xs - mean_x
+        dy = ys - mean_y
+        wx = weights * dx
+        wy = weights * dy
+    return (
+        total,
+        mean_x,
+        mean_y,
+        float(numpy.dot(wx, dx)),
+        float(numpy.dot(wy, dy)),
+        float(numpy.dot(wx, dy)),
+    )
+
+
+def count_below(array, value, inclusive=False):
+    # Count the values below the provided one, or equal to it if asked
+    if inclusive:
+        return int(numpy.count_nonzero(array <= value))
+    return int(numpy.count_nonzero(array < value))
@@ -1,8 +1,16 @@
+from calculate import querysets
+from calculate.accessors import get_accessor
+
+
 def ordinal_rank(sequence, item, order_by=None, direction='desc'):
     """
     Accepts a list and an object. Returns the object's ordinal rank
     as an integer.
 
+    If you need the rank of every object in the list, use
+    calculate.ordinal_ranks, which only sorts the list once. If the list
+    keeps changing, keep a calculate.RankIndex up to date instead.
+
     h3. Example usage
 
         >> import calculate
@@ -19,20 +27,37 @@ def ordinal_rank(sequence, item, order_by=None, direction='desc'):
         * "ordinal rank":http://en.wikipedia.org/wiki/Ranking#Ordinal_ranking\
 _.28.221234.22_ranking.29
     """
+    # Querysets without an ordering are ranked in primary key order,
+    # so the ranks come out the same whichever way they're worked out
+    if querysets.is_queryset(sequence):
+        sequence = querysets.ordered(sequence)
+
+    # Let the database do the counting, if it can
+    if order_by and querysets.is_queryset(sequence):
+        rank = querysets.ordinal_rank(sequence, item, order_by, direction)
+        if rank is not querysets.UNSUPPORTED:
+            return rank
+
     seq_list = list(sequence)
-    if order_by:
-        # Figure out what type of objects we're dealing with
-        if isinstance(seq_list[0], type({})):
-            def getkey(obj, key):
-                return obj.get(key)
-            gettr = getkey
-        else:
-            gettr = getattr
-        if direction == 'desc':
-            seq_list.sort(key=lambda x: gettr(x, order_by), reverse=True)
-        elif direction == 'asc':
-            seq_list.sort(key=lambda x: gettr(x, order_by))
-        else:
-            raise ValueError('Direction kwarg should be either asc or desc.')
-    index = seq_list.index(item)
-    return index + 1
+
+    # If there's nothing to sort by, the list is already in order
+    if not order_by:
+        return seq_list.index(item) + 1
+
+    # Validate the direction
+    if direction not in ['desc', 'asc']:
+        raise ValueError('Direction kwarg should be either asc or desc.')
+
+    # For a single lookup, counting the values ahead of the item's in
+    # one pass beats sorting the whole list. Ties go to whichever
+    # comes first in the list.
+    position = seq_list.index(item)
+    gettr = get_accessor(seq_list, order_by)
+    value_list = [gettr(obj) for obj in seq_list]
+    value = value_list[position]
+    if direction == 'desc':
+        ahead = sum(1 for v in value_list if v > value)
+    else:
+        ahead = sum(1 for v in value_list if v < value)
+    ties = sum(1 for v in value_list[:position] if v == value)
+    return ahead + ties + 1
@@ -0,0 +1,78 @@
+from calculate import querysets
+from calculate.accessors import get_accessor
+
+
+def ordinal_ranks(sequence, order_by=None, direction='desc'):
+    """
+    Accepts a list and, optionally, the value and direction to order it by.
+    Returns a list with the ordinal rank of every object, in the same order
+    as the list that was provided.
+
+    In ordinal ranking every object gets its own rank, even when there is
+    a tie (i.e. "1234"). Tied objects are ranked in the order they appear
+    in the list. If no order_by is provided, the list is assumed to already
+    be in order. Querysets that aren't ordered are ranked in primary key
+    order.
+
+    The order_by argument can be an attribute name, a dictionary key or a
+    function, just like calculate.competition_rank. The way the value is
+    retrieved is chosen once, and the list is only sorted once, so this is
+    much faster than calling calculate.ordinal_rank for every object.
+
+    h3. Example usage
+
+        >> import calculate
+        >> dict_list = [
+            {'name': 'Joan', 'value': 1},
+            {'name': 'Jane', 'value': 2},
+            {'name': 'Mary', 'value': 2},
+            {'name': 'Josh', 'value': 3},
+        ]
+        >> calculate.ordinal_ranks(dict_list, 'value')
+        [4, 2, 3, 1]
+        >> calculate.ordinal_ranks(dict_list, 'value', direction='asc')
+        [1, 2, 3, 4]
+
+    h3. Documentation
+
+        * "ordinal rank":http://en.wikipedia.org/wiki/Ranking#Ordinal_ranking\
+_.28.221234.22_ranking.29
+    """
+    # Querysets without an ordering are ranked in primary key order,
+    # so the ranks come out the same whichever way they're worked out
+    if querysets.is_queryset(sequence):
+        sequence = querysets.ordered(sequence)
+
+    # Let the database do the ranking, if it can
+    if order_by and querysets.is_queryset(sequence):
+        ranks = querysets.ordinal_ranks(sequence, order_by, direction)
+        if ranks is not querysets.UNSUPPORTED:
+            return ranks
+
+    seq_list = list(sequence)
+
+    # If there's nothing to sort by, the list is already in order
+    if not order_by:
+        return list(range(1, len(seq_list) + 1))
+
+    # Validate the direction
+    if direction not in ['desc', 'asc']:
+        raise ValueError('Direction kwarg should be either asc or desc.')
+
+    # Fetch each value once
+    gettr = get_accessor(seq_list, order_by)
+    value_list = [gettr(obj) for obj in seq_list]
+
+    # Sort the positions of the objects, rather than the objects themselves.
+    # Python's sort is stable, even in reverse, so ties stay in list order.
+    order = sorted(
+        range(len(value_list)),
+        key=value_list.__getitem__,
+        reverse=direction == 'desc'
+    )
+
+    # Then hand out the ranks
+    ranks = [None] * len(seq_list)
+    for rank, i in enumerate(order, 1):
+        ranks[i] = rank
+    return ranks
@@ -0,0 +1,313 @@
+"""
+Runs the descriptive statistics functions across several processes.
+
+The data are copied once into a block of shared memory. Each worker process
+reads its own slice straight out of that block, so nothing big has to be
+pickled and sent around. The workers hand back small partial results, like
+a calculate.SummaryAccumulator for their slice, which are merged together
+to get the final answer.
+
+This needs Python 3.8 or newer and NumPy. Without them, or when the data
+are too small to be worth splitting up, the regular functions are used.
+
+    >> from calculate import parallel
+    >> parallel.mean(numpy.random.random(100000000), workers=32)
+    0.5000123993871023
+
+The number of workers can be set for each call with the "workers" keyword
+argument, or for every call by changing parallel.WORKERS. It defaults to
+the number of CPUs.
+
+The worker processes are started the first time they're needed and kept
+around for the calls that follow. Call parallel.shutdown() to let them go.
+To manage the processes yourself, hand any concurrent.futures executor to
+the "executor" keyword argument.
+
+    >> with ProcessPoolExecutor(max_workers=8) as executor:
+    ..     parallel.mean(column, workers=8, executor=executor)
+
+The functions supported so far are mean, standard_deviation,
+variation_coefficient, range, elfi and pearson.
+"""
+import os
+import threading
+import calculate
+from calculate import numpy_backend
+try:
+    from concurrent.futures import ProcessPoolExecutor
+    from concurrent.futures.process import BrokenProcessPool
+    from multiprocessing import shared_memory
+    HAS_SHARED_MEMORY = True
+except ImportError:
+    HAS_SHARED_MEMORY = False
+
+# The range function below hides the built-in one, so hang onto it
+_range = range
+
+# How many processes to use when the "workers" keyword argument is left out.
+# None means one for each CPU.
+WORKERS = None
+
+# Each worker should get at least this many values. Anything smaller isn't
+# worth the trouble of starting up processes.
+MIN_CHUNK_SIZE = 1000000
+
+# The pool of worker processes shared by every call, once it's started
+_pool = None
+_pool_size = 0
+_pool_lock = threading.Lock()
+
+
+def _worker_count(workers):
+    if workers is None:
+        workers = WORKERS
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError('The number of workers should be at least 1')
+    return int(workers)
+
+
+def _get_pool(workers):
+    """
+    Returns the shared pool, started up or grown so it has at least the
+    provided number of processes.
+    """
+    global _pool, _pool_size
+    with _pool_lock:
+        if _pool is None or _pool_size < workers:
+            if _pool is not None:
+                _pool.shutdown()
+            _pool = ProcessPoolExecutor(max_workers=workers)
+            _pool_size = workers
+        return _pool
+
+
+def shutdown():
+    """
+    Stops the shared pool of worker processes, if it's running. A new one
+    is started the next time it's needed.
+    """
+    global _pool, _pool_size
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown()
+        _pool = None
+        _pool_size = 0
+
+
+def _as_array(data_list, workers):
+    """
+    Returns the data as a NumPy array of floats, or None if it can't or
+    shouldn't be split up across processes.
+    """
+    workers = _worker_count(workers)
+    if not HAS_SHARED_MEMORY or not numpy_backend.HAS_NUMPY or \
+            not numpy_backend.ENABLED:
+        return None
+
+    # Don't bother converting anything too small to split up
+    try:
+        size = len(data_list)
+    except TypeError:
+        size = None
+    if size is not None and _chunks(size, workers) is None:
+        return None
+
+    array = numpy_backend.as_array(data_list)
+    if array is not None:
+        return array
+    # Lists and other iterables have to be converted
+    try:
+        array = numpy_backend.numpy.asarray(
+            data_list,
+            dtype=numpy_backend.numpy.float64
+        )
+    except (TypeError, ValueError):
+        return None
+    if array.ndim != 1 or not array.size:
+        return None
+    return array
+
+
+def _chunks(size, workers):
+    """
+    Returns the start and stop of each worker's slice, or None if the
+    data aren't worth splitting up.
+    """
+    count = min(workers, size // MIN_CHUNK_SIZE)
+    if count < 2:
+        return None
+    bounds = [size * i // count for i in _range(count + 1)]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _run(kind, arrays, workers, executor=None):
+    """
+    Copies the arrays into shared memory and has a pool of workers crunch
+    the provided kind of partial result for each chunk. Returns a list of
+    the partial results, or None if the data aren't worth splitting up.
+
+    The shared pool is used unless an executor is provided.
+    """
+    numpy = numpy_backend.numpy
+    size = arrays[0].size
+    chunks = _chunks(size, _worker_count(workers))
+    if chunks is None:
+        return None
+
+    # Lay the arrays out as the rows of one block of shared memory
+    shape = (len(arrays), size)
+    block = shared_memory.SharedMemory(
+        create=True,
+        size=len(arrays) * size * 8
+    )
+    try:
+        shared = numpy.ndarray(shape, dtype=numpy.float64, buffer=block.buf)
+        for row, array in enumerate(arrays):
+            shared[row] = array
+        del shared
+        tasks = [(kind, block.name, shape, start, stop)
+                 for start, stop in chunks]
+        if executor is not None:
+            return list(executor.map(_partial, tasks))
+        try:
+            return list(_get_pool(len(chunks)).map(_partial, tasks))
+        except BrokenProcessPool:
+            # Start over with a fresh pool next time
+            shutdown()
+            raise
+    finally:
+        block.close()
+        block.unlink()
+
+
+def _partial(task):
+    """
+    Runs in a worker. Attaches to the shared memory and returns the
+    partial result for one slice of it.
+    """
+    numpy = numpy_backend.numpy
+    kind, name, shape, start, stop = task
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        shared = numpy.ndarray(shape, dtype=numpy.float64, buffer=block.buf)
+        if kind == 'summary':
+            result = calculate.SummaryAccumulator(
+                shared[0, start:stop],
+                counts=False
+            )
+        elif kind == 'squares':
+            chunk = shared[0, start:stop]
+            result = float(numpy.dot(chunk, chunk))
+            del chunk
+        elif kind == 'pearson':
+            result = calculate.PearsonAccumulator(
+                shared[0, start:stop],
+                shared[1, start:stop]
+            )
+        # The view has to go before the memory can be let go
+        del shared
+        return result
+    finally:
+        block.close()
+
+
+def _summarize(data_list, workers, executor):
+    """
+    Returns a SummaryAccumulator for the data, crunched in parallel, or
+    None if the data can't or shouldn't be split up.
+    """
+    array = _as_array(data_list, workers)
+    if array is None:
+        return None
+    partials = _run('summary', [array], workers, executor)
+    if partials is None:
+        return None
+    accumulator = calculate.SummaryAccumulator(counts=False)
+    for partial in partials:
+        accumulator.merge(partial)
+    return accumulator
+
+
+def mean(data_list, workers=None, executor=None):
+    """
+    Accepts a sample of values and returns their mean, working on chunks
+    of the data in separate processes. See calculate.mean.
+    """
+    accumulator = _summarize(data_list, workers, executor)
+    if accumulator is None:
+        return calculate.mean(data_list)
+    return accumulator.mean
+
+
+def standard_deviation(data_list, workers=None, executor=None):
+    """
+    Accepts a list of values and returns the standard deviation, working on
+    chunks of the data in separate processes. See
+    calculate.standard_deviation.
+    """
+    accumulator = _summarize(data_list, workers, executor)
+    if accumulator is None:
+        return calculate.standard_deviation(data_list)
+    return accumulator.standard_deviation
+
+
+def variation_coefficient(data_list, workers=None, executor=None):
+    """
+    Accepts a list of values and returns the variation coefficient, working
+    on chunks of the data in separate processes. See
+    calculate.variation_coefficient.
+    """
+    accumulator = _summarize(data_list, workers, executor)
+    if accumulator is None:
+        return calculate.variation_coefficient(data_list)
+    return accumulator.variation_coefficient
+
+
+def range(data_list, workers=None, executor=None):
+    """
+    Accepts a sample of values and returns the range, working on chunks of
+    the data in separate processes. See calculate.range.
+    """
+    accumulator = _summarize(data_list, workers, executor)
+    if accumulator is None:
+        return calculate.range(data_list)
+    return accumulator.range
+
+
+def elfi(data_list, workers=None, executor=None):
+    """
+    Accepts a list of decimal percentages and returns the Ethnolinguistic
+    Fractionalization Index, working on chunks of the data in separate
+    processes. See calculate.elfi.
+    """
+    array = _as_array(data_list, workers)
+    partials = None
+    if array is not None:
+        partials = _run('squares', [array], workers, executor)
+    if partials is None:
+        return calculate.elfi(data_list)
+    return 1 - sum(partials)
+
+
+def pearson(list_one, list_two, workers=None, executor=None):
+    """
+    Accepts paired lists and returns Pearson's r, working on chunks of the
+    data in separate processes. See calculate.pearson.
+    """
+    array_one = _as_array(list_one, workers)
+    array_two = _as_array(list_two, workers)
+    partials = None
+    if array_one is not None and array_two is not None:
+        if array_one.size != array_two.size:
+            raise ValueError('The two lists you provided do not have the \
+same number of entries. Pearson\'s r can only be calculated with paired data.')
+        partials = _run('pearson', [array_one, array_two], workers,
+                        executor)
+    if partials is None:
+        return calculate.pearson(list_one, list_two)
+    accumulator = calculate.PearsonAccumulator()
+    for partial in partials:
+        accumulator.merge(partial)
+    return accumulator.r
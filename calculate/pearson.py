@@ -1,4 +1,4 @@
-import math
+import calculate
 
 
 def pearson(list_one, list_two):
@@ -16,6 +16,11 @@ def pearson(list_one, list_two):
     A score close to zero indicates little correlation between the two
     datasets.
 
+    The values are read in pairs, one at a time, so the lists can be
+    generators or anything else you can loop over, and as long as you like.
+    To feed in the data in chunks, or combine results crunched separately,
+    use a calculate.PearsonAccumulator.
+
     This script is cobbled together from a variety of sources, linked
     in the sources section below.
 
@@ -40,40 +45,6 @@ coefficient
         http://www.amazon.com/Programming-Collective-Intelligence-Building-\
 Applications/dp/0596529325
     """
-    if len(list_one) != len(list_two):
-        raise ValueError('The two lists you provided do not have the same \
-number of entries. Pearson\'s r can only be calculated with paired data.')
-
-    n = len(list_one)
-
-    # Convert all of the data to floats
-    list_one = list(map(float, list_one))
-    list_two = list(map(float, list_two))
-
-    # Add up the total for each
-    sum_one = sum(list_one)
-    sum_two = sum(list_two)
-
-    # Sum the squares of each
-    sum_of_squares_one = sum([pow(i, 2) for i in list_one])
-    sum_of_squares_two = sum([pow(i, 2) for i in list_two])
-
-    # Sum up the product of each element multiplied against its pair
-    product_sum = sum([
-        item_one * item_two for item_one, item_two in zip(list_one, list_two)
-    ])
-
-    # Use the raw materials above to assemble the equation
-    pearson_numerator = product_sum - (sum_one * sum_two / n)
-    pearson_denominator = math.sqrt(
-        (sum_of_squares_one - pow(sum_one, 2) / n) *
-        (sum_of_squares_two - pow(sum_two, 2) / n)
-    )
-
-    # To avoid avoid dividing by zero,
-    # catch it early on and drop out
-    if pearson_denominator == 0:
-        return 0
-
-    # Divide the equation to return the r value
-    return pearson_numerator / pearson_denominator
+    # Feed the pairs through an accumulator, which reads them one at a time
+    # and hands arrays and other buffers off to NumPy, if it's installed
+    return calculate.PearsonAccumulator(list_one, list_two).r
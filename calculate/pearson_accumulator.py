@@ -0,0 +1,169 @@
+import math
+from six.moves import zip_longest
+from calculate import numpy_backend
+
+# Stands in for the missing value when one list runs out before the other
+_MISSING = object()
+
+
+class PearsonAccumulator(object):
+    """
+    Accepts an optional pair of lists and measures how closely they're
+    correlated, reading the paired values one at a time in a single pass.
+
+    Only a handful of running totals are kept, so the lists can be
+    generators, files or anything else you can loop over, and as long as
+    you like. The co-moment is updated with the same method Welford uses for
+    the variance, which holds onto precision far better than summing up
+    squares and products when the values are big.
+
+    More pairs can be added later with add() or update(). Accumulators built
+    from separate chunks of a dataset can be combined with merge(), so the
+    chunks can be crunched independently.
+
+    h3. Example usage
+
+        >> import calculate
+        >> acc = calculate.PearsonAccumulator([6, 5, 2], [2, 5, 6])
+        >> acc.r
+        -0.8461538461538461
+        >> acc.merge(calculate.PearsonAccumulator([1], [8])).n
+        4
+        >> acc.covariance
+        -4.125
+
+    h3. Documentation
+
+        * "Algorithms for calculating variance":http://en.wikipedia.org/\
+wiki/Algorithms_for_calculating_variance#Covariance
+    """
+    def __init__(self, list_one=None, list_two=None):
+        self.n = 0
+        # Every value is measured from the first one in its list, which
+        # keeps the running means small so they don't lose precision
+        self._shift_one = None
+        self._shift_two = None
+        # The running means, the sums of squared distances from them
+        # and the sum of the paired distances multiplied together
+        self._mean_one = 0.0
+        self._mean_two = 0.0
+        self._m2_one = 0.0
+        self._m2_two = 0.0
+        self._comoment = 0.0
+        if list_one is not None or list_two is not None:
+            self.update(list_one, list_two)
+
+    def add(self, value_one, value_two):
+        """
+        Adds a single pair of values to the accumulator.
+        """
+        return self.update([value_one], [value_two])
+
+    def update(self, list_one, list_two):
+        """
+        Adds every pair of values in the provided lists to the accumulator.
+        """
+        # Arrays and other buffers can be crunched by NumPy in one go
+        array_one = numpy_backend.as_array(list_one)
+        array_two = numpy_backend.as_array(list_two)
+        if array_one is not None and array_two is not None:
+            other = PearsonAccumulator()
+            other.n = int(array_one.size)
+            other._shift_one = float(array_one[0])
+            other._shift_two = float(array_two[0])
+            (other._mean_one, other._mean_two, other._m2_one, other._m2_two,
+             other._comoment) = numpy_backend.co_moments(
+                array_one - other._shift_one,
+                array_two - other._shift_two
+            )
+            return self.merge(other)
+
+        # Pull everything into local variables to keep the loop quick
+        n = self.n
+        shift_one, shift_two = self._shift_one, self._shift_two
+        mean_one, mean_two = self._mean_one, self._mean_two
+        m2_one, m2_two = self._m2_one, self._m2_two
+        comoment = self._comoment
+        try:
+            for value_one, value_two in zip_longest(
+                list_one,
+                list_two,
+                fillvalue=_MISSING
+            ):
+                if value_one is _MISSING or value_two is _MISSING:
+                    raise ValueError('The two lists you provided do not have \
+the same number of entries. Pearson\'s r can only be calculated with paired \
+data.')
+                # Convert the values to floats and test to make sure
+                # they aren't strings
+                try:
+                    value_one = float(value_one)
+                    value_two = float(value_two)
+                except ValueError:
+                    raise ValueError('Input values should contain numbers')
+                if shift_one is None:
+                    shift_one, shift_two = value_one, value_two
+                value_one -= shift_one
+                value_two -= shift_two
+                n += 1
+                # Welford's update, extended to the co-moment
+                delta_one = value_one - mean_one
+                mean_one += delta_one / n
+                delta_two = value_two - mean_two
+                mean_two += delta_two / n
+                m2_one += delta_one * (value_one - mean_one)
+                m2_two += delta_two * (value_two - mean_two)
+                comoment += delta_one * (value_two - mean_two)
+        finally:
+            # Save our progress, even if we're bailing out
+            self.n = n
+            self._shift_one, self._shift_two = shift_one, shift_two
+            self._mean_one, self._mean_two = mean_one, mean_two
+            self._m2_one, self._m2_two = m2_one, m2_two
+            self._comoment = comoment
+        return self
+
+    def merge(self, other):
+        """
+        Combines the results of another accumulator into this one.
+
+        Returns this accumulator so calls can be chained.
+        """
+        if not other.n:
+            return self
+        if not self.n:
+            self._shift_one, self._shift_two = other._shift_one, \
+                other._shift_two
+            self._mean_one, self._mean_two = other._mean_one, other._mean_two
+            self._m2_one, self._m2_two = other._m2_one, other._m2_two
+            self._comoment = other._comoment
+        else:
+            # Combine the two sets of moments using the pairwise formulas
+            # from Chan, Golub and LeVeque
+            n = self.n + other.n
+            delta_one = (other._shift_one - self._shift_one) + \
+                (other._mean_one - self._mean_one)
+            delta_two = (other._shift_two - self._shift_two) + \
+                (other._mean_two - self._mean_two)
+            weight = self.n * other.n / float(n)
+            self._m2_one += other._m2_one + delta_one * delta_one * weight
+            self._m2_two += other._m2_two + delta_two * delta_two * weight
+            self._comoment += other._comoment + delta_one * delta_two * weight
+            self._mean_one += delta_one * other.n / n
+            self._mean_two += delta_two * other.n / n
+        self.n += other.n
+        return self
+
+    @property
+    def covariance(self):
+        # This is a "population" covariance, like the variance
+        # behind calculate.standard_deviation
+        return self._comoment / self.n
+
+    @property
+    def r(self):
+        denominator = math.sqrt(self._m2_one * self._m2_two)
+        # To avoid dividing by zero, catch it early on and drop out
+        if denominator == 0:
+            return 0
+        return self._comoment / denominator
@@ -0,0 +1,115 @@
+import math
+from six.moves import zip_longest
+from calculate import numpy_backend
+
+# Stands in for the missing value when one column runs out before the others
+_MISSING = object()
+
+
+def pearson_matrix(columns):
+    """
+    Accepts a dictionary of columns, each a list of numbers, and returns
+    Pearson's r for every pair of them. The result is a dictionary of
+    dictionaries keyed by the column names, so matrix['a']['b'] is the
+    correlation between columns a and b.
+
+    This is a lot faster than calling calculate.pearson on every pair.
+    The rows are read one at a time, in a single pass, and the running totals
+    for every pair of columns are updated together. If NumPy is installed,
+    the whole matrix is worked out in one go instead.
+
+    You can also provide a list of (name, values) pairs, which is handy if
+    you want to control the order or the columns are generators.
+
+    h3. Example usage
+
+        >> import calculate
+        >> matrix = calculate.pearson_matrix({
+            'sat': [1200, 1400, 1100, 800],
+            'gpa': [3.6, 3.9, 3.0, 2.5],
+            'drinks_per_day': [0.3, 0.1, 0.5, 2.0],
+        })
+        >> matrix['sat']['gpa']
+        0.9714441330841954
+        >> matrix['gpa']['drinks_per_day']
+        -0.8972639357387224
+
+    h3. Documentation
+
+        * "Correlation matrix":http://en.wikipedia.org/wiki/\
+Correlation_and_dependence#Correlation_matrices
+    """
+    # Split the names from the values
+    if hasattr(columns, 'items'):
+        columns = list(columns.items())
+    names = [name for name, values in columns]
+    data = [values for name, values in columns]
+    k = len(names)
+
+    # Hand everything off to NumPy, if it's installed
+    if numpy_backend.ENABLED and numpy_backend.HAS_NUMPY and k:
+        data = [v if hasattr(v, '__len__') else list(v) for v in data]
+        lengths = set(len(v) for v in data)
+        if len(lengths) > 1:
+            raise ValueError('The columns you provided do not have the same \
+number of entries. Pearson\'s r can only be calculated with paired data.')
+        if 0 not in lengths:
+            try:
+                rows = numpy_backend.pearson_matrix(data)
+            except ValueError:
+                raise ValueError('Input values should contain numbers')
+            return dict(
+                (name, dict(zip(names, row))) for name, row in zip(names, rows)
+            )
+
+    # Every value is measured from the first one in its column, which keeps
+    # the totals small so they don't lose precision
+    n = 0
+    shifts = None
+    sums = [0.0] * k
+    # Only the top half is filled in, since the matrix is symmetrical
+    products = [[0.0] * k for i in range(k)]
+    for row in zip_longest(*data, fillvalue=_MISSING):
+        if any(value is _MISSING for value in row):
+            raise ValueError('The columns you provided do not have the same \
+number of entries. Pearson\'s r can only be calculated with paired data.')
+        # Convert the values to floats and test to make sure
+        # they aren't strings
+        try:
+            row = [float(value) for value in row]
+        except ValueError:
+            raise ValueError('Input values should contain numbers')
+        if shifts is None:
+            shifts = row
+        deltas = [value - shift for value, shift in zip(row, shifts)]
+        n += 1
+        # Add this row to the sums and the cross-products
+        for i, delta in enumerate(deltas):
+            sums[i] += delta
+            if delta:
+                products[i][i:] = [
+                    total + delta * other
+                    for total, other in zip(products[i][i:], deltas[i:])
+                ]
+
+    # Turn the totals into the co-moments of each pair
+    def comoment(i, j):
+        if i > j:
+            i, j = j, i
+        if not n:
+            return 0.0
+        return products[i][j] - sums[i] * sums[j] / n
+
+    # Use them to assemble the equation for each pair
+    spreads = [math.sqrt(max(comoment(i, i), 0)) for i in range(k)]
+    matrix = {}
+    for i, name in enumerate(names):
+        matrix[name] = {}
+        for j, other in enumerate(names):
+            denominator = spreads[i] * spreads[j]
+            # To avoid dividing by zero, catch it early on and drop out
+            if denominator == 0:
+                matrix[name][other] = 0
+            else:
+                matrix[name][other] = comoment(i, j) / denominator
+    return matrix
@@ -1,4 +1,8 @@
 import calculate
+from calculate import columns
+from calculate import numpy_backend
+from calculate import querysets
+from calculate import sample
 
 
 def percentile(data_list, value, kind='weak'):
@@ -45,6 +49,21 @@ def percentile(data_list, value, kind='weak'):
         >> calculate.percentile([1, 2, 3, 3, 4], 3, kind='mean')
         60.0
 
+    If you need to rank a lot of values against the same sample, build
+    a calculate.PercentileIndex once and pass it in place of the list.
+    It will sort the sample a single time and answer each lookup with
+    a binary search.
+
+        >> index = calculate.PercentileIndex([1, 2, 3, 3, 4])
+        >> calculate.percentile(index, 3, kind='strict')
+        40.0
+
+    A calculate.RankIndex works the same way, and can be kept up to date
+    as values are added, changed and removed.
+
+    If the data are too big to hold in memory, you can pass in a
+    calculate.QuantileSketch instead and get back an estimate.
+
     h3. Documentation
 
         * "Percentile rank":http://en.wikipedia.org/wiki/Percentile_rank
@@ -56,32 +75,56 @@ def percentile(data_list, value, kind='weak'):
         omitted the rank kwarg option until I can find time to translate
         the numpy parts out.
     """
-    # Convert all the values to floats and test to make sure
-    # there aren't any strings in there
-    try:
-        data_list = list(map(float, data_list))
-    except ValueError:
-        raise ValueError('Input values should contain numbers, your first \
-input contains something else')
-
-    # Find the number of values in the sample
-    n = float(len(data_list))
+    # If we've been handed a presorted index or a sketch, or we have
+    # a sample cached, let it do the work
+    data_list = sample.cached(data_list)
+    if isinstance(data_list, (calculate.PercentileIndex,
+                              calculate.QuantileSketch,
+                              calculate.RankIndex)):
+        return data_list.percentile(value, kind=kind)
+
+    # Stream querysets in a chunk at a time
+    data_list = querysets.as_numbers(data_list)
+
+    # Arrays and other buffers can be handed off to NumPy, if it's installed
+    array = numpy_backend.as_array(data_list)
+    if array is not None:
+        n = float(array.size)
+
+        def count(inclusive):
+            return numpy_backend.count_below(array, value, inclusive)
+    else:
+        # Convert all the values to floats and test to make sure
+        # there aren't any strings in there
+        try:
+            data_list = columns.floats(data_list)
+        except ValueError:
+            raise ValueError('Input values should contain numbers, your \
+first input contains something else')
+
+        # Find the number of values in the sample
+        n = float(len(data_list))
+
+        def count(inclusive):
+            if inclusive:
+                return sum(1 for i in data_list if i <= value)
+            return sum(1 for i in data_list if i < value)
 
     if kind == 'strict':
         # If the selected method is strict, count the number of values
         # below the provided one and then divide it into the n
-        return len([i for i in data_list if i < value]) / n * 100
+        return count(False) / n * 100
 
     elif kind == 'weak':
         # If the selected method is weak, count the number of values
         # equal to or below the provided on and then divide it into n
-        return len([i for i in data_list if i <= value]) / n * 100
+        return count(True) / n * 100
 
     elif kind == 'mean':
         # If the selected method is mean, take the weak and strong
         # methods and average them.
-        strict = len([i for i in data_list if i < value]) / n * 100
-        weak = len([i for i in data_list if i <= value]) / n * 100
+        strict = count(False) / n * 100
+        weak = count(True) / n * 100
         return calculate.mean([strict, weak])
     else:
         raise ValueError("The kind kwarg must be 'strict', 'weak' or 'mean'. \
@@ -0,0 +1,83 @@
+from bisect import bisect_left, bisect_right
+
+
+class PercentileIndex(object):
+    """
+    Accepts a sample of values and sorts it once so that any number of
+    scores can be compared against it to determine their percentile rank.
+
+    Once the index is built, each lookup is a binary search against the
+    sorted sample rather than a fresh scan of the whole list. That means
+    ranking n values against a sample of n values costs O(n log n)
+    instead of O(n^2).
+
+    The "kind" keyword argument works the same way as it does in
+    calculate.percentile. It can be "weak", "strict" or "mean".
+
+    The index can be passed in place of a list to calculate.percentile,
+    calculate.percentile_many and calculate.decile.
+
+    h3. Example usage
+
+        >> import calculate
+        >> index = calculate.PercentileIndex([1, 2, 3, 3, 4])
+        >> index.percentile(3)
+        80.0
+        >> index.percentile(3, kind='strict')
+        40.0
+        >> calculate.decile(index, 3)
+        9
+
+    h3. Documentation
+
+        * "Percentile rank":http://en.wikipedia.org/wiki/Percentile_rank
+        * "bisect":https://docs.python.org/2/library/bisect.html
+    """
+    def __init__(self, data_list):
+        # Convert all the values to floats and test to make sure
+        # there aren't any strings in there
+        try:
+            values = list(map(float, data_list))
+        except ValueError:
+            raise ValueError('Input values should contain numbers, your first \
+input contains something else')
+
+        # Sort them once so every lookup can be a binary search
+        values.sort()
+        self.values = values
+
+        # Find the number of values in the sample
+        self.n = float(len(values))
+
+    def __len__(self):
+        return len(self.values)
+
+    def strict(self, value):
+        """
+        Returns the percentage of values in the sample below
+        the provided one.
+        """
+        return bisect_left(self.values, value) / self.n * 100
+
+    def weak(self, value):
+        """
+        Returns the percentage of values in the sample at or below
+        the provided one.
+        """
+        return bisect_right(self.values, value) / self.n * 100
+
+    def percentile(self, value, kind='weak'):
+        """
+        Returns the percentile rank of the provided value using
+        the method stipulated by the "kind" keyword argument.
+        """
+        if kind == 'strict':
+            return self.strict(value)
+        elif kind == 'weak':
+            return self.weak(value)
+        elif kind == 'mean':
+            # Average the weak and strict methods
+            return (self.strict(value) + self.weak(value)) / 2.0
+        else:
+            raise ValueError("The kind kwarg must be 'strict', 'weak' or \
+'mean'. You can also opt to leave it out and rely on the default method.")
@@ -0,0 +1,46 @@
+import calculate
+
+
+def percentile_many(data_list, values, kind='weak'):
+    """
+    Accepts a sample of values and a list of numbers to compare to it.
+    Returns a list with the percentile rank of each number, in the same
+    order they were provided.
+
+    The sample is only sorted once, so this is much faster than
+    calling calculate.percentile in a loop when you have a lot of
+    values to rank. If you already have a calculate.PercentileIndex
+    or calculate.RankIndex, you can pass it in as the first argument
+    and it will be reused.
+
+    The "kind" keyword argument works the same way as it does in
+    calculate.percentile. It can be "weak", "strict" or "mean".
+
+    h3. Example usage
+
+        >> import calculate
+        >> calculate.percentile_many([1, 2, 3, 3, 4], [1, 3, 4])
+        [20.0, 80.0, 100.0]
+        >> calculate.percentile_many([1, 2, 3, 3, 4], [1, 3, 4], kind='strict')
+        [0.0, 40.0, 80.0]
+
+    h3. Documentation
+
+        * "Percentile rank":http://en.wikipedia.org/wiki/Percentile_rank
+    """
+    # Validate the kind before we go to the trouble of sorting anything
+    if kind not in ['strict', 'weak', 'mean']:
+        raise ValueError("The kind kwarg must be 'strict', 'weak' or 'mean'. \
+You can also opt to leave it out and rely on the default method.")
+
+    # Sort the sample once, unless we've been handed an index
+    # or a sketch already
+    if isinstance(data_list, (calculate.PercentileIndex,
+                              calculate.QuantileSketch,
+                              calculate.RankIndex)):
+        index = data_list
+    else:
+        index = calculate.PercentileIndex(data_list)
+
+    # Look up each value against the sorted sample
+    return [index.percentile(value, kind=kind) for value in values]
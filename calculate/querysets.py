@@ -0,0 +1,339 @@
+"""
+Database versions of the functions that accept Django querysets.
+
+Handing calculate a queryset normally means every row is loaded into a
+model instance before the math starts. When the order_by or point
+attribute is a plain field on the model, these send the work to the
+database instead, so only the answer comes back.
+
+    * Ranks are counted with COUNT queries, or with the RANK() and
+      ROW_NUMBER() window functions for every row at once.
+    * Mean centers average the x and y coordinates with AVG().
+    * Standard deviation distances run STDDEV_POP() over the distance
+      of every point from that center.
+    * nudge_points only loads the objects that share a spot with another.
+    * Flat values_list() querysets handed to mean, median, percentile and
+      summary_stats are streamed into an array of floats a chunk at a time.
+
+Window functions need a database that supports them. The coordinate math
+needs PostGIS, SpatiaLite or MySQL. Whenever the database can't do the
+job, the functions quietly go back to loading the rows into Python.
+
+Ties in ordinal ranks are broken by primary key in the database, rather
+than by the order the rows would have come back in.
+
+To force the Python path for everything, flip the switch:
+
+    >> import calculate
+    >> calculate.querysets.ENABLED = False
+"""
+
+import six
+
+# Set this to False to always load querysets into Python
+ENABLED = True
+
+# Returned when the database can't do the job
+UNSUPPORTED = object()
+
+# The most primary keys to put in a single IN clause
+IN_BATCH_SIZE = 500
+
+
+def is_queryset(obj):
+    """
+    Returns True if the object is a Django QuerySet. The check doesn't
+    import Django, so it's safe to make when Django isn't installed.
+    """
+    if not ENABLED:
+        return False
+    for cls in type(obj).__mro__:
+        if cls.__name__ == 'QuerySet' and \
+                cls.__module__ == 'django.db.models.query':
+            return True
+    return False
+
+
+def _connection(qs):
+    from django.db import connections
+    return connections[qs.db]
+
+
+def _field(qs, name):
+    # Only fields sitting right on the model can be pushed down
+    if not isinstance(name, six.string_types) or '__' in name:
+        return None
+    from django.core.exceptions import FieldDoesNotExist
+    try:
+        return qs.model._meta.get_field(name)
+    except FieldDoesNotExist:
+        return None
+
+
+def _ordering(qs):
+    """
+    Returns the field names the queryset is sorted by, with the primary
+    key on the end to break ties, or None if it's sorted by anything
+    other than fields sitting right on the model.
+    """
+    query = qs.query
+    if query.extra_order_by:
+        return None
+    ordering = list(query.order_by)
+    if not ordering and query.default_ordering:
+        ordering = list(qs.model._meta.ordering)
+    for name in ordering:
+        if not isinstance(name, six.string_types):
+            return None
+        name = name.lstrip('-')
+        if name != 'pk' and _field(qs, name) is None:
+            return None
+    return ordering + ['pk']
+
+
+def _loaded(qs):
+    # Rows that are already loaded, or a slice of the table,
+    # can't be ranked again by the database
+    return qs._result_cache is not None or not qs.query.can_filter()
+
+
+def ordered(qs):
+    """
+    Returns the queryset sorted by its own ordering, or by primary key if
+    it doesn't have one, with the primary key breaking any ties. That way
+    the rows come back in the same order every time they're fetched.
+    Querysets that are already loaded or sliced are returned as is.
+    """
+    if _loaded(qs):
+        return qs
+    ordering = _ordering(qs)
+    if ordering is None:
+        return qs
+    return qs.order_by(*ordering)
+
+
+def _coordinates(qs, name):
+    """
+    Returns expressions for the x and y coordinates of the named point
+    field, or None if the database can't pull them out.
+    """
+    field = _field(qs, name)
+    if field is None or getattr(field, 'geom_type', None) != 'POINT':
+        return None
+    ops = _connection(qs).ops
+    if not any(getattr(ops, v, False) for v in ('postgis', 'spatialite',
+                                                'mysql')):
+        return None
+    from django.db.models import F, FloatField, Func
+    return (
+        Func(F(name), function='ST_X', output_field=FloatField()),
+        Func(F(name), function='ST_Y', output_field=FloatField()),
+    )
+
+
+def competition_rank(qs, obj, order_by, direction='desc'):
+    """
+    Returns the competition rank of the object in the queryset.
+    """
+    if _field(qs, order_by) is None or not isinstance(obj, qs.model):
+        return UNSUPPORTED
+    if not qs.query.can_filter():
+        return UNSUPPORTED
+    if direction not in ['desc', 'asc']:
+        raise ValueError('Direction kwarg should be either asc or desc.')
+
+    # If the submitted object isn't in the list, it doesn't have a rank
+    if not qs.filter(pk=obj.pk).exists():
+        return None
+
+    # One more than the number of values ahead of this one
+    lookup = '%s__%s' % (order_by, 'gt' if direction == 'desc' else 'lt')
+    return qs.filter(**{lookup: getattr(obj, order_by)}).count() + 1
+
+
+def ordinal_rank(qs, obj, order_by, direction='desc'):
+    """
+    Returns the ordinal rank of the object in the queryset.
+    """
+    if _field(qs, order_by) is None or not isinstance(obj, qs.model):
+        return UNSUPPORTED
+    if not qs.query.can_filter():
+        return UNSUPPORTED
+
+    # Ties can only be counted off by primary key, so the queryset
+    # has to be in primary key order
+    ordering = _ordering(qs)
+    if ordering is None or ordering[0] not in ['pk', qs.model._meta.pk.name]:
+        return UNSUPPORTED
+    if direction not in ['desc', 'asc']:
+        raise ValueError('Direction kwarg should be either asc or desc.')
+    if not qs.filter(pk=obj.pk).exists():
+        raise ValueError('The item you provided is not in the list')
+    from django.db.models import Q
+
+    # One more than the number of values ahead of this one,
+    # plus any ties that come first by primary key
+    value = getattr(obj, order_by)
+    ahead = 'gt' if direction == 'desc' else 'lt'
+    return qs.filter(
+        Q(**{'%s__%s' % (order_by, ahead): value}) |
+        Q(**{order_by: value, 'pk__lt': obj.pk})
+    ).count() + 1
+
+
+def _window_ranks(qs, function, order_by, direction, tiebreak=False):
+    if _field(qs, order_by) is None or _loaded(qs):
+        return UNSUPPORTED
+    ordering = _ordering(qs)
+    if ordering is None:
+        return UNSUPPORTED
+    if direction not in ['desc', 'asc']:
+        raise ValueError('Direction kwarg should be either asc or desc.')
+    if not getattr(_connection(qs).features, 'supports_over_clause', False):
+        return UNSUPPORTED
+    from django.db.models import F, Window
+
+    # Rank by the value, with ties going in the queryset's own order
+    window = [getattr(F(order_by), direction)()]
+    if tiebreak:
+        for name in ordering:
+            if name.startswith('-'):
+                window.append(F(name[1:]).desc())
+            else:
+                window.append(F(name).asc())
+
+    # Then hand the ranks back in that same order, so they line up
+    # with the rows in the queryset
+    ranked = qs.order_by(*ordering).annotate(
+        calculate_rank=Window(expression=function(), order_by=window)
+    )
+    return list(ranked.values_list('calculate_rank', flat=True))
+
+
+def competition_ranks(qs, order_by, direction='desc'):
+    """
+    Returns the competition rank of every row in the queryset.
+    """
+    from django.db.models.functions import Rank
+    return _window_ranks(qs, Rank, order_by, direction)
+
+
+def ordinal_ranks(qs, order_by, direction='desc'):
+    """
+    Returns the ordinal rank of every row in the queryset.
+    """
+    from django.db.models.functions import RowNumber
+    return _window_ranks(qs, RowNumber, order_by, direction, tiebreak=True)
+
+
+def mean_xy(qs, point_attribute_name):
+    """
+    Returns the average x and y coordinates of the points in the queryset.
+    """
+    coordinates = _coordinates(qs, point_attribute_name)
+    if coordinates is None:
+        return UNSUPPORTED
+    from django.db.models import Avg
+    result = qs.aggregate(
+        calculate_x=Avg(coordinates[0]),
+        calculate_y=Avg(coordinates[1])
+    )
+    if result['calculate_x'] is None:
+        raise ValueError('At least one point is required')
+    return result['calculate_x'], result['calculate_y']
+
+
+def mean_center(qs, point_attribute_name):
+    """
+    Returns the mean center of the points in the queryset.
+    """
+    xy = mean_xy(qs, point_attribute_name)
+    if xy is UNSUPPORTED:
+        return UNSUPPORTED
+    from django.contrib.gis.geos import Point
+    field = _field(qs, point_attribute_name)
+    return Point(xy[0], xy[1], srid=field.srid)
+
+
+def standard_deviation_distance(qs, point_attribute_name):
+    """
+    Returns the standard deviation distance of the points in the queryset.
+    """
+    connection = _connection(qs)
+    if not getattr(connection.features, 'supports_stddev', True):
+        return UNSUPPORTED
+    xy = mean_xy(qs, point_attribute_name)
+    if xy is UNSUPPORTED:
+        return UNSUPPORTED
+    from django.db import NotSupportedError
+    from django.db.models import StdDev
+    from django.db.models.functions import Sqrt
+
+    # Measure each point's distance from the center on a flat plane,
+    # the same way GEOS would
+    x, y = _coordinates(qs, point_attribute_name)
+    dx = x - xy[0]
+    dy = y - xy[1]
+    try:
+        result = qs.aggregate(
+            calculate_sdd=StdDev(Sqrt(dx * dx + dy * dy), sample=False)
+        )
+    except NotSupportedError:
+        return UNSUPPORTED
+    return result['calculate_sdd']
+
+
+def shared_points(qs, point_attribute_name):
+    """
+    Returns a list of only the rows whose point has the same coordinates
+    as another row's, in the order they come back in the queryset.
+    """
+    coordinates = _coordinates(qs, point_attribute_name)
+    if coordinates is None or not qs.query.can_filter():
+        return UNSUPPORTED
+
+    # Fetch just the coordinates, and find the ones that turn up twice,
+    # remembering where each row came in the queryset
+    seen = {}
+    shared = {}
+    rows = qs.values_list('pk', *coordinates)
+    for position, (pk, x, y) in enumerate(rows.iterator()):
+        first = seen.setdefault((x, y), (pk, position))
+        if first[0] != pk:
+            shared[pk] = position
+            if first[0] is not None:
+                shared[first[0]] = first[1]
+                seen[(x, y)] = (None, None)
+
+    # Then load those rows a batch at a time, so the IN clause
+    # never gets too long for the database
+    pk_list = sorted(shared, key=shared.__getitem__)
+    obj_list = []
+    for i in range(0, len(pk_list), IN_BATCH_SIZE):
+        batch = pk_list[i:i + IN_BATCH_SIZE]
+        obj_list.extend(qs.filter(pk__in=batch))
+    obj_list.sort(key=lambda obj: shared[obj.pk])
+    return obj_list
+
+
+def is_flat_values(obj):
+    """
+    Returns True if the object is a queryset from values_list() with
+    flat=True, which gives back one number per row.
+    """
+    if not is_queryset(obj):
+        return False
+    iterable = getattr(obj, '_iterable_class', None)
+    return getattr(iterable, '__name__', None) == 'FlatValuesListIterable'
+
+
+def as_numbers(data_list):
+    """
+    Streams flat values_list() querysets into an array of floats, without
+    keeping every row in the queryset's cache. Anything else is returned
+    as is.
+    """
+    if is_flat_values(data_list) and data_list._result_cache is None:
+        import calculate
+        return calculate.values_array(data_list)
+    return data_list
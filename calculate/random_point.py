@@ -1,5 +1,6 @@
 import random
-from django.contrib.gis.geos import Point
+import calculate
+from calculate import geometry
 
 
 def random_point(extent):
@@ -7,18 +8,26 @@ def random_point(extent):
     A utility that accepts the extent of a polygon and returns a random
     point from within its boundaries.
 
-    The extent is a four-point tuple with (xmin, ymin, xmax, ymax).
+    The extent is a four-point tuple with (xmin, ymin, xmax, ymax). You get
+    back a GeoDjango Point, just like always, if GeoDjango is installed.
+    If it isn't, you get back a calculate.geometry.XY named tuple.
+
+    You can also pass in a GeoDjango geometry. Its extent will be used and
+    you'll get back a GeoDjango Point with the same spatial reference.
 
     h3. Example usage
 
         >> polygon = Model.objects.get(pk=1).polygon
         >> import calculate
         >> calculate.random_point(polygon.extent)
+        <Point object at 0x7f0e2c2b7e20>
+        >> calculate.random_point((-118.3, 34.0, -118.2, 34.1))
+        XY(x=-118.25254706462016, y=34.04495629938341)
+        >> calculate.random_point(polygon)
+        <Point object at 0x7f0e2c2b7d30>
 
     h3. Dependencies
 
-        * "django":http://www.djangoproject.com/
-        * "geodjango":http://www.geodjango.org/
         * "random":http://docs.python.org/library/random.html
 
     h3. Documentation
@@ -27,9 +36,20 @@ def random_point(extent):
         * "Code lifted from Joost at DjangoDays":http://djangodays.com/\
 2009/03/04/geodjango-getting-a-random-point-within-a-multipolygon/
     """
+    # If we've been handed a geometry, work from its extent
+    if geometry.is_geos(extent):
+        template = extent
+        extent = extent.extent
+    else:
+        template = None
     xmin, ymin, xmax, ymax = extent
     xrange = xmax - xmin
     yrange = ymax - ymin
     randx = xrange * random.random() + xmin
     randy = yrange * random.random() + ymin
-    return Point(randx, randy)
+
+    # Plain extents still get a GeoDjango Point when it's around
+    if template is None and calculate.HAS_GEODJANGO:
+        from django.contrib.gis.geos import Point
+        return Point(randx, randy)
+    return geometry.make_point(randx, randy, template)
@@ -0,0 +1,124 @@
+import math
+import random
+from array import array
+from bisect import bisect_right
+from calculate import geometry
+from calculate import numpy_backend
+
+
+def random_points(polygon, n, seed=None, as_points=False):
+    """
+    A utility that accepts a polygon and returns n random points from
+    inside it, for dot-density maps and the like.
+
+    Unlike calculate.random_point, the points are spread evenly over the
+    polygon itself rather than its extent, and holes are left empty.
+
+    The polygon can be a GeoDjango Polygon or MultiPolygon. It can also be a
+    list of (x, y) pairs tracing its outline, a list of those rings with the
+    outside first and any holes after, or a list of those for a multipolygon.
+    Outlines shouldn't cross themselves.
+
+    The polygon is cut up into trapezoids once, and then every point is
+    drawn straight from inside one of them, so no samples are thrown away.
+    If NumPy is installed, all of the points are drawn in a single batch.
+
+    By default you get back a flat array of floats with the x and y of each
+    point in turn. Set the "as_points" kwarg to True to get a list of points
+    instead. They're GeoDjango Points with the polygon's spatial reference
+    if a GeoDjango geometry was provided, and XY named tuples otherwise.
+
+    Submit a "seed" to get the same points each time, whether or not
+    NumPy is installed. Seeded points are a little slower to draw with
+    NumPy, since the random numbers come from Python's generator.
+
+    h3. Example usage
+
+        >> import calculate
+        >> square = [(0, 0), (0, 10), (10, 10), (10, 0)]
+        >> calculate.random_points(square, 2, seed=1)
+        array('d', [1.4675589081711304, 0.0011437481734488664, ...])
+        >> county = County.objects.get(name='Los Angeles')
+        >> calculate.random_points(county.polygon, 3, as_points=True)
+        [<Point object at 0x7f0e2c2b7d30>, ...]
+
+    h3. Documentation
+
+        * "Trapezoidal decomposition":https://en.wikipedia.org/wiki/\
+Polygon_partition
+        * "Dot distribution map":https://en.wikipedia.org/wiki/\
+Dot_distribution_map
+    """
+    # Make sure we've got a sensible number of points
+    n = int(n)
+    if n < 0:
+        raise ValueError('The number of points can not be negative')
+
+    # Slice the polygon up and figure out the area of each piece
+    pieces = geometry.trapezoids(geometry.polygon_rings(polygon))
+    areas = [
+        (r0 - l0 + r1 - l1) * height / 2.0
+        for y, height, l0, l1, r0, r1 in pieces
+    ]
+    if not sum(areas) > 0:
+        raise ValueError('The polygon you provided has no area')
+
+    # Draw all the points at once, if NumPy is available. With a seed,
+    # the random numbers come from the standard library either way, so
+    # the points don't change when NumPy is installed.
+    if numpy_backend.ENABLED and numpy_backend.HAS_NUMPY:
+        draws = None
+        if seed is not None:
+            rng = random.Random(seed)
+            draws = array('d', (rng.random() for _ in range(3 * n)))
+        coords = numpy_backend.random_points(pieces, areas, n, draws)
+        # Passing the raw bytes through avoids making a float for each value
+        out_array = array('d', coords.tobytes())
+    else:
+        out_array = _random_points(pieces, areas, n, seed)
+
+    # Pass it out
+    if not as_points:
+        return out_array
+    template = polygon if geometry.is_geos(polygon) else None
+    return [
+        geometry.make_point(out_array[i], out_array[i + 1], template)
+        for i in range(0, len(out_array), 2)
+    ]
+
+
+def _random_points(pieces, areas, n, seed):
+    """
+    Draws the points one at a time with the standard library.
+    """
+    rng = random.Random(seed)
+    uniform = rng.random
+    sqrt = math.sqrt
+
+    # A running total of the areas, so a piece can be picked with a search
+    totals = []
+    total = 0.0
+    for area in areas:
+        total += area
+        totals.append(total)
+    last = len(totals) - 1
+
+    out_array = array('d')
+    append = out_array.append
+    for _ in range(n):
+        # Pick a piece, with the bigger ones more likely
+        k = min(bisect_right(totals, uniform() * total), last)
+        y, height, l0, l1, r0, r1 = pieces[k]
+        w0 = r0 - l0
+        w1 = r1 - l1
+
+        # Pick a height, favoring the wider end of the trapezoid
+        u = uniform()
+        root = w0 + sqrt(w0 * w0 * (1 - u) + w1 * w1 * u)
+        t = u * (w0 + w1) / root if root else 0.0
+
+        # Then pick a spot across it at that height
+        left = l0 + (l1 - l0) * t
+        append(left + (w0 + (w1 - w0) * t) * uniform())
+        append(y + height * t)
+    return out_array
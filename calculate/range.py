@@ -1,3 +1,7 @@
+from calculate import columns
+from calculate import numpy_backend
+
+
 def range(data_list):
     """
     Accepts a sample of values and return the range.
@@ -17,10 +21,15 @@ def range(data_list):
 
         "range":http://en.wikipedia.org/wiki/Range_(statistics)
     """
+    # Hand arrays and other buffers off to NumPy, if it's installed
+    array = numpy_backend.as_array(data_list)
+    if array is not None:
+        return numpy_backend.range(array)
+
     # Convert all the values to floats and test to make sure
     # there aren't any strings in there
     try:
-        data_list = list(map(float, data_list))
+        data_list = columns.floats(data_list)
     except ValueError:
         raise ValueError('Input values should contain numbers, your first \
             input contains something else')
@@ -37,4 +46,4 @@ def range(data_list):
     min_ = min(data_list)
 
     # Find the range by calculating the difference
-    return max_ - min_
+    return float(max_ - min_)
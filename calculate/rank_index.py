@@ -0,0 +1,399 @@
+from bisect import bisect_left, insort
+import calculate
+from calculate.accessors import get_accessor
+
+# How many values each bucket is meant to hold. A bucket is split in two
+# once it's twice this size.
+LOAD = 1000
+
+# Sorts after any tie-breaking position, so a search can land past all
+# the entries for a value
+_LAST = float('inf')
+
+
+def _same(obj):
+    return obj
+
+
+class _SortedValues(object):
+    """
+    A read-only view of the values in a RankIndex, from smallest to largest.
+    """
+    def __init__(self, index):
+        self.index = index
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, i):
+        n = len(self.index)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('RankIndex index out of range')
+        return self.index._value_at(i)
+
+
+class RankIndex(object):
+    """
+    Accepts a list plus, optionally, the value and direction to order by.
+    Keeps the values sorted as objects are added, changed and removed, so
+    ranks and percentiles can be looked up again without sorting the whole
+    list over.
+
+    Each change and each lookup takes time that grows with the log of the
+    number of objects, which suits lists that are mostly the same from one
+    update to the next, like the returns coming in on election night.
+
+    The values are kept in a list of sorted buckets, with a Fenwick tree
+    over the bucket sizes to find how many values come before any bucket.
+
+    The order_by argument can be an attribute name, a dictionary key or a
+    function, just like calculate.competition_rank. If it's left out, the
+    objects themselves are ranked.
+
+    Objects are matched up by equality, so a freshly loaded copy of a
+    Django model can be used to update the original. Objects that can't be
+    hashed, like dictionaries, are matched up by identity. Ties in ordinal
+    ranks go to the object that was added first.
+
+    The index can be passed in place of a list to calculate.percentile,
+    calculate.percentile_many, calculate.decile and calculate.at_percentile.
+
+    h3. Example usage
+
+        >> import calculate
+        >> index = calculate.RankIndex(
+            Candidate.objects.all(),
+            'votes',
+            direction='desc'
+        )
+        >> index.competition_rank(villaraigosa)
+        1
+        >> villaraigosa.votes -= 5000
+        >> index.update(villaraigosa)
+        >> index.ordinal_rank(villaraigosa)
+        2
+        >> index.percentile(25000)
+        40.0
+
+    h3. Documentation
+
+        * "Fenwick tree":https://en.wikipedia.org/wiki/Fenwick_tree
+        * "Order statistic tree":https://en.wikipedia.org/wiki/\
+Order_statistic_tree
+    """
+    def __init__(self, obj_list=None, order_by=None, direction='desc'):
+        # Validate the direction
+        if direction not in ['desc', 'asc']:
+            raise ValueError('Direction kwarg should be either asc or desc.')
+        self.order_by = order_by
+        self.direction = direction
+        self.gettr = None
+
+        # Sorted (value, position added) pairs, split up into buckets,
+        # with the biggest pair in each bucket
+        self._buckets = []
+        self._maxes = []
+        self._tree = [0]
+
+        # The pairs for each object, and the objects that have to be
+        # matched up by identity
+        self._entries = {}
+        self._held = {}
+        self._loaded = None
+        self._count = 0
+        self._size = 0
+
+        if obj_list is not None:
+            self._load(obj_list)
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, obj):
+        return self._key(obj) in self._lookup()
+
+    @property
+    def values(self):
+        """
+        The values in the index, from smallest to largest.
+        """
+        return _SortedValues(self)
+
+    def _key(self, obj):
+        try:
+            hash(obj)
+        except TypeError:
+            return id(obj)
+        return obj
+
+    def _lookup(self):
+        # Match up the objects from the list we were built with
+        if self._loaded is not None:
+            obj_list, values = self._loaded
+            self._loaded = None
+            for position, obj in enumerate(obj_list):
+                self._remember(obj, (values[position], position))
+        return self._entries
+
+    def _remember(self, obj, entry):
+        key = self._key(obj)
+        if key is not obj:
+            self._held[key] = obj
+        self._entries.setdefault(key, []).append(entry)
+
+    def _value(self, obj):
+        # Figure out how to pull the values out the first time we see one
+        if self.gettr is None:
+            if self.order_by is None:
+                self.gettr = _same
+            else:
+                self.gettr = get_accessor([obj], self.order_by)
+        return self.gettr(obj)
+
+    def _load(self, obj_list):
+        # Fetch each value once. The list is copied, so changes to it
+        # don't throw off the objects we match up later.
+        obj_list = list(obj_list)
+        if not obj_list:
+            return
+        self._value(obj_list[0])
+        values = list(map(self.gettr, obj_list))
+        self._count = len(values)
+
+        # Hold off on matching up the objects with their values until
+        # someone asks, which one-off rankings never do
+        self._loaded = (obj_list, values)
+
+        # Sort the positions by value. The sort is stable, so ties
+        # stay in the order they were added.
+        order = sorted(range(len(values)), key=values.__getitem__)
+        sorted_entries = list(zip(map(values.__getitem__, order), order))
+
+        # Then deal them out into buckets
+        self._buckets = [
+            sorted_entries[i:i + LOAD]
+            for i in range(0, len(sorted_entries), LOAD)
+        ]
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+        self._size = len(sorted_entries)
+        self._rebuild()
+
+    def insert(self, obj):
+        """
+        Adds an object to the index.
+        """
+        entry = (self._value(obj), self._count)
+        self._count += 1
+        self._lookup()
+        self._remember(obj, entry)
+        self._add(entry)
+
+    def remove(self, obj):
+        """
+        Takes an object out of the index.
+        """
+        key = self._key(obj)
+        entry_list = self._lookup().get(key)
+        if not entry_list:
+            raise ValueError('The item you provided is not in the index')
+        entry = entry_list.pop(0)
+        if not entry_list:
+            del self._entries[key]
+            self._held.pop(key, None)
+        self._discard(entry)
+
+    def update(self, obj):
+        """
+        Moves an object to its current value. Objects that aren't in the
+        index yet are added.
+        """
+        key = self._key(obj)
+        entry_list = self._lookup().get(key)
+        if not entry_list:
+            return self.insert(obj)
+        old = entry_list[0]
+        value = self._value(obj)
+        if value == old[0]:
+            return
+        # Keep the object's place in line for breaking ties
+        entry = (value, old[1])
+        entry_list[0] = entry
+        self._discard(old)
+        self._add(entry)
+
+    def _add(self, entry):
+        buckets = self._buckets
+        if not buckets:
+            buckets.append([entry])
+            self._maxes.append(entry)
+            self._size = 1
+            self._rebuild()
+            return
+
+        # Find the first bucket that reaches past the entry, or the last one
+        b = bisect_left(self._maxes, entry)
+        if b == len(buckets):
+            b -= 1
+        bucket = buckets[b]
+        insort(bucket, entry)
+        self._maxes[b] = bucket[-1]
+        self._size += 1
+
+        # Split up buckets that have grown too big
+        if len(bucket) > 2 * LOAD:
+            buckets[b:b + 1] = [bucket[:LOAD], bucket[LOAD:]]
+            self._maxes[b:b + 1] = [bucket[LOAD - 1], bucket[-1]]
+            self._rebuild()
+        else:
+            self._grow(b, 1)
+
+    def _discard(self, entry):
+        b = bisect_left(self._maxes, entry)
+        bucket = self._buckets[b]
+        del bucket[bisect_left(bucket, entry)]
+        self._size -= 1
+
+        # Drop buckets that have emptied out
+        if bucket:
+            self._maxes[b] = bucket[-1]
+            self._grow(b, -1)
+        else:
+            del self._buckets[b]
+            del self._maxes[b]
+            self._rebuild()
+
+    def _rebuild(self):
+        tree = [0] + [len(bucket) for bucket in self._buckets]
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _grow(self, b, change):
+        tree = self._tree
+        i = b + 1
+        while i < len(tree):
+            tree[i] += change
+            i += i & -i
+
+    def _before(self, b):
+        # The number of values in the buckets ahead of this one
+        tree = self._tree
+        total = 0
+        while b:
+            total += tree[b]
+            b &= b - 1
+        return total
+
+    def _value_at(self, i):
+        # Walk down the tree to the bucket holding the value in position i
+        tree = self._tree
+        b = 0
+        step = 1
+        while step * 2 < len(tree):
+            step *= 2
+        while step:
+            if b + step < len(tree) and tree[b + step] <= i:
+                b += step
+                i -= tree[b]
+            step //= 2
+        return self._buckets[b][i][0]
+
+    def _smaller(self, entry):
+        # The number of entries that sort ahead of the provided one
+        b = bisect_left(self._maxes, entry)
+        if b == len(self._buckets):
+            return self._size
+        return self._before(b) + bisect_left(self._buckets[b], entry)
+
+    def below(self, value):
+        """
+        Returns the number of values in the index below the provided one.
+        """
+        return self._smaller((value,))
+
+    def at_or_below(self, value):
+        """
+        Returns the number of values in the index at or below the
+        provided one.
+        """
+        return self._smaller((value, _LAST))
+
+    def rank_value(self, value):
+        """
+        Returns the competition rank the provided value would have
+        in the index.
+        """
+        if self.direction == 'desc':
+            # One more than the number of values bigger than this one
+            return self._size - self.at_or_below(value) + 1
+        # One more than the number of values smaller than this one
+        return self.below(value) + 1
+
+    def competition_rank(self, obj):
+        """
+        Returns the competition rank of the provided object, or None if
+        it isn't in the index.
+        """
+        entry_list = self._lookup().get(self._key(obj))
+        if not entry_list:
+            return None
+        return self.rank_value(entry_list[0][0])
+
+    def ordinal_rank(self, obj):
+        """
+        Returns the ordinal rank of the provided object.
+        """
+        entry_list = self._lookup().get(self._key(obj))
+        if not entry_list:
+            raise ValueError('The item you provided is not in the list')
+        return self.ordinal_rank_value(*entry_list[0])
+
+    def ordinal_rank_value(self, value, position):
+        """
+        Returns the ordinal rank the provided value would have in the
+        index if it had been the object added in the provided position,
+        counting from zero. Objects built into the index from a list are
+        added in list order.
+        """
+        # Everything ahead of the entry when sorted smallest first
+        # by value, then by when they were added
+        entry = (value, position)
+        ahead = self._smaller(entry)
+        if self.direction == 'asc':
+            return ahead + 1
+        # Going the other way, the bigger values come first and
+        # only the ties that were added earlier stay ahead
+        ties = ahead - self.below(value)
+        return self._size - self.at_or_below(value) + ties + 1
+
+    def percentile(self, value, kind='weak'):
+        """
+        Returns the percentile rank of the provided value using
+        the method stipulated by the "kind" keyword argument, just
+        like calculate.percentile.
+        """
+        n = float(self._size)
+        if kind == 'strict':
+            return self.below(value) / n * 100
+        elif kind == 'weak':
+            return self.at_or_below(value) / n * 100
+        elif kind == 'mean':
+            # Average the weak and strict methods
+            strict = self.below(value) / n * 100
+            weak = self.at_or_below(value) / n * 100
+            return (strict + weak) / 2.0
+        else:
+            raise ValueError("The kind kwarg must be 'strict', 'weak' or \
+'mean'. You can also opt to leave it out and rely on the default method.")
+
+    def at_percentile(self, value, interpolation='fraction'):
+        """
+        Returns the value at the provided percentile, or a list of values
+        if a list of percentiles is provided, just like
+        calculate.at_percentile.
+        """
+        return calculate.at_percentile(self, value, interpolation)
@@ -0,0 +1,198 @@
+"""
+A sample that's converted and sorted once, so the percentile family of
+functions can all be served from it, plus an optional cache of them.
+
+    >> import calculate
+    >> sample = calculate.Sample(column)
+    >> calculate.median(sample)
+    >> calculate.at_percentile(sample, [25, 75])
+    >> calculate.decile(sample, 41000)
+
+Rather than building samples yourself, you can switch on a cache that
+calculate.median, calculate.at_percentile, calculate.percentile,
+calculate.decile and calculate.equal_sized_breakpoints will all share.
+Nothing is cached until you do.
+
+    >> from calculate import sample
+    >> sample.CACHE = calculate.SampleCache(max_values=10000000)
+"""
+import zlib
+from array import array
+from collections import OrderedDict
+import calculate
+from calculate import columns
+from calculate import numpy_backend
+
+# The cache the percentile functions share. Set it to a SampleCache to
+# switch it on.
+CACHE = None
+
+
+class Sample(calculate.PercentileIndex):
+    """
+    Accepts a sample of values, converts them to floats and sorts them
+    once. The sample can then be passed in place of the list to
+    calculate.median, calculate.at_percentile, calculate.percentile,
+    calculate.percentile_many, calculate.decile and
+    calculate.equal_sized_breakpoints, none of which will have to sort
+    it again.
+
+    The sorted values are kept in a compact array of floats.
+
+    h3. Example usage
+
+        >> import calculate
+        >> sample = calculate.Sample([1, 2, 3, 3, 4])
+        >> calculate.median(sample)
+        3.0
+        >> calculate.at_percentile(sample, [25, 75])
+        [2.0, 3.0]
+        >> calculate.percentile(sample, 3)
+        80.0
+        >> calculate.equal_sized_breakpoints(sample, 2)
+        [1.0, 3.0, 4.0]
+    """
+    def __init__(self, data_list):
+        # Sort buffers with NumPy, if it's installed, so no Python
+        # object is ever made for each value
+        numbers = numpy_backend.as_array(data_list)
+        if numbers is not None:
+            values = array('d', numpy_backend.numpy.sort(numbers).tobytes())
+        else:
+            # Convert all the values to floats and test to make sure
+            # there aren't any strings in there
+            try:
+                values = array('d', sorted(columns.floats(data_list)))
+            except (TypeError, ValueError):
+                raise ValueError('Input values should contain numbers, your \
+first input contains something else')
+        self.values = values
+        self.n = float(len(values))
+
+    def median(self):
+        """
+        Returns the median of the sample.
+        """
+        return calculate.median(self)
+
+    def at_percentile(self, value, interpolation='fraction'):
+        """
+        Returns the value at the provided percentile, or a list of values
+        if a list of percentiles is provided.
+        """
+        return calculate.at_percentile(self, value, interpolation)
+
+    def equal_sized_breakpoints(self, classes):
+        """
+        Returns break points for the provided number of equal-sized classes.
+        """
+        return calculate.equal_sized_breakpoints(self, classes)
+
+
+def _fingerprint(data_list):
+    """
+    Returns a summary of the contents of the provided list, which changes
+    when the list does. Returns None for anything that can't be summed
+    up without using it up, like an iterator.
+    """
+    view = columns.as_view(data_list)
+    if view is not None:
+        # Checksum the raw bytes. Strided views, like every other item
+        # of an array, have to be copied out first.
+        if view.c_contiguous:
+            raw = view.cast('B')
+        else:
+            raw = view.tobytes()
+        return (view.format, len(view), zlib.crc32(raw))
+    if isinstance(data_list, (list, tuple)):
+        # Checksum the values as floats, the way they'll be sorted.
+        # Python's hash() is no good here, since hash(-1) == hash(-2).
+        try:
+            values = array('d', columns.floats(data_list))
+        except (TypeError, ValueError):
+            return None
+        return (type(data_list), len(values), zlib.crc32(values.tobytes()))
+    return None
+
+
+class SampleCache(object):
+    """
+    Holds on to a Sample for each of the lists that have been handed to it,
+    so they only have to be sorted the first time.
+
+    Lists are looked up by their identity plus a checksum of their
+    contents, so a list that's changed since it was cached is sorted again.
+    The checksum takes a single pass over the list, which is a good deal
+    quicker than sorting it. Iterators and querysets aren't cached, because
+    checking them would use them up.
+
+    When the samples hold more than "max_values" values in all, the ones
+    that were used least recently are dropped.
+
+    h3. Example usage
+
+        >> import calculate
+        >> cache = calculate.SampleCache(max_values=1000000)
+        >> calculate.median(cache.get(column))
+        >> calculate.at_percentile(cache.get(column), 25)
+        >> cache.invalidate(column)
+    """
+    def __init__(self, max_values=10000000):
+        self.max_values = max_values
+        self.size = 0
+        self._samples = OrderedDict()
+
+    def __len__(self):
+        return len(self._samples)
+
+    def get(self, data_list):
+        """
+        Returns the Sample for the provided list, sorting it if needed.
+        """
+        fingerprint = _fingerprint(data_list)
+        if fingerprint is None:
+            return Sample(data_list)
+        return self._get(data_list, fingerprint)
+
+    def _get(self, data_list, fingerprint):
+        key = (id(data_list), fingerprint)
+
+        # Move a hit to the back of the line, so it's dropped last
+        try:
+            sample = self._samples.pop(key)
+        except KeyError:
+            sample = Sample(data_list)
+            # If the sample alone wouldn't fit, don't bother keeping it
+            if len(sample) > self.max_values:
+                return sample
+            self.size += len(sample)
+        self._samples[key] = sample
+
+        # Drop the samples used least recently until we fit
+        while self.size > self.max_values:
+            old_key, old_sample = self._samples.popitem(last=False)
+            self.size -= len(old_sample)
+        return sample
+
+    def invalidate(self, data_list=None):
+        """
+        Forgets the samples for the provided list, or everything if no
+        list is provided.
+        """
+        for key in list(self._samples):
+            if data_list is None or key[0] == id(data_list):
+                self.size -= len(self._samples.pop(key))
+
+
+def cached(data_list):
+    """
+    Returns the cached Sample for the provided list if the cache is switched
+    on and the list can be cached. Otherwise returns the list as is.
+    """
+    if CACHE is None or isinstance(data_list, (calculate.PercentileIndex,
+                                               calculate.QuantileSketch)):
+        return data_list
+    fingerprint = _fingerprint(data_list)
+    if fingerprint is None:
+        return data_list
+    return CACHE._get(data_list, fingerprint)
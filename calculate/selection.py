@@ -0,0 +1,183 @@
+"""
+A selection engine for finding order statistics, like the value in the
+middle of a list, without sorting the whole thing.
+
+It uses introselect. That is quickselect, which partitions the values
+around a pivot and only keeps working on the side that holds the position
+we want, with a limit on how deep it can go. If the pivots keep turning out
+badly and the limit is reached, it falls back to sorting what's left, so
+the worst case is no slower than a sort. The expected cost is O(n).
+
+Several positions can be found at once. Each round of partitioning is
+shared by every position that falls on the same side of the pivot.
+
+When a big list is only asked for a position or two, a cheaper trick from
+Floyd and Rivest is tried first. A random sample is sorted to guess a pair
+of values that will bracket the position. Then a pass counts the values
+below the bracket and another collects the few inside it, which are then
+sorted. If the guess misses, quickselect takes over.
+"""
+import math
+import random
+
+# Lists at or below this size are quicker to just sort
+CUTOFF = 256
+
+# Lists at or above this size asked for no more than BRACKET_LIMIT
+# positions are worth trying the sampling trick on
+BRACKET_CUTOFF = 4096
+BRACKET_LIMIT = 3
+
+# Pivots are chosen at random, using a private generator so we
+# don't disturb the state of the random module
+_random = random.Random()
+
+
+def select(values, position, overwrite=False):
+    """
+    Accepts a list of numbers and returns the value that would be found
+    at the provided zero-based position if the list were sorted.
+
+    By default the list is copied first. If you don't need it anymore,
+    set the "overwrite" keyword argument to True and it will be used as
+    scratch space instead, which saves memory. It will be left empty.
+
+    h3. Example usage
+
+        >> from calculate import selection
+        >> selection.select([5, 1, 4, 2, 3], 1)
+        2
+    """
+    return select_many(values, [position], overwrite=overwrite)[0]
+
+
+def select_many(values, positions, overwrite=False):
+    """
+    Accepts a list of numbers and a list of zero-based positions. Returns
+    a list with the value that would be found at each position if the
+    list were sorted, in the same order the positions were provided.
+
+    The "overwrite" keyword argument works the same way as it does
+    in select.
+
+    h3. Example usage
+
+        >> from calculate import selection
+        >> selection.select_many([5, 1, 4, 2, 3], [4, 0, 2])
+        [5, 1, 3]
+    """
+    # Make sure all of the positions actually exist
+    n = len(values)
+    for position in positions:
+        if not 0 <= position < n:
+            raise IndexError('Position %s is out of range for a list with \
+%s values' % (position, n))
+
+    # Allow about twice as many rounds as a well-behaved run would need
+    # before we give up on partitioning and sort instead.
+    depth = 2 * int(math.log(max(n, 1), 2)) + 1
+
+    found = {}
+    remaining = sorted(set(positions))
+    # The sampling trick only reads the list, so it can run on the original
+    if n >= BRACKET_CUTOFF and len(remaining) <= BRACKET_LIMIT:
+        remaining = _bracket(values, remaining, found)
+    if remaining:
+        # Partitioning needs a list of its own to work on
+        if not overwrite or not isinstance(values, list):
+            values = list(values)
+        _select(values, remaining, 0, found, depth)
+
+    # Either way, a list we were allowed to overwrite ends up empty
+    if overwrite and isinstance(values, list):
+        del values[:]
+    return [found[position] for position in positions]
+
+
+def _bracket(values, positions, found):
+    """
+    Tries to find each position by sampling a pair of values that
+    bracket it. Stashes the hits in the found dictionary and returns
+    a list of the positions it missed.
+    """
+    n = len(values)
+
+    # Sort a sample of the values. Its size follows Floyd and Rivest.
+    sample_size = int(n ** (2 / 3.0))
+    sample = sorted(_random.sample(values, sample_size))
+
+    # How far either side of the estimate to set the bracket
+    spread = int(math.sqrt(sample_size) * 1.5) + 1
+
+    missed = []
+    for position in positions:
+        # Estimate where the position falls in the sample
+        estimate = position * sample_size // n
+        low = sample[max(0, estimate - spread)]
+        high = sample[min(sample_size - 1, estimate + spread)]
+
+        # Count everything below the bracket and gather up what's inside
+        below = sum(1 for i in values if i < low)
+        inside = [i for i in values if low <= i <= high]
+
+        # If our position landed in the bracket, we only need to sort that
+        if below <= position < below + len(inside):
+            inside.sort()
+            found[position] = inside[position - below]
+        else:
+            missed.append(position)
+    return missed
+
+
+def _select(values, positions, offset, found, depth):
+    """
+    Finds each of the positions, which are relative to the start of the
+    values list, and stashes the results in the found dictionary keyed by
+    their position plus the offset.
+    """
+    n = len(values)
+
+    # If the list is small, or we've run out of patience, just sort it
+    if n <= CUTOFF or depth <= 0:
+        values.sort()
+        for position in positions:
+            found[position + offset] = values[position]
+        return
+
+    # Take the median of three random values as the pivot
+    sample = sorted([values[_random.randrange(n)] for i in range(3)])
+    pivot = sample[1]
+
+    # Split the list into the values below and above the pivot.
+    # Anything left over is equal to it.
+    lows = [i for i in values if i < pivot]
+    highs = [i for i in values if i > pivot]
+    low_count = len(lows)
+    equal_count = n - low_count - len(highs)
+
+    # We're done with the original now, so free up the memory
+    del values[:]
+
+    # Figure out which side each position falls on
+    low_positions = []
+    high_positions = []
+    for position in positions:
+        if position < low_count:
+            low_positions.append(position)
+        elif position < low_count + equal_count:
+            found[position + offset] = pivot
+        else:
+            high_positions.append(position - low_count - equal_count)
+
+    # And keep digging on the sides that we need
+    if low_positions:
+        _select(lows, low_positions, offset, found, depth - 1)
+    del lows
+    if high_positions:
+        _select(
+            highs,
+            high_positions,
+            offset + low_count + equal_count,
+            found,
+            depth - 1
+        )
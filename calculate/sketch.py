@@ -0,0 +1,352 @@
+"""
+A mergeable quantile sketch for datasets too big to hold in memory.
+
+It's an implementation of the KLL sketch by Karnin, Lang and Liberty. Values
+are fed into a stack of "compactors." When one fills up, it is sorted and
+every other value is promoted to the next level up, where each survivor
+stands in for twice as many of the original values. The result is a small,
+weighted sample that can answer questions about ranks and percentiles.
+
+The memory used depends only on the "k" parameter, not on how many values
+have been seen. The error is measured in rank. With the default k of 200,
+percentile answers are usually within a quarter of a point of the truth,
+and it's rare for any of them to be off by more than one point. That is,
+a value reported at the 50th percentile almost always sits somewhere between
+the 49th and 51st. Doubling k roughly halves the error and doubles the
+memory. The minimum and maximum values are always tracked exactly.
+
+Sketches built on different machines, or from different chunks of the same
+stream, can be combined with merge(). They can be converted to bytes with
+to_bytes() and restored with QuantileSketch.from_bytes().
+
+A sketch can be passed in place of a list to calculate.at_percentile,
+calculate.median, calculate.percentile, calculate.decile and
+calculate.equal_sized_breakpoints.
+
+    >> import calculate
+    >> sketch = calculate.QuantileSketch(range(1, 1000001), seed=0)
+    >> calculate.median(sketch)
+    502627.0
+    >> calculate.percentile(sketch, 250000)
+    24.9856
+
+Sources:
+
+    "Optimal Quantile Approximation in Streams":https://arxiv.org/abs/\
+1603.05346
+    "streaming-quantiles":https://github.com/edoliberty/streaming-quantiles
+"""
+import math
+import random
+import struct
+from bisect import bisect_left, bisect_right
+
+# How much smaller each level's capacity is than the one above it
+CAPACITY_DECAY = 2 / 3.0
+
+# Tags the start of a serialized sketch
+MAGIC = b'KLL1'
+HEADER = struct.Struct('<4sIQddI')
+
+
+class QuantileSketch(object):
+    """
+    Accepts an optional iterable of numbers and summarizes them in a
+    sketch that can estimate ranks and percentiles in bounded memory.
+
+    More values can be added later with add() or update().
+
+    The "k" keyword argument controls the tradeoff between accuracy and
+    memory. The "seed" keyword argument makes the random choices the
+    sketch makes repeatable.
+
+    h3. Example usage
+
+        >> import calculate
+        >> sketch = calculate.QuantileSketch(k=200)
+        >> for row in csv.reader(open('transactions.csv')):
+        ..     sketch.add(row[3])
+        >> sketch.at_percentile(90)
+        1249.99
+        >> len(sketch)
+        2500000
+        >> blob = other_worker_sketch.to_bytes()
+        >> sketch.merge(calculate.QuantileSketch.from_bytes(blob))
+        >> len(sketch)
+        5000000
+    """
+    def __init__(self, data_list=None, k=200, seed=None):
+        if k < 8:
+            raise ValueError('The k kwarg should be at least 8')
+        self.k = int(k)
+        self.n = 0
+        self.minimum = None
+        self.maximum = None
+        self.compactors = [[]]
+        self._random = random.Random(seed)
+        self._size = 0
+        self._max_size = self._capacity(0)
+        self._cdf = None
+        if data_list is not None:
+            self.update(data_list)
+
+    def __len__(self):
+        return self.n
+
+    def _capacity(self, level):
+        # The top level is k wide, and each level beneath it is smaller
+        depth = len(self.compactors) - level - 1
+        return int(math.ceil(self.k * CAPACITY_DECAY ** depth)) + 1
+
+    def _grow(self):
+        self.compactors.append([])
+        self._max_size = sum(
+            self._capacity(level) for level in range(len(self.compactors))
+        )
+
+    def add(self, value):
+        """
+        Adds a single value to the sketch.
+        """
+        return self.update([value])
+
+    def update(self, data_list):
+        """
+        Adds every value in the provided iterable to the sketch.
+        """
+        self._cdf = None
+        bottom = self.compactors[0]
+        for value in data_list:
+            # Convert the value to a float and test to make sure
+            # it isn't a string
+            try:
+                value = float(value)
+            except ValueError:
+                raise ValueError('Input values should contain numbers')
+            if self.minimum is None or value < self.minimum:
+                self.minimum = value
+            if self.maximum is None or value > self.maximum:
+                self.maximum = value
+            bottom.append(value)
+            self.n += 1
+            self._size += 1
+            if self._size >= self._max_size:
+                self._compress()
+                bottom = self.compactors[0]
+        return self
+
+    def _compress(self):
+        # Find the lowest level that's full and compact it
+        for level, compactor in enumerate(self.compactors):
+            if len(compactor) >= self._capacity(level):
+                if level + 1 >= len(self.compactors):
+                    self._grow()
+                compactor.sort()
+                # If there's an odd one out, it stays behind
+                if len(compactor) % 2:
+                    leftover = [compactor.pop()]
+                else:
+                    leftover = []
+                # Promote either the odd or even values, at random
+                offset = self._random.randint(0, 1)
+                self.compactors[level + 1].extend(compactor[offset::2])
+                compactor[:] = leftover
+                break
+        self._size = sum(len(c) for c in self.compactors)
+
+    def merge(self, other):
+        """
+        Combines another sketch into this one. Both sketches must have
+        the same k.
+
+        Returns this sketch so calls can be chained.
+        """
+        if other.k != self.k:
+            raise ValueError('Only sketches with the same k can be merged. \
+This one has a k of %s and the other has %s.' % (self.k, other.k))
+        self._cdf = None
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for level, compactor in enumerate(other.compactors):
+            self.compactors[level].extend(compactor)
+        self.n += other.n
+        if other.n:
+            if self.minimum is None or other.minimum < self.minimum:
+                self.minimum = other.minimum
+            if self.maximum is None or other.maximum > self.maximum:
+                self.maximum = other.maximum
+        self._size = sum(len(c) for c in self.compactors)
+        while self._size >= self._max_size:
+            self._compress()
+        return self
+
+    def _get_cdf(self):
+        """
+        Returns the retained values in order, alongside a running total of
+        how many of the original values each one accounts for.
+        """
+        if self._cdf is None:
+            weighted = sorted(
+                (value, 2 ** level)
+                for level, compactor in enumerate(self.compactors)
+                for value in compactor
+            )
+            values = []
+            totals = []
+            total = 0
+            for value, weight in weighted:
+                total += weight
+                values.append(value)
+                totals.append(total)
+            self._cdf = (values, totals)
+        return self._cdf
+
+    def _check_empty(self):
+        # Nothing can be estimated until a value has been added
+        if not self.n:
+            raise ValueError('The sketch should contain at least one value')
+
+    def rank(self, value, kind='weak'):
+        """
+        Returns the estimated number of values at or below the provided
+        one. If "kind" is "strict", only the values below it are counted.
+        """
+        if kind not in ['strict', 'weak']:
+            raise ValueError("The kind kwarg must be 'strict' or 'weak'.")
+        self._check_empty()
+        values, totals = self._get_cdf()
+        if kind == 'strict':
+            i = bisect_left(values, value)
+        else:
+            i = bisect_right(values, value)
+        if not i:
+            return 0
+        # The retained weights don't always add up to exactly n,
+        # so scale the result to match.
+        return totals[i - 1] * self.n / float(totals[-1])
+
+    def percentile(self, value, kind='weak'):
+        """
+        Returns the estimated percentile rank of the provided value. The
+        "kind" keyword argument works the same as calculate.percentile.
+        """
+        self._check_empty()
+        if kind == 'mean':
+            return (self.percentile(value, 'strict') +
+                    self.percentile(value, 'weak')) / 2.0
+        elif kind not in ['strict', 'weak']:
+            raise ValueError("The kind kwarg must be 'strict', 'weak' or \
+'mean'. You can also opt to leave it out and rely on the default method.")
+        return self.rank(value, kind=kind) / float(self.n) * 100
+
+    def value_at(self, position):
+        """
+        Returns the estimated value that would be found at the provided
+        zero-based position if all of the values were sorted.
+        """
+        if not 0 <= position < self.n:
+            raise IndexError('Position %s is out of range for a sketch of \
+%s values' % (position, self.n))
+        # The ends are known exactly
+        if position == 0:
+            return self.minimum
+        if position == self.n - 1:
+            return self.maximum
+        values, totals = self._get_cdf()
+        target = (position + 1) * totals[-1] / float(self.n)
+        i = min(bisect_left(totals, target), len(values) - 1)
+        return values[i]
+
+    def at_percentile(self, value, interpolation='fraction'):
+        """
+        Returns the estimated value at the provided percentile, or a list
+        of values if a list of percentiles is provided. The "interpolation"
+        keyword argument works the same as calculate.at_percentile.
+        """
+        if interpolation not in ['fraction', 'lower', 'higher']:
+            raise ValueError("The interpolation kwarg must be 'fraction', \
+'lower' or 'higher'. You can also opt to leave it out and rely on the \
+default method.")
+        self._check_empty()
+        if isinstance(value, (list, tuple)):
+            return [self.at_percentile(v, interpolation) for v in value]
+        i = ((self.n - 1) / float(100)) * float(value)
+        l = self.value_at(int(math.floor(i)))
+        h = self.value_at(min(int(math.ceil(i)), self.n - 1))
+        remainder = i - int(i)
+        if not remainder or interpolation == 'lower':
+            return l
+        elif interpolation == 'higher':
+            return h
+        return l + ((h - l) * remainder)
+
+    def median(self):
+        """
+        Returns the estimated median.
+        """
+        return self.at_percentile(50)
+
+    def equal_sized_breakpoints(self, classes):
+        """
+        Returns estimated break points for groups of equal size, following
+        the same rules as calculate.equal_sized_breakpoints.
+        """
+        self._check_empty()
+        breaks = []
+        for i in range(classes):
+            a = i / float(classes) * self.n
+            aa = int(a)
+            r = a - aa
+            low = self.value_at(aa)
+            if r:
+                high = self.value_at(min(aa + 1, self.n - 1))
+                breaks.append((1 - r) * low + r * high)
+            else:
+                breaks.append(low)
+        breaks.append(self.maximum)
+        return breaks
+
+    def to_bytes(self):
+        """
+        Returns the sketch serialized as a string of bytes.
+        """
+        nan = float('nan')
+        parts = [HEADER.pack(
+            MAGIC,
+            self.k,
+            self.n,
+            nan if self.minimum is None else self.minimum,
+            nan if self.maximum is None else self.maximum,
+            len(self.compactors),
+        )]
+        for compactor in self.compactors:
+            parts.append(struct.pack('<I', len(compactor)))
+            parts.append(struct.pack('<%sd' % len(compactor), *compactor))
+        return b''.join(parts)
+
+    @classmethod
+    def from_bytes(cls, data, seed=None):
+        """
+        Restores a sketch from the bytes created by to_bytes.
+        """
+        magic, k, n, minimum, maximum, levels = HEADER.unpack_from(data, 0)
+        if magic != MAGIC:
+            raise ValueError('The provided bytes are not a serialized sketch')
+        sketch = cls(k=k, seed=seed)
+        sketch.n = n
+        if n:
+            sketch.minimum, sketch.maximum = minimum, maximum
+        offset = HEADER.size
+        sketch.compactors = []
+        for level in range(levels):
+            count, = struct.unpack_from('<I', data, offset)
+            offset += 4
+            sketch.compactors.append(
+                list(struct.unpack_from('<%sd' % count, data, offset))
+            )
+            offset += 8 * count
+        sketch._max_size = sum(
+            sketch._capacity(level) for level in range(levels)
+        )
+        sketch._size = sum(len(c) for c in sketch.compactors)
+        return sketch
@@ -1,11 +1,24 @@
-def split_at_breakpoints(data_list, breakpoint_list):
+import calculate
+
+
+def split_at_breakpoints(data_list, breakpoint_list, indexes=False):
     """
     Splits up a list at the provided breakpoints.
 
     First argument is a list of data values. Second is a list
     of the breakpoints you'd like it to be split up with.
 
-    Returns a list of lists, in order by breakpoint.
+    Returns a list of lists, in order by breakpoint. The values in each
+    list are sorted. Neither of the lists you provide is modified.
+
+    Each group includes its lower breakpoint and runs up to, but doesn't
+    include, the next one. The last group includes both its breakpoints.
+    Values outside the breakpoints raise a ValueError.
+
+    If you'd rather have the index of the group each value falls into,
+    set the "indexes" keyword argument to True. To bin the values one at
+    a time, without loading them all into memory, use
+    calculate.breakpoint_bins.
 
     Useful for splitting up a list after you've determined breakpoints using
     another method like calculate.equal_sized_breakpoints.
@@ -20,30 +33,31 @@ def split_at_breakpoints(data_list, breakpoint_list):
         >>> calculate.split_at_breakpoints(l, bp)
         [[1, 2, 3, 4, 5, 6], [7, 8, 9, 10, 11, 12], [13, 14, 15, 16, 17, 18],
         [19, 20, 21, 22, 23, 24], [25, 26, 27, 28, 29, 30]]
+        >>> calculate.split_at_breakpoints([1, 7, 30, 12], bp, indexes=True)
+        [0, 1, 4, 1]
     """
-    # Sort the lists
-    data_list.sort()
-    breakpoint_list.sort()
+    # We're going to hold onto all the values anyway, so load them up
+    # in case we've been given something that can only be read once
+    data_list = list(data_list)
+
+    # Find the bin for each value with a binary search of the breakpoints
+    bins = calculate.breakpoint_bins(data_list, breakpoint_list)
+
+    # If that's all the user wants, pass them out
+    if indexes:
+        return list(bins)
 
     # Create a list of empty lists that we'll
     # fill in with values as we go along.
     split_list = [[] for i in range(len(breakpoint_list) - 1)]
 
-    # Loop through the data list
-    for value in data_list:
-
-        # Start off by assuming it's in the last break
-        group = len(breakpoint_list) - 1
-
-        # Then loop through all the breaks from first to last
-        for i in range(len(breakpoint_list) - 1):
-            # If the value is falls between this break and the next one up...
-            if value >= breakpoint_list[i] and value <= breakpoint_list[i + 1]:
-                # ...set it as a member of that break
-                group = i
-
-        # Then add it to the proper list
+    # Loop through the data list and add each value to the proper list
+    for value, group in zip(data_list, bins):
         split_list[group].append(value)
 
+    # Sort each group, so they come out in order like they always have
+    for group in split_list:
+        group.sort()
+
     # Return the list of lists
     return split_list
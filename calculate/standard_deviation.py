@@ -1,5 +1,7 @@
 import math
 import calculate
+from calculate import columns
+from calculate import numpy_backend
 
 
 def standard_deviation(data_list):
@@ -27,25 +29,26 @@ def standard_deviation(data_list):
         "standard deviation":http://en.wikipedia.org/wiki/Standard_deviation
 
     """
+    # Hand arrays and other buffers off to NumPy, if it's installed
+    array = numpy_backend.as_array(data_list)
+    if array is not None:
+        return numpy_backend.standard_deviation(array)
+
     # Convert all the values to floats and test to make sure
     # there aren't any strings in there
     try:
-        data_list = list(map(float, data_list))
+        data_list = columns.floats(data_list)
     except ValueError:
         raise ValueError('Input values must contain numbers')
 
     # Find the mean
     mean = calculate.mean(data_list)
 
-    # Create a new list containing the distance from mean
-    # for each value in the sample
-    deviations = [i - mean for i in data_list]
-
-    # Square the distances
-    deviations_squared = [math.pow(i, 2) for i in deviations]
-
-    # Take the average of those squares
-    mean_deviation = calculate.mean(deviations_squared)
+    # Square the distance from the mean for each value in the sample
+    # and take the average of those squares
+    mean_deviation = sum(
+        math.pow(i - mean, 2) for i in data_list
+    ) / float(len(data_list))
 
     # And then take the square root of the mean to find the standard deviation
     return math.sqrt(mean_deviation)
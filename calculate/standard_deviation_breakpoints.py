@@ -0,0 +1,46 @@
+import calculate
+
+
+def standard_deviation_breakpoints(data_list, classes):
+    """
+    Returns break points spaced one standard deviation apart and
+    centered on the mean.
+
+    Provide a list of data values and the number of classes you'd like the list
+    broken up into. With an even number of classes, the mean is one of the
+    breaks. With an odd number, the middle class straddles it. Breaks that
+    would fall beyond the smallest or largest value are dropped, so heavily
+    skewed data can come back with fewer classes than you asked for.
+
+    h3. Example usage
+
+        >> import calculate
+        >> data_list = [2, 4, 4, 4, 5, 5, 7, 9]
+        >> calculate.standard_deviation_breakpoints(data_list, 4)
+        [2.0, 3.0, 5.0, 7.0, 9.0]
+
+    h3. Documentation
+
+        * "Standard deviation classification":http://wiki.gis.com/wiki/\
+index.php/Standard_Deviation_classification
+    """
+    # Make sure we've got a sensible number of classes
+    if classes < 1:
+        raise ValueError('The number of classes should be at least 1')
+
+    # Find the ends, mean and standard deviation in one pass
+    stats = calculate.SummaryAccumulator(data_list, counts=False)
+    if not stats.n:
+        raise ValueError('The list should contain at least one value')
+    mean = stats.mean
+    deviation = stats.standard_deviation
+
+    # Step out from the mean one standard deviation at a time,
+    # keeping only the breaks that land inside the data
+    breaks = [stats.minimum]
+    for i in range(1, classes):
+        breakpoint = mean + (i - classes / 2.0) * deviation
+        if stats.minimum < breakpoint < stats.maximum:
+            breaks.append(breakpoint)
+    breaks.append(stats.maximum)
+    return breaks
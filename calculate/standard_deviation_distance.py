@@ -1,7 +1,11 @@
+import math
 import calculate
+from calculate import geometry
+from calculate import querysets
 
 
-def standard_deviation_distance(obj_list, point_attribute_name='point'):
+def standard_deviation_distance(obj_list, point_attribute_name='point',
+                                group_by=None, weight=None):
     """
     Accepts a geoqueryset, list of objects or list of dictionaries, expected
     to contain objects with Point properties, and returns a float with the
@@ -18,35 +22,74 @@ def standard_deviation_distance(obj_list, point_attribute_name='point'):
     If the point field is called something else, change the kwarg
     'point_attribute_name' to whatever your field might be called.
 
+    The points can also be (x, y) tuples, or a calculate.Coordinates with
+    parallel lists of x and y coordinates, the same as
+    calculate.mean_center. GeoDjango isn't needed for those.
+
+    The "group_by" and "weight" kwargs work the same as they do for
+    calculate.mean_centers. The points are read once, and each group's
+    center comes from the same pass. With "group_by" you get back a
+    dictionary with the standard deviation distance of each group. With
+    "weight" each distance counts in proportion to its point's weight.
+
     h3. Example usage
 
         >> import calculate
         >> calculate.standard_deviation_distance(qs)
         0.046301584704149731
-
-    h3. Dependencies
-
-        * "django":http://www.djangoproject.com/
-        * "geodjango":http://www.geodjango.org/
+        >> calculate.standard_deviation_distance([(0, 0), (0, 2), (2, 0)])
+        0.2582839244818621
+        >> calculate.standard_deviation_distance(qs, group_by='district')
+        {1: 0.04630158470414973, 2: 0.03172637629471835}
 
     h3. Documentation
 
         * "standard deviation distance":http://www.spatialanalysisonline.com/\
 output/html/Directionalanalysisofpointdatasets.html
     """
-    # Figure out what type of objects we're dealing with
-    if isinstance(obj_list[0], type({})):
-        def getkey(obj, key):
-            return obj.get(key)
-        gettr = getkey
-    else:
-        gettr = getattr
-    mean = calculate.mean_center(
-        obj_list,
-        point_attribute_name=point_attribute_name
-    )
-    distances = [
-        gettr(p, point_attribute_name).distance(mean)
-        for p in obj_list
-    ]
+    if group_by is not None or weight is not None:
+        # Collect the points and add them up in a single pass
+        groups = geometry.group_points(
+            obj_list,
+            point_attribute_name,
+            group_by=group_by,
+            weight=weight,
+            keep=True
+        )
+        results = {}
+        for key, sums in groups.items():
+            x, y = sums.mean_xy()
+            distances = geometry.distances(sums.xs, sums.ys, x, y)
+            results[key] = _weighted_standard_deviation(
+                distances,
+                sums.weights,
+                sums.total_weight
+            )
+        if group_by is None:
+            return results[None]
+        return results
+
+    # Let the database do the math, if it can
+    if querysets.is_queryset(obj_list):
+        result = querysets.standard_deviation_distance(
+            obj_list,
+            point_attribute_name
+        )
+        if result is not querysets.UNSUPPORTED:
+            return result
+
+    # Pull out the coordinates and find the mean center
+    xs, ys, template = geometry.coordinates(obj_list, point_attribute_name)
+    x, y = geometry.mean_xy(xs, ys)
+    # Measure how far each point is from it
+    distances = geometry.distances(xs, ys, x, y)
     return calculate.standard_deviation(distances)
+
+
+def _weighted_standard_deviation(data_list, weights, total_weight):
+    # The weighted mean, then the weighted average squared distance from it
+    mean = sum(w * d for d, w in zip(data_list, weights)) / total_weight
+    variance = sum(
+        w * (d - mean) * (d - mean) for d, w in zip(data_list, weights)
+    ) / total_weight
+    return math.sqrt(variance)
@@ -0,0 +1,44 @@
+from calculate import dispersion
+
+
+def standard_deviational_ellipse(obj_list, point_attribute_name='point',
+                                 weight=None, standard_deviations=1):
+    """
+    Accepts a geoqueryset, list of objects or list of dictionaries, expected
+    to contain points as one of their attributes, and returns the standard
+    deviational ellipse of the provided points.
+
+    The ellipse sits on the mean center and shows which way the points are
+    spread out. It's returned as a calculate.dispersion.Ellipse with four
+    parts: the center, the lengths of the semi-major and semi-minor axes,
+    and the rotation of the major axis counterclockwise from the x axis,
+    in radians.
+
+    The axes are one standard deviation long. Change the
+    "standard_deviations" kwarg to make them longer.
+
+    The points and the "weight" kwarg are handled the same way as they are
+    by calculate.standard_distance. They're read in a single pass.
+
+    h3. Example usage
+
+        >> import calculate
+        >> calculate.standard_deviational_ellipse([(0, 0), (1, 1), (2, 2)])
+        Ellipse(center=XY(x=1.0, y=1.0), major_axis=1.1547005383792515, \
+minor_axis=0.0, rotation=0.7853981633974483)
+        >> calculate.standard_deviational_ellipse(qs, weight='population')
+        Ellipse(center=<Point object at 0x77a1694>, major_axis=...)
+
+    h3. Documentation
+
+        * "standard deviational ellipse":http://desktop.arcgis.com/en/arcmap/\
+latest/tools/spatial-statistics-toolbox/h-how-directional-distribution-\
+standard-deviationa.htm
+    """
+    if standard_deviations <= 0:
+        raise ValueError('The number of standard deviations should be more \
+than zero')
+    return dispersion.ellipse(
+        dispersion.moments(obj_list, point_attribute_name, weight=weight),
+        standard_deviations
+    )
@@ -0,0 +1,40 @@
+from calculate import dispersion
+
+
+def standard_distance(obj_list, point_attribute_name='point', weight=None):
+    """
+    Accepts a geoqueryset, list of objects or list of dictionaries, expected
+    to contain points as one of their attributes, and returns a float with
+    the standard distance of the provided points.
+
+    The standard distance is the square root of the average squared distance
+    of the points from their mean center. It's the spatial version of the
+    standard deviation. It differs from calculate.standard_deviation_distance,
+    which measures how much the distances vary rather than how big they are.
+
+    The points can be GeoDjango Points, (x, y) tuples or a
+    calculate.Coordinates object, the same as calculate.mean_center. They're
+    read in a single pass. Coordinates made from NumPy arrays are crunched
+    without a Python loop.
+
+    The "weight" kwarg can be an attribute name, a dictionary key or a
+    function that accepts an object and returns its weight. With a
+    calculate.Coordinates, it's a parallel list of numbers instead.
+
+    h3. Example usage
+
+        >> import calculate
+        >> calculate.standard_distance([(0, 0), (2, 0), (0, 2), (2, 2)])
+        1.4142135623730951
+        >> calculate.standard_distance(qs, weight='population')
+        0.041735195029514336
+
+    h3. Documentation
+
+        * "standard distance":http://desktop.arcgis.com/en/arcmap/latest/\
+tools/spatial-statistics-toolbox/h-how-standard-distance-spatial-statistic-\
+works.htm
+    """
+    return dispersion.standard_distance(
+        dispersion.moments(obj_list, point_attribute_name, weight=weight)
+    )
@@ -0,0 +1,244 @@
+import math
+from collections import namedtuple
+from calculate import numpy_backend
+
+
+SummaryStats = namedtuple('SummaryStats', [
+    'n',
+    'mean',
+    'median',
+    'mode',
+    'maximum',
+    'minimum',
+    'range',
+    'standard_deviation',
+    'variation_coefficient',
+])
+
+
+class SummaryAccumulator(object):
+    """
+    Collects a variety of descriptive statistics from a stream of numbers
+    in a single pass.
+
+    It keeps a running count, sum, minimum and maximum. The variance is
+    tracked with Welford's method, which is much less prone to rounding
+    errors than summing up squares. A tally of how often each value occurs
+    is kept so the mode and median can be found at the end.
+
+    Accumulators built from separate chunks of a dataset can be combined
+    with merge(), so the chunks can be crunched independently.
+
+    If you don't need the median or mode, set the "counts" keyword argument
+    to False and the accumulator will run in constant memory.
+
+    h3. Example usage
+
+        >> import calculate
+        >> acc = calculate.SummaryAccumulator([1, 2, 2, 3])
+        >> acc.mean
+        2.0
+        >> acc.mode
+        2
+        >> other = calculate.SummaryAccumulator(i for i in [4, 5])
+        >> acc.merge(other).median
+        2.5
+
+    h3. Documentation
+
+        * "Algorithms for calculating variance":http://en.wikipedia.org/\
+wiki/Algorithms_for_calculating_variance
+    """
+    def __init__(self, data_list=None, counts=True):
+        self.n = 0
+        self.sum = 0.0
+        self.minimum = None
+        self.maximum = None
+        # The running mean and the sum of squared distances from it
+        self._mean = 0.0
+        self._m2 = 0.0
+        if counts:
+            self.counts = {}
+        else:
+            self.counts = None
+        if data_list is not None:
+            self.update(data_list)
+
+    def add(self, value):
+        """
+        Adds a single value to the accumulator.
+        """
+        return self.update([value])
+
+    def update(self, data_list):
+        """
+        Adds every value in the provided iterable to the accumulator.
+        """
+        # Arrays and other buffers can be crunched by NumPy in one go
+        array = numpy_backend.as_array(data_list)
+        if array is not None:
+            integers = numpy_backend.as_integer_array(data_list)
+            return self.merge(self._from_array(array, integers))
+
+        # Pull everything into local variables to keep the loop quick
+        n, sum_, mean, m2 = self.n, self.sum, self._mean, self._m2
+        min_, max_, counts = self.minimum, self.maximum, self.counts
+        try:
+            for raw in data_list:
+                # Convert the value to a float and test to make sure
+                # it isn't a string
+                value = float(raw)
+                n += 1
+                sum_ += value
+                if min_ is None or value < min_:
+                    min_ = value
+                if max_ is None or value > max_:
+                    max_ = value
+                # Welford's update
+                delta = value - mean
+                mean += delta / n
+                m2 += delta * (value - mean)
+                if counts is not None:
+                    # Tally numbers as they came in, so the mode keeps
+                    # its type. Equal numbers hash the same, so 3 and
+                    # 3.0 still share a tally.
+                    if raw != value:
+                        raw = value
+                    counts[raw] = counts.get(raw, 0) + 1
+        except ValueError:
+            raise ValueError('Input values should contain numbers')
+        finally:
+            # Save our progress, even if we're bailing out
+            self.n, self.sum, self._mean, self._m2 = n, sum_, mean, m2
+            self.minimum, self.maximum = min_, max_
+        return self
+
+    def _from_array(self, array, integers=None):
+        """
+        Returns a new accumulator filled from a NumPy array of floats. If
+        the numbers started out as integers, those are tallied instead.
+        """
+        numpy = numpy_backend.numpy
+        other = SummaryAccumulator(counts=self.counts is not None)
+        other.n = int(array.size)
+        other.sum = float(array.sum())
+        other.minimum = float(array.min())
+        other.maximum = float(array.max())
+        other._mean = other.sum / other.n
+        other._m2 = float(numpy.dot(array - other._mean, array - other._mean))
+        if other.counts is not None:
+            if integers is None:
+                integers = array
+            values, tallies = numpy.unique(integers, return_counts=True)
+            other.counts = dict(zip(values.tolist(), tallies.tolist()))
+        return other
+
+    def merge(self, other):
+        """
+        Combines the results of another accumulator into this one.
+
+        Returns this accumulator so calls can be chained.
+        """
+        if not other.n:
+            return self
+        if not self.n:
+            self._mean, self._m2 = other._mean, other._m2
+        else:
+            # Combine the two variances using the pairwise formula
+            # from Chan, Golub and LeVeque
+            n = self.n + other.n
+            delta = other._mean - self._mean
+            self._m2 += other._m2 + delta * delta * self.n * other.n / n
+            self._mean += delta * other.n / n
+        self.n += other.n
+        self.sum += other.sum
+        if self.minimum is None or other.minimum < self.minimum:
+            self.minimum = other.minimum
+        if self.maximum is None or other.maximum > self.maximum:
+            self.maximum = other.maximum
+        # We can only keep the tallies if both sides kept them
+        if self.counts is None or other.counts is None:
+            self.counts = None
+        else:
+            for value, count in other.counts.items():
+                self.counts[value] = self.counts.get(value, 0) + count
+        return self
+
+    def _require_counts(self):
+        if self.counts is None:
+            raise ValueError('The median and mode require an accumulator \
+created with counts=True')
+
+    @property
+    def mean(self):
+        return self.sum / self.n
+
+    @property
+    def variance(self):
+        # This is a "population" variance, like calculate.standard_deviation
+        return self._m2 / self.n
+
+    @property
+    def standard_deviation(self):
+        return math.sqrt(self.variance)
+
+    @property
+    def variation_coefficient(self):
+        return self.standard_deviation / self.mean
+
+    @property
+    def range(self):
+        # Make sure the sample has more than one entry
+        if self.n < 2:
+            raise ValueError('Input must contain at least two values. \
+            You provided a list with %s values' % self.n)
+        return self.maximum - self.minimum
+
+    @property
+    def median(self):
+        self._require_counts()
+        if not self.n:
+            raise ValueError('The median of an empty sample is undefined')
+        # Walk up through the distinct values until we reach
+        # the one or two in the middle
+        low_index = (self.n - 1) // 2
+        high_index = self.n // 2
+        low = None
+        seen = 0
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            if low is None and seen > low_index:
+                low = value
+            if seen > high_index:
+                return (float(low) + float(value)) / 2.0
+
+    @property
+    def mode(self):
+        self._require_counts()
+        # Find the highest count, following the same rules
+        # as calculate.mode when there's a tie
+        ranked = sorted(
+            [(count, value) for value, count in self.counts.items()],
+            reverse=True
+        )
+        if len(ranked) == 1:
+            return ranked[0][1]
+        if ranked[0][0] == ranked[1][0]:
+            return None
+        return ranked[0][1]
+
+    def summary(self):
+        """
+        Returns all of the statistics as a SummaryStats named tuple.
+        """
+        return SummaryStats(
+            n=self.n,
+            mean=self.mean,
+            median=self.median,
+            mode=self.mode,
+            maximum=self.maximum,
+            minimum=self.minimum,
+            range=self.range,
+            standard_deviation=self.standard_deviation,
+            variation_coefficient=self.variation_coefficient,
+        )
@@ -1,38 +1,58 @@
 from __future__ import print_function
 import calculate
 from calculate import ptable
+from calculate import querysets
 
 
-def summary_stats(data_list):
+def summary_stats(data_list, verbose=True):
     """
     Accepts a sample of numbers and returns a pretty
     print out of a variety of descriptive statistics.
+
+    The sample can be a list, a generator or any other iterable.
+    It is only read once, using calculate.SummaryAccumulator.
+
+    The statistics are also returned as a named tuple with the
+    fields n, mean, median, mode, maximum, minimum, range,
+    standard_deviation and variation_coefficient. Call its
+    _asdict() method if you'd prefer a dictionary.
+
+    To prevent the function from printing, set the optional keyword
+    argument `verbose` to False.
+
+    h3. Example usage
+
+        >> import calculate
+        >> stats = calculate.summary_stats(range(1, 101), verbose=False)
+        >> stats.median
+        50.5
+        >> stats.n
+        100
     """
-    mean = calculate.mean(data_list)
-    median = calculate.median(data_list)
-    mode = calculate.mode(data_list)
-    n = len(data_list)
-    max_ = max(data_list)
-    min_ = min(data_list)
-    range_ = calculate.range(data_list)
-    standard_deviation = calculate.standard_deviation(data_list)
-    variation_coefficient = calculate.variation_coefficient(data_list)
-
-    table = ptable.indent(
-        [
-            ['Statistic', 'Value'],
-            ['n', str(n)],
-            ['mean', str(mean)],
-            ['median', str(median)],
-            ['mode', str(mode)],
-            ['maximum', str(max_)],
-            ['minimum', str(min_)],
-            ['range', str(range_)],
-            ['standard deviation', str(standard_deviation)],
-            ['variation coefficient', str(variation_coefficient)],
-        ],
-        hasHeader=True,
-        separateRows=False,
-        prefix="| ", postfix=" |",
-    )
-    print(table)
+    # Stream querysets in a chunk at a time
+    data_list = querysets.as_numbers(data_list)
+    stats = calculate.SummaryAccumulator(data_list).summary()
+
+    # If the user has asked for verbosity,
+    # print out a table with all of the data.
+    if verbose:
+        table = ptable.indent(
+            [
+                ['Statistic', 'Value'],
+                ['n', str(stats.n)],
+                ['mean', str(stats.mean)],
+                ['median', str(stats.median)],
+                ['mode', str(stats.mode)],
+                ['maximum', str(stats.maximum)],
+                ['minimum', str(stats.minimum)],
+                ['range', str(stats.range)],
+                ['standard deviation', str(stats.standard_deviation)],
+                ['variation coefficient', str(stats.variation_coefficient)],
+            ],
+            hasHeader=True,
+            separateRows=False,
+            prefix="| ", postfix=" |",
+        )
+        print(table)
+
+    return stats
@@ -1,7 +1,10 @@
 import sys
+import random
+import itertools
 import unittest
 import calculate
 from datetime import datetime, date
+from decimal import Decimal
 from django.contrib.gis.db import models
 from django.contrib.gis.geos import Point
 try:
@@ -83,6 +86,16 @@ class CalculateTest(BaseTest):
             calculate.at_percentile([1, 2, 3, 4], 75, interpolation='higher'),
             4.0
         )
+        self.assertEqual(
+            calculate.at_percentile([4, 1, 3, 2], [25, 50, 75, 100]),
+            [1.75, 2.5, 3.25, 4.0]
+        )
+        self.assertEqual(
+            calculate.at_percentile([1, 2, 3, 4], (75,), 'lower'),
+            [3.0]
+        )
+        data = list(range(1845, 0, -1))
+        self.assertEqual(calculate.at_percentile(data, 100), 1845)
         self.assertRaises(ValueError, calculate.at_percentile, ['a', 2, 3], 75)
         self.assertRaises(
             ValueError,
@@ -93,19 +106,19 @@ class CalculateTest(BaseTest):
         )
 
     def test_benfords_law(self):
-        self.assertEqual(
+        self.assertAlmostEqual(
             calculate.benfords_law(
                 [1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
                 verbose=False
             ),
-            -0.8638019376987044
+            0.8641230464899821
         )
-        self.assertEqual(
+        self.assertAlmostEqual(
             calculate.benfords_law(
                 [1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
                 verbose=True
             ),
-            -0.8638019376987044
+            0.8641230464899821
         )
         self.assertEqual(
             calculate.benfords_law(
@@ -115,14 +128,178 @@ class CalculateTest(BaseTest):
             ),
             0
         )
+        # Negatives, fractions and scientific notation
+        self.assertAlmostEqual(
+            calculate.benfords_law(
+                [-1, 0.2, 3e-07, 4e+20, 5, 6, 7, 8, 9, 10],
+                verbose=False
+            ),
+            0.8641230464899821
+        )
+        results = calculate.benfords_law(
+            [1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
+            verbose=False,
+            details=True
+        )
+        self.assertEqual(results.method, 'first_digit')
+        self.assertEqual(results.n, 10)
+        self.assertAlmostEqual(results.chi_square, 2.3503346010548682)
+        self.assertEqual(results.degrees_of_freedom, 8)
+        self.assertAlmostEqual(results.mad, 0.04490222029510274)
+        self.assertEqual(results.conformity, 'nonconformity')
+        self.assertEqual([d.digit for d in results.digits], list(range(1, 10)))
+        self.assertEqual(results.digits[0].count, 2)
+        self.assertAlmostEqual(results.digits[0].actual, 20.0)
+        self.assertAlmostEqual(results.digits[0].z, 0.35179638779759714)
+        for method in ['second_digit', 'first_two_digits']:
+            results = calculate.benfords_law(
+                [12, 130, 0.0145, 22, 2.7, 3],
+                method=method,
+                verbose=False,
+                details=True
+            )
+            self.assertEqual(results.n, 6)
+        self.assertEqual(
+            [d.count for d in results.digits][:5],
+            [0, 0, 1, 1, 1]
+        )
         self.assertRaises(
             ValueError,
             calculate.benfords_law,
             [1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
             method='magic'
         )
+        self.assertRaises(
+            ValueError,
+            calculate.benfords_law,
+            ['foo', 'bar'],
+            verbose=False
+        )
+        self.assertRaises(
+            ValueError,
+            calculate.benfords_law,
+            [0, 0],
+            verbose=False
+        )
         self.assertRaises(TypeError, calculate.benfords_law, 10.0)
 
+    def test_benfords_law_by_group(self):
+        records = [('a', i) for i in [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]]
+        records += [('b', i) for i in [1, 1, 1, 2, 2, 3, 4, 5, 7, 9]]
+        records += [('c', i) for i in [9, 9, 9, 9, 9, 9, 9, 9, 9, 9]]
+        records += [('d', 1), ('d', 0)]
+        random.shuffle(records)
+        results = calculate.benfords_law_by_group(iter(records))
+        self.assertEqual([r.key for r in results], ['c', 'd', 'a', 'b'])
+        self.assertEqual(results[1].n, 1)
+        self.assertEqual(
+            results[2][1:],
+            calculate.benfords_law(
+                [1, 2, 3, 4, 5, 6, 7, 8, 9, 10],
+                verbose=False,
+                details=True
+            )
+        )
+        mads = [r.mad for r in results]
+        self.assertEqual(mads, sorted(mads, reverse=True))
+        self.assertEqual(results[0].conformity, 'nonconformity')
+        results = calculate.benfords_law_by_group(records, min_count=2)
+        self.assertEqual([r.key for r in results], ['c', 'a', 'b'])
+        results = calculate.benfords_law_by_group(
+            records,
+            method='last_digit'
+        )
+        self.assertEqual(len(results), 4)
+        self.assertEqual(results[-1].key, 'a')
+        self.assertEqual(results[-1].mad, 0)
+        self.assertRaises(
+            ValueError,
+            calculate.benfords_law_by_group,
+            records,
+            method='magic'
+        )
+        self.assertRaises(
+            ValueError,
+            calculate.benfords_law_by_group,
+            [('a', 'foo')]
+        )
+
+    def test_benford_digits(self):
+        from calculate import benford
+        self.assertAlmostEqual(sum(benford.FIRST_DIGIT_EXPECTED), 1)
+        self.assertAlmostEqual(sum(benford.SECOND_DIGIT_EXPECTED), 1)
+        self.assertAlmostEqual(sum(benford.FIRST_TWO_DIGITS_EXPECTED), 1)
+        self.assertEqual(benford.significant_digits(0.3), 30)
+        self.assertEqual(benford.significant_digits(-0.07), 70)
+        self.assertEqual(benford.significant_digits(1e-310), 10)
+        self.assertEqual(benford.significant_digits(4.56e+200), 45)
+        self.assertEqual(benford.significant_digits(0), None)
+        self.assertEqual(benford.significant_digits(float('nan')), None)
+        # Digits are exact, even next to a power of ten
+        self.assertEqual(benford.significant_digits(1999999999.99), 19)
+        self.assertEqual(benford.significant_digits('1999999999.99'), 19)
+        self.assertEqual(benford.significant_digits(99.99999999999), 99)
+        self.assertEqual(benford.significant_digits(10 ** 400 - 1), 99)
+        self.assertEqual(benford.significant_digits(Decimal('0.0099')), 99)
+        self.assertEqual(benford.last_digit(12345678901234567), 7)
+        # The units digit, not the last one printed
+        self.assertEqual(benford.last_digit(29.5), 9)
+        self.assertEqual(benford.last_digit(12.75), 2)
+        self.assertEqual(benford.last_digit(float('inf')), None)
+        counts = benford.DigitCounts([12, 0.0012, '450', 0])
+        self.assertEqual(counts.counts('first_digit')[:4], [2, 0, 0, 1])
+        self.assertEqual(counts.counts('second_digit')[:3], [0, 0, 2])
+        self.assertEqual(counts.last[0], 3)
+        counts.merge(benford.DigitCounts([19]))
+        self.assertEqual(counts.counts('first_digit')[0], 3)
+        counts = benford.DigitCounts([1999999999.99, 10 ** 400, 2.5])
+        self.assertEqual(counts.first_two[19], 1)
+        self.assertEqual(counts.first_two[20], 0)
+        self.assertEqual(counts.first_two[10], 1)
+        self.assertEqual(counts.first_two[25], 1)
+        try:
+            import numpy
+        except ImportError:
+            return
+        data_list = [random.lognormvariate(3, 3) for i in range(1000)]
+        data_list += [0, -0.3, 1e-310, float('inf'), 1999999999.99, 100.0]
+        self.assertEqual(
+            benford.DigitCounts(numpy.array(data_list)).first_two,
+            benford.DigitCounts(data_list).first_two
+        )
+        self.assertEqual(
+            benford.DigitCounts(numpy.array(data_list)).last,
+            benford.DigitCounts(data_list).last
+        )
+
+        # Integers too big for a float keep all their digits
+        int_list = [2 ** 62 + 1, 9007199254740993, -17, -2 ** 63]
+        counts = benford.DigitCounts(numpy.array(int_list, dtype=numpy.int64))
+        self.assertEqual(counts.last, benford.DigitCounts(int_list).last)
+        self.assertEqual(counts.last[5], 1)
+        self.assertEqual(counts.last[3], 1)
+        int_list = [9999999999999999999]
+        counts = benford.DigitCounts(numpy.array(int_list, dtype=numpy.uint64))
+        self.assertEqual(counts.first_two[99], 1)
+        self.assertEqual(counts.last[9], 1)
+
+    def test_breakpoint_bins(self):
+        bins = calculate.breakpoint_bins(
+            (i for i in [1, 7, 30, 12, 13]),
+            [1, 7, 13, 30]
+        )
+        self.assertEqual(list(bins), [0, 1, 2, 1, 2])
+        self.assertEqual(
+            list(calculate.breakpoint_bins([5, 0], [0, 10])),
+            [0, 0]
+        )
+        self.assertRaises(ValueError, calculate.breakpoint_bins, [1], [1])
+        self.assertRaises(
+            ValueError,
+            list,
+            calculate.breakpoint_bins([11], [0, 10])
+        )
+
     def test_competition_rank(self):
         dict_list = [
             {'name': 'Joan', 'value': 1},
@@ -222,6 +399,55 @@ class CalculateTest(BaseTest):
             'foobar'
         )
 
+    def test_competition_ranks(self):
+        dict_list = [
+            {'name': 'Joan', 'value': 1},
+            {'name': 'Jane', 'value': 2},
+            {'name': 'Mary', 'value': 2},
+            {'name': 'Josh', 'value': 3},
+        ]
+        self.assertEqual(
+            calculate.competition_ranks(dict_list, 'value'),
+            [4, 2, 2, 1]
+        )
+        self.assertEqual(
+            calculate.competition_ranks(dict_list, 'value', 'asc'),
+            [1, 2, 2, 4]
+        )
+        self.assertEqual(
+            calculate.competition_ranks(dict_list, lambda x: 3),
+            [1, 1, 1, 1]
+        )
+        self.assertEqual(calculate.competition_ranks([], 'value'), [])
+
+        class DummyObj():
+            def __init__(self, **entries):
+                self.__dict__.update(entries)
+
+        obj_list = [DummyObj(**d) for d in dict_list]
+        ranker = calculate.CompetitionRanker(obj_list, 'value', 'asc')
+        self.assertEqual(len(ranker), 4)
+        self.assertEqual(ranker.ranks(), [1, 2, 2, 4])
+        self.assertEqual(ranker.rank(obj_list[2]), 2)
+        self.assertEqual(ranker.rank_value(2.5), 4)
+        self.assertEqual(ranker.rank_value(0), 1)
+        for i, obj in enumerate(obj_list):
+            self.assertEqual(
+                ranker.rank(obj),
+                calculate.competition_rank(obj_list, obj, 'value', 'asc')
+            )
+        self.assertEqual(
+            calculate.competition_rank(obj_list, DummyObj(value=2), 'value'),
+            None
+        )
+        self.assertRaises(
+            ValueError,
+            calculate.competition_ranks,
+            dict_list,
+            'value',
+            'foobar'
+        )
+
     def test_date_range(self):
         dr = calculate.date_range(
             datetime(2009, 1, 1, 12, 31, 0),
@@ -290,6 +516,244 @@ class CalculateTest(BaseTest):
             list(range(1, 101)),
             'a'
         )
+        self.assertEqual(
+            calculate.equal_sized_breakpoints([1, 2], 2),
+            [1.0, 2.0, 2.0]
+        )
+        self.assertEqual(
+            calculate.equal_sized_breakpoints([1, 2], 3),
+            [1.0, 1.6666666666666665, 2.0, 2.0]
+        )
+        data_list = [5, 3, 1, 4, 2]
+        calculate.equal_sized_breakpoints(data_list, 2)
+        self.assertEqual(data_list, [5, 3, 1, 4, 2])
+
+    def test_jenks_breakpoints(self):
+        data_list = [22, 1, 2, 3, 10, 11, 12, 20, 21]
+        self.assertEqual(
+            calculate.jenks_breakpoints(data_list, 3),
+            [1.0, 10.0, 20.0, 22.0]
+        )
+        self.assertEqual(data_list, [22, 1, 2, 3, 10, 11, 12, 20, 21])
+        self.assertEqual(
+            calculate.jenks_breakpoints(data_list, 1),
+            [1.0, 22.0]
+        )
+        # More classes than values
+        self.assertEqual(
+            calculate.jenks_breakpoints([1, 1, 2], 5),
+            [1.0, 2.0, 2.0]
+        )
+        # Check against every possible set of breaks
+        rand = random.Random(0)
+        for i in range(50):
+            data_list = [rand.randint(0, 30) for j in range(10)]
+            classes = rand.randint(2, 4)
+            unique = sorted(set(data_list))
+            if len(unique) < classes:
+                continue
+
+            def variance(breaks):
+                groups = calculate.split_at_breakpoints(data_list, breaks)
+                return sum(
+                    sum((v - calculate.mean(g)) ** 2 for v in g)
+                    for g in groups if g
+                )
+            best = min(
+                variance([unique[0]] + list(cuts) + [unique[-1]])
+                for cuts in itertools.combinations(unique[1:], classes - 1)
+            )
+            self.assertAlmostEqual(
+                variance(calculate.jenks_breakpoints(data_list, classes)),
+                best
+            )
+        # Big lists are sampled, but keep their ends
+        data_list = list(range(100000))
+        breaks = calculate.jenks_breakpoints(data_list, 4, seed=1)
+        self.assertEqual(len(breaks), 5)
+        self.assertEqual(breaks[0], 0)
+        self.assertEqual(breaks[-1], 99999)
+        self.assertRaises(
+            ValueError,
+            calculate.jenks_breakpoints,
+            ['foo', 'bar', 'baz'],
+            2
+        )
+        self.assertRaises(ValueError, calculate.jenks_breakpoints, [], 2)
+        self.assertRaises(ValueError, calculate.jenks_breakpoints, [1, 2], 0)
+
+    def test_equal_interval_breakpoints(self):
+        self.assertEqual(
+            calculate.equal_interval_breakpoints([0, 1, 2, 10], 5),
+            [0.0, 2.0, 4.0, 6.0, 8.0, 10.0]
+        )
+        self.assertEqual(
+            calculate.equal_interval_breakpoints([3, 3], 2),
+            [3.0, 3.0, 3.0]
+        )
+        self.assertRaises(
+            ValueError,
+            calculate.equal_interval_breakpoints,
+            ['foo', 'bar', 'baz'],
+            2
+        )
+        self.assertRaises(
+            ValueError,
+            calculate.equal_interval_breakpoints,
+            [1, 2],
+            0
+        )
+
+    def test_standard_deviation_breakpoints(self):
+        data_list = [2, 4, 4, 4, 5, 5, 7, 9]
+        self.assertEqual(
+            calculate.standard_deviation_breakpoints(data_list, 4),
+            [2.0, 3.0, 5.0, 7.0, 9.0]
+        )
+        self.assertEqual(
+            calculate.standard_deviation_breakpoints(data_list, 3),
+            [2.0, 4.0, 6.0, 9.0]
+        )
+        # Breaks past the ends are dropped
+        self.assertEqual(
+            calculate.standard_deviation_breakpoints(data_list, 8),
+            [2.0, 3.0, 5.0, 7.0, 9.0]
+        )
+        self.assertRaises(
+            ValueError,
+            calculate.standard_deviation_breakpoints,
+            [],
+            2
+        )
+
+    def test_head_tail_breakpoints(self):
+        data_list = [1, 1, 1, 2, 2, 3, 4, 8, 16, 64]
+        self.assertEqual(
+            calculate.head_tail_breakpoints(data_list),
+            [1.0, 10.2, 40.0, 64.0]
+        )
+        self.assertEqual(
+            calculate.head_tail_breakpoints(data_list, 2),
+            [1.0, 10.2, 64.0]
+        )
+        self.assertEqual(
+            calculate.head_tail_breakpoints([5, 5, 5]),
+            [5.0, 5.0]
+        )
+        self.assertRaises(
+            ValueError,
+            calculate.head_tail_breakpoints,
+            ['foo', 'bar', 'baz']
+        )
+
+    def test_classify(self):
+        data_list = [1, 2, 3, 10, 11, 12, 20, 21, 22]
+        breaks = calculate.classify(data_list, 3)
+        self.assertEqual(breaks, [1.0, 10.0, 20.0, 22.0])
+        self.assertEqual(
+            calculate.split_at_breakpoints(data_list, breaks),
+            [[1, 2, 3], [10, 11, 12], [20, 21, 22]]
+        )
+        for method in ['jenks', 'equal_sized', 'equal_interval',
+                       'standard_deviation', 'head_tail']:
+            breaks = calculate.classify(data_list, 4, method=method)
+            self.assertEqual(breaks, sorted(breaks))
+            self.assertEqual(breaks[0], 1)
+            self.assertEqual(breaks[-1], 22)
+            groups = calculate.split_at_breakpoints(data_list, breaks)
+            self.assertEqual(sum(len(g) for g in groups), len(data_list))
+        self.assertEqual(
+            calculate.classify(data_list, 2, method='equal_interval'),
+            calculate.equal_interval_breakpoints(data_list, 2)
+        )
+        self.assertRaises(
+            ValueError,
+            calculate.classify,
+            data_list,
+            3,
+            method='foo'
+        )
+
+    def test_geometry(self):
+        from calculate import geometry
+        tuples = [
+            (-118.245517015, 34.0525260849),
+            (-118.245015, 34.051007),
+            (-118.2430171966, 34.0535749927),
+        ]
+        center = calculate.mean_center(tuples)
+        self.assertEqual(type(center), geometry.XY)
+        self.assertEqual(
+            '%.16f %.16f' % center,
+            '-118.2445164038666690 34.0523693591999930'
+        )
+        dict_list = [{'point': p} for p in tuples]
+        self.assertEqual(calculate.mean_center(dict_list), center)
+        coords = calculate.Coordinates(
+            [p[0] for p in tuples],
+            [p[1] for p in tuples]
+        )
+        self.assertEqual(calculate.mean_center(coords), center)
+        self.assertEqual(list(coords)[1], geometry.XY(-118.245015, 34.051007))
+        self.assertRaises(
+            ValueError,
+            calculate.Coordinates,
+            [1, 2],
+            [1]
+        )
+        self.assertRaises(ValueError, calculate.mean_center, [])
+        self.assertEqual(geometry.XY(0, 0).distance((3, 4)), 5)
+        self.assertEqual(geometry.is_geos((1, 2)), False)
+
+        tuples[0] = (-118.2455170154, 34.0525260849)
+        self.assertEqual(
+            calculate.standard_deviation_distance(tuples),
+            0.0003720200725858596
+        )
+        self.assertEqual(
+            calculate.standard_deviation_distance(
+                [geometry.XY(*p) for p in tuples]
+            ),
+            0.0003720200725858596
+        )
+        try:
+            import numpy
+        except ImportError:
+            return
+        coords = calculate.Coordinates(
+            numpy.array([p[0] for p in tuples]),
+            numpy.array([p[1] for p in tuples])
+        )
+        self.assertAlmostEqual(
+            calculate.standard_deviation_distance(coords),
+            0.0003720200725858596
+        )
+        self.assertAlmostEqual(calculate.mean_center(coords).y, 34.0523693592)
+
+    def test_lazy_imports(self):
+        import subprocess
+        self.assertEqual(calculate.mean.__name__, 'mean')
+        self.assertEqual(calculate.range([1, 3]), 2)
+        self.assertEqual(calculate.QuantileSketch.__name__, 'QuantileSketch')
+        self.assertTrue('median' in dir(calculate))
+        self.assertTrue(
+            set(calculate.DJANGO_MODULES) <= set(calculate.__all__)
+        )
+        self.assertRaises(AttributeError, getattr, calculate, 'foo')
+        namespace = {}
+        exec('from calculate import *', namespace)
+        self.assertEqual(namespace['median'], calculate.median)
+        if sys.version_info < (3, 7):
+            return
+        # Nothing, Django included, is loaded until it's used
+        output = subprocess.check_output([
+            sys.executable,
+            '-c',
+            'import sys, calculate; '
+            'print(sorted(m for m in sys.modules '
+            'if m.startswith("calculate.") or m == "django"))'
+        ])
+        self.assertEqual(output.strip(), b'[]')
 
     def test_margin_of_victory(self):
         self.assertEqual(
@@ -354,12 +818,153 @@ class CalculateTest(BaseTest):
             'POINT (-118.2445164038666690 34.0523693591999930)'
         )
 
+    def test_mean_centers(self):
+        from calculate import geometry
+        tuples = [
+            (-118.245517015, 34.0525260849),
+            (-118.245015, 34.051007),
+            (-118.2430171966, 34.0535749927),
+        ]
+        # Without groups or weights it matches mean_center exactly
+        self.assertEqual(
+            calculate.mean_centers(tuples),
+            {None: calculate.mean_center(tuples)}
+        )
+        records = [
+            {'point': (0, 0), 'district': 1, 'population': 1},
+            {'point': (2, 4), 'district': 1, 'population': 3},
+            {'point': (10, 10), 'district': 2, 'population': 5},
+            {'point': (0, 0), 'district': 2, 'population': 0},
+        ]
+        centers = calculate.mean_centers(
+            records,
+            group_by='district',
+            weight='population'
+        )
+        self.assertEqual(centers, {
+            1: geometry.XY(1.5, 3.0),
+            2: geometry.XY(10.0, 10.0),
+        })
+        centers = calculate.mean_centers(
+            iter(records),
+            group_by=lambda r: r['district'] % 2
+        )
+        self.assertEqual(centers[1], geometry.XY(1.0, 2.0))
+        self.assertEqual(centers[0], geometry.XY(5.0, 5.0))
+        self.assertRaises(ValueError, calculate.mean_centers, [])
+        self.assertRaises(
+            ValueError,
+            calculate.mean_centers,
+            records[3:],
+            weight='population'
+        )
+
+        # The standard deviation distance can reuse the same pass
+        points = [(0, 0), (0, 2), (2, 0)]
+        self.assertEqual(
+            calculate.standard_deviation_distance(points, weight=lambda p: 1),
+            calculate.standard_deviation_distance(points)
+        )
+        self.assertAlmostEqual(
+            calculate.standard_deviation_distance(
+                points,
+                weight=lambda p: 2 if p == (0, 0) else 1
+            ),
+            calculate.standard_deviation_distance([(0, 0)] + points)
+        )
+        self.assertEqual(
+            calculate.standard_deviation_distance(
+                records,
+                group_by='district'
+            ),
+            {1: 0.0, 2: 0.0}
+        )
+        spread = calculate.standard_deviation_distance(
+            [{'point': p, 'group': 'a'} for p in points] +
+            [{'point': (5, 5), 'group': 'b'}],
+            group_by='group'
+        )
+        self.assertEqual(spread['a'], 0.2582839244818621)
+        self.assertEqual(spread['b'], 0.0)
+
     def test_median(self):
         self.assertEqual(calculate.median([1, 3, 2]), 2.0)
         self.assertEqual(calculate.median([1, 2, 3, 4]), 2.5)
         self.assertRaises(TypeError, calculate.median, [None, 1, 2])
         self.assertRaises(ValueError, calculate.median, ['a', 1, 2])
 
+    def test_mmap_column(self):
+        import os
+        import tempfile
+        from array import array
+        from calculate import columns, numpy_backend
+        values = [random.uniform(-100, 100) for i in range(5000)]
+        integers = [random.randint(-100, 100) for i in range(5000)]
+        directory = tempfile.mkdtemp()
+        try:
+            path = os.path.join(directory, 'floats.bin')
+            with open(path, 'wb') as f:
+                array('d', values).tofile(f)
+            int_path = os.path.join(directory, 'integers.bin')
+            with open(int_path, 'wb') as f:
+                array('q', integers).tofile(f)
+            bad_path = os.path.join(directory, 'bad.bin')
+            with open(bad_path, 'wb') as f:
+                f.write(b'12345')
+            empty_path = os.path.join(directory, 'empty.bin')
+            open(empty_path, 'wb').close()
+
+            column = calculate.mmap_column(path)
+            int_column = calculate.mmap_column(int_path, typecode='q')
+            self.assertEqual(list(column), values)
+            self.assertEqual(list(int_column), integers)
+            self.assertRaises(ValueError, calculate.mmap_column, bad_path)
+            self.assertEqual(len(calculate.mmap_column(empty_path)), 0)
+
+            # Same answers as the lists, with and without NumPy
+            funcs = [
+                calculate.mean,
+                calculate.median,
+                calculate.standard_deviation,
+                calculate.range,
+                calculate.elfi,
+                lambda x: calculate.percentile(x, 3),
+                lambda x: calculate.percentile(x, 3, kind='mean'),
+                lambda x: calculate.at_percentile(x, [10, 50, 99.5]),
+                lambda x: calculate.pearson(x, x[::-1]),
+            ]
+            try:
+                for enabled in [True, False]:
+                    numpy_backend.ENABLED = enabled
+                    for func in funcs:
+                        for data, raw in [(column, values),
+                                          (int_column, integers)]:
+                            expected = func(raw)
+                            result = func(data)
+                            # NumPy adds up in a different order, so allow
+                            # for rounding on the big integer sums
+                            if not isinstance(expected, list):
+                                expected, result = [expected], [result]
+                            for a, b in zip(result, expected):
+                                self.assertAlmostEqual(
+                                    a, b, delta=1e-12 * max(1, abs(b))
+                                )
+                    self.assertEqual(type(calculate.median(int_column)), float)
+            finally:
+                numpy_backend.ENABLED = True
+            del column, int_column
+        finally:
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+            os.rmdir(directory)
+
+        # Buffers are read in place, anything else becomes a list of floats
+        data = array('i', [3, 1, 2])
+        self.assertEqual(type(columns.floats(data)), memoryview)
+        self.assertEqual(columns.floats(['1', 2]), [1.0, 2.0])
+        self.assertEqual(columns.as_view(b'') is not None, True)
+        self.assertEqual(columns.as_view([1, 2]), None)
+
     def test_mode(self):
         self.assertEqual(calculate.mode([1, 2, 3, 2]), 2.0)
         self.assertEqual(calculate.mode([1, 2, 3]), None)
@@ -385,6 +990,89 @@ class CalculateTest(BaseTest):
         self.assertTrue(l2[0].point != l2[1].point)
         self.assertTrue(l[2].point == l2[2].point)
 
+        l = [{'point': (1, 1)}, {'point': (0, 0)}, {'point': (0, 0)}]
+        l2 = calculate.nudge_points(l, keep_order=True)
+        self.assertEqual(l2[0]['point'], (1, 1))
+        self.assertEqual(l2[1]['point'], (0, 0))
+        self.assertNotEqual(l2[2]['point'], (0, 0))
+        self.assertAlmostEqual(l2[2]['point'].distance((0, 0)), 0.0001)
+        # By default they come back sorted by where they started
+        l = [{'point': (1, 1)}, {'point': (0, 0)}, {'point': (0, 0)}]
+        l2 = calculate.nudge_points(l)
+        self.assertEqual([l[1], l[2], l[0]], l2)
+        self.assertEqual(l2[0]['point'], (0, 0))
+        self.assertNotEqual(l2[1]['point'], (0, 0))
+        self.assertEqual(l2[2]['point'], (1, 1))
+        l2 = calculate.nudge_points([(0, 0), (0, 0)], radius=1)
+        self.assertEqual(l2[0], (0, 0))
+        self.assertAlmostEqual(l2[1].distance(l2[0]), 1)
+
+        # Duplicates are spread evenly, so none of them collide
+        points = [(5, 5)] * 7 + [(1, 1)]
+        l2 = calculate.nudge_points(points, radius=1, keep_order=True)
+        self.assertEqual(l2[0], (5, 5))
+        self.assertEqual(l2[-1], (1, 1))
+        self.assertEqual(calculate.nudge_points(points)[0], (1, 1))
+        self.assertEqual(len(set(l2)), len(points))
+        for a, b in zip(l2[1:7], l2[2:7]):
+            self.assertAlmostEqual(a.distance(b), 1)
+        self.assertEqual(
+            calculate.nudge_points(points, seed=3),
+            calculate.nudge_points(points, seed=3)
+        )
+
+        # Changed points only, with a tolerance
+        l = [
+            {'point': (0, 0)},
+            {'point': (2, 2)},
+            {'point': (0.00001, 0)},
+        ]
+        self.assertEqual(calculate.nudge_points(l, changed_only=True), [])
+        moved = calculate.nudge_points(l, tolerance=0.001, changed_only=True)
+        self.assertEqual(moved, [l[2]])
+        self.assertAlmostEqual(moved[0]['point'].x, 0.0001)
+        self.assertRaises(ValueError, calculate.nudge_points, l, tolerance=0)
+
+    def test_numpy_backend(self):
+        from array import array
+        from calculate import numpy_backend
+        one = array('d', [1.5, 2, 3, -4, 5.25, 3])
+        two = array('i', [6, 5, 2, 9, 1, 1])
+        funcs = [
+            calculate.mean,
+            calculate.median,
+            calculate.standard_deviation,
+            calculate.range,
+            calculate.variation_coefficient,
+            calculate.elfi,
+        ]
+        try:
+            for func in funcs:
+                numpy_backend.ENABLED = True
+                fast = func(one)
+                numpy_backend.ENABLED = False
+                self.assertAlmostEqual(fast, func(one))
+            numpy_backend.ENABLED = True
+            fast = calculate.pearson(one, two)
+            numpy_backend.ENABLED = False
+            self.assertAlmostEqual(fast, calculate.pearson(one, two))
+        finally:
+            numpy_backend.ENABLED = True
+        self.assertRaises(ValueError, calculate.range, array('d', [1]))
+        self.assertRaises(
+            ValueError,
+            calculate.pearson,
+            array('d', [1]),
+            array('d', [1, 2, 3])
+        )
+        if numpy_backend.HAS_NUMPY:
+            self.assertEqual(numpy_backend.as_array([1, 2, 3]), None)
+            self.assertEqual(numpy_backend.as_array(array('d')), None)
+            self.assertEqual(
+                list(numpy_backend.as_array(array('l', [1, 2]))),
+                [1.0, 2.0]
+            )
+
     def test_ordinal_rank(self):
         dict_list = [
             {'name': 'Joan', 'value': 1},
@@ -461,6 +1149,119 @@ class CalculateTest(BaseTest):
             direction='foobar',
         )
 
+    def test_ordinal_ranks(self):
+        dict_list = [
+            {'name': 'Joan', 'value': 1},
+            {'name': 'Jane', 'value': 2},
+            {'name': 'Mary', 'value': 2},
+            {'name': 'Josh', 'value': 3},
+        ]
+        self.assertEqual(calculate.ordinal_ranks(dict_list), [1, 2, 3, 4])
+        self.assertEqual(
+            calculate.ordinal_ranks(dict_list, 'value'),
+            [4, 2, 3, 1]
+        )
+        self.assertEqual(
+            calculate.ordinal_ranks(dict_list, 'value', 'asc'),
+            [1, 2, 3, 4]
+        )
+        self.assertEqual(
+            calculate.ordinal_ranks(dict_list, lambda x: -x['value']),
+            [1, 2, 3, 4]
+        )
+        self.assertEqual(calculate.ordinal_ranks([], 'value'), [])
+
+        class DummyObj():
+            def __init__(self, **entries):
+                self.__dict__.update(entries)
+
+        obj_list = [DummyObj(**d) for d in dict_list]
+        ranks = calculate.ordinal_ranks(obj_list, 'value')
+        for obj, rank in zip(obj_list, ranks):
+            self.assertEqual(
+                rank,
+                calculate.ordinal_rank(obj_list, obj, 'value')
+            )
+        self.assertRaises(
+            ValueError,
+            calculate.ordinal_ranks,
+            obj_list,
+            order_by='value',
+            direction='foobar',
+        )
+
+    def test_parallel(self):
+        from calculate import parallel
+        data_list = [random.random() for i in range(1000)]
+        list_two = [i + random.random() for i in data_list]
+        funcs = [
+            'mean',
+            'standard_deviation',
+            'variation_coefficient',
+            'range',
+            'elfi',
+        ]
+        # Small samples run in this process
+        for name in funcs:
+            self.assertEqual(
+                getattr(parallel, name)(data_list),
+                getattr(calculate, name)(data_list)
+            )
+        self.assertEqual(
+            parallel.pearson(data_list, list_two),
+            calculate.pearson(data_list, list_two)
+        )
+        self.assertRaises(ValueError, parallel.mean, data_list, workers=0)
+        if not parallel.HAS_SHARED_MEMORY or \
+                not calculate.numpy_backend.HAS_NUMPY:
+            return
+        # Shrink the chunks so the pool kicks in
+        min_chunk_size = parallel.MIN_CHUNK_SIZE
+        parallel.MIN_CHUNK_SIZE = 100
+        try:
+            for name in funcs:
+                self.assertAlmostEqual(
+                    getattr(parallel, name)(data_list, workers=3),
+                    getattr(calculate, name)(data_list)
+                )
+            self.assertAlmostEqual(
+                parallel.pearson(data_list, list_two, workers=3),
+                calculate.pearson(data_list, list_two)
+            )
+            self.assertRaises(
+                ValueError,
+                parallel.pearson,
+                data_list,
+                list_two[:-1],
+                workers=3
+            )
+            self.assertRaises(
+                ValueError,
+                parallel.mean,
+                ['foo'] * 1000,
+                workers=3
+            )
+            # The pool is started once and kept for the next call
+            pool = parallel._pool
+            self.assertTrue(pool is not None)
+            parallel.standard_deviation(data_list, workers=2)
+            self.assertTrue(parallel._pool is pool)
+            # Or bring your own
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=2) as executor:
+                self.assertAlmostEqual(
+                    parallel.mean(data_list, workers=2, executor=executor),
+                    calculate.mean(data_list)
+                )
+            parallel.shutdown()
+            self.assertTrue(parallel._pool is None)
+            # Samples too small to split up are never converted
+            parallel.MIN_CHUNK_SIZE = 10000
+            self.assertEqual(parallel._as_array(data_list, 3), None)
+        finally:
+            parallel.MIN_CHUNK_SIZE = min_chunk_size
+            parallel.shutdown()
+
     def test_pearson(self):
         students = [
             dict(sat=1200, gpa=3.6, drinks_per_day=0.3),
@@ -468,21 +1269,111 @@ class CalculateTest(BaseTest):
             dict(sat=1100, gpa=3.0, drinks_per_day=0.5),
             dict(sat=800, gpa=2.5,  drinks_per_day=2.0),
         ]
-        self.assertEqual(
+        self.assertAlmostEqual(
             calculate.pearson(
                 [i.get("sat") for i in students],
                 [i.get("gpa") for i in students],
             ),
             0.9714441330841945
         )
-        self.assertEqual(
+        self.assertAlmostEqual(
             calculate.pearson(
                 [i.get("sat") for i in students],
                 [i.get("drinks_per_day") for i in students],
             ),
             -0.9435297685685435
         )
+        self.assertAlmostEqual(
+            calculate.pearson(
+                (i.get("sat") for i in students),
+                (i.get("gpa") for i in students),
+            ),
+            0.9714441330841945
+        )
+        self.assertEqual(calculate.pearson([1, 1], [1, 2]), 0)
         self.assertRaises(ValueError, calculate.pearson, [1], [1, 2, 3])
+        self.assertRaises(
+            ValueError,
+            calculate.pearson,
+            iter([1, 2, 3]),
+            iter([1, 2])
+        )
+        self.assertRaises(ValueError, calculate.pearson, ['a'], ['b'])
+
+    def test_pearson_accumulator(self):
+        acc = calculate.PearsonAccumulator([6, 5, 2], [2, 5, 6])
+        self.assertEqual(acc.n, 3)
+        self.assertAlmostEqual(acc.r, -0.8461538461538461)
+        self.assertAlmostEqual(acc.covariance, -22 / 9.0)
+        acc.add(1, 8)
+        self.assertAlmostEqual(acc.r, calculate.pearson([6, 5, 2, 1],
+                                                        [2, 5, 6, 8]))
+        self.assertAlmostEqual(acc.covariance, -4.125)
+        # Merging chunks gives the same answer as one big pass
+        one = [random.gauss(0, 1) for i in range(500)]
+        two = [i * 2 + random.gauss(0, 1) for i in one]
+        whole = calculate.PearsonAccumulator(one, two)
+        merged = calculate.PearsonAccumulator()
+        for i in range(0, 500, 123):
+            merged.merge(
+                calculate.PearsonAccumulator(one[i:i + 123], two[i:i + 123])
+            )
+        merged.merge(calculate.PearsonAccumulator())
+        self.assertEqual(merged.n, 500)
+        self.assertAlmostEqual(merged.r, whole.r)
+        self.assertAlmostEqual(merged.covariance, whole.covariance)
+        # Big values don't lose precision
+        one = [1e9 + i for i in range(1000)]
+        two = [1e9 + (i % 7) for i in range(1000)]
+        self.assertAlmostEqual(
+            calculate.pearson(one, two),
+            0.004337175778045049,
+            places=14
+        )
+        self.assertEqual(calculate.PearsonAccumulator().r, 0)
+
+    def test_pearson_matrix(self):
+        from calculate import numpy_backend
+        columns = {
+            'sat': [1200, 1400, 1100, 800],
+            'gpa': [3.6, 3.9, 3.0, 2.5],
+            'drinks_per_day': [0.3, 0.1, 0.5, 2.0],
+            'tests': [1, 1, 1, 1],
+        }
+        try:
+            for enabled in [True, False]:
+                numpy_backend.ENABLED = enabled
+                matrix = calculate.pearson_matrix(columns)
+                self.assertEqual(sorted(matrix), sorted(columns))
+                for one in columns:
+                    for two in columns:
+                        self.assertAlmostEqual(
+                            matrix[one][two],
+                            calculate.pearson(columns[one], columns[two])
+                        )
+                self.assertAlmostEqual(matrix['sat']['gpa'],
+                                       0.9714441330841945)
+                self.assertEqual(matrix['tests']['sat'], 0)
+                # Generators work too
+                matrix = calculate.pearson_matrix([
+                    ('sat', (i for i in columns['sat'])),
+                    ('gpa', (i for i in columns['gpa'])),
+                ])
+                self.assertAlmostEqual(matrix['gpa']['sat'],
+                                       0.9714441330841945)
+                self.assertRaises(
+                    ValueError,
+                    calculate.pearson_matrix,
+                    {'a': [1, 2, 3], 'b': [1, 2]}
+                )
+                self.assertRaises(
+                    ValueError,
+                    calculate.pearson_matrix,
+                    {'a': [1, 2], 'b': ['foo', 'bar']}
+                )
+        finally:
+            numpy_backend.ENABLED = True
+        self.assertEqual(calculate.pearson_matrix({}), {})
 
     def test_per_capita(self):
         self.assertEqual(calculate.per_capita(12, 100000), 1.2)
@@ -546,6 +1437,56 @@ class CalculateTest(BaseTest):
             kind='mystery-meat'
         )
 
+    def test_percentile_index(self):
+        index = calculate.PercentileIndex([4, 3, 1, 3, 2])
+        self.assertEqual(len(index), 5)
+        self.assertEqual(index.percentile(3), 80)
+        self.assertEqual(index.percentile(3, kind='strict'), 40)
+        self.assertEqual(index.percentile(3, kind='mean'), 60)
+        self.assertEqual(index.percentile(0), 0)
+        self.assertEqual(index.percentile(10), 100)
+        self.assertEqual(calculate.percentile(index, 3, kind='strict'), 40)
+        self.assertEqual(calculate.decile(index, 3), 9)
+        for kind in ['strict', 'weak', 'mean']:
+            for value in [0, 1, 2.5, 3, 4, 5]:
+                self.assertEqual(
+                    index.percentile(value, kind=kind),
+                    calculate.percentile([1, 2, 3, 3, 4], value, kind=kind)
+                )
+        self.assertRaises(ValueError, calculate.PercentileIndex, ['a', 2, 3])
+        self.assertRaises(
+            ValueError,
+            index.percentile,
+            3,
+            kind='mystery-meat'
+        )
+
+    def test_percentile_many(self):
+        self.assertEqual(
+            calculate.percentile_many([1, 2, 3, 3, 4], [1, 3, 4]),
+            [20, 80, 100]
+        )
+        self.assertEqual(
+            calculate.percentile_many(
+                [1, 2, 3, 3, 4],
+                [1, 3, 4],
+                kind='strict'
+            ),
+            [0, 40, 80]
+        )
+        index = calculate.PercentileIndex([1, 2, 3, 3, 4])
+        self.assertEqual(
+            calculate.percentile_many(index, [3], kind='mean'),
+            [60]
+        )
+        self.assertRaises(
+            ValueError,
+            calculate.percentile_many,
+            [1, 2, 3, 4],
+            [3],
+            kind='mystery-meat'
+        )
+
     def test_per_sqmi(self):
         self.assertEqual(calculate.per_sqmi(12, 60), 0.2)
         self.assertEqual(calculate.per_sqmi(12, 0), None)
@@ -561,6 +1502,192 @@ class CalculateTest(BaseTest):
         from calculate import ptable
         ptable.indent(['foo', 'bar'])
 
+    def test_querysets(self):
+        from calculate import querysets
+        self.assertEqual(querysets.is_queryset([1, 2, 3]), False)
+        self.assertEqual(querysets.is_queryset(iter([1, 2, 3])), False)
+
+        # Plain lists take the Python path, whatever the switch says
+        dict_list = [{'value': 1}, {'value': 2}, {'value': 2}]
+        try:
+            for enabled in [True, False]:
+                querysets.ENABLED = enabled
+                self.assertEqual(
+                    calculate.competition_ranks(dict_list, 'value'),
+                    [3, 1, 1]
+                )
+                self.assertEqual(
+                    calculate.ordinal_ranks(dict_list, 'value'),
+                    [3, 1, 2]
+                )
+        finally:
+            querysets.ENABLED = True
+
+    def test_querysets_ranks(self):
+        from django.db import connection
+        from calculate import querysets
+
+        class QuerysetPlayer(models.Model):
+            name = models.CharField(max_length=30)
+            home_runs = models.IntegerField()
+
+        with connection.schema_editor() as editor:
+            editor.create_model(QuerysetPlayer)
+        try:
+            # Out of order, with ties, so the primary keys don't
+            # follow the names or the home runs
+            for name, home_runs in [
+                ('Ruth', 714),
+                ('Aaron', 755),
+                ('Mays', 660),
+                ('Bonds', 762),
+                ('Griffey', 660),
+                ('Pujols', 714),
+                ('Sosa', 609),
+            ]:
+                QuerysetPlayer.objects.create(name=name, home_runs=home_runs)
+            qs = QuerysetPlayer.objects.all()
+
+            # Querysets without an ordering are ranked in primary key order
+            for enabled in [True, False]:
+                querysets.ENABLED = enabled
+                self.assertEqual(
+                    calculate.competition_ranks(qs, 'home_runs'),
+                    [3, 2, 5, 1, 5, 3, 7]
+                )
+                self.assertEqual(
+                    calculate.ordinal_ranks(qs, 'home_runs'),
+                    [3, 2, 5, 1, 6, 4, 7]
+                )
+            querysets.ENABLED = True
+
+            # The database does the work when it's able to, as long as
+            # the rows haven't been loaded already
+            qs = QuerysetPlayer.objects.all()
+            if getattr(connection.features, 'supports_over_clause', False):
+                self.assertNotEqual(
+                    querysets.ordinal_ranks(qs, 'home_runs'),
+                    querysets.UNSUPPORTED
+                )
+            self.assertNotEqual(
+                querysets.competition_rank(qs, qs[0], 'home_runs'),
+                querysets.UNSUPPORTED
+            )
+
+            # And comes up with the same answers as Python
+            for qs in [
+                QuerysetPlayer.objects.all(),
+                QuerysetPlayer.objects.order_by('name'),
+                QuerysetPlayer.objects.order_by('-home_runs'),
+                QuerysetPlayer.objects.filter(home_runs__gt=610),
+            ]:
+                obj_list = list(qs.all())
+                for direction in ['desc', 'asc']:
+                    results = []
+                    for enabled in [True, False]:
+                        querysets.ENABLED = enabled
+                        results.append([
+                            calculate.competition_ranks(
+                                qs.all(),
+                                'home_runs',
+                                direction
+                            ),
+                            calculate.ordinal_ranks(
+                                qs.all(),
+                                'home_runs',
+                                direction
+                            ),
+                            [
+                                calculate.competition_rank(
+                                    qs.all(),
+                                    obj,
+                                    'home_runs',
+                                    direction
+                                )
+                                for obj in obj_list
+                            ],
+                            [
+                                calculate.ordinal_rank(
+                                    qs.all(),
+                                    obj,
+                                    'home_runs',
+                                    direction
+                                )
+                                for obj in obj_list
+                            ],
+                        ])
+                    self.assertEqual(results[0], results[1])
+        finally:
+            querysets.ENABLED = True
+            with connection.schema_editor() as editor:
+                editor.delete_model(QuerysetPlayer)
+
+    def test_querysets_points(self):
+        from django.db import connection
+        from calculate import querysets
+
+        # The coordinates can only be pulled out by a spatial database
+        if not getattr(connection.features, 'gis_enabled', False):
+            return
+
+        class QuerysetPoint(models.Model):
+            name = models.CharField(max_length=30)
+            point = models.PointField(srid=4326)
+
+        with connection.schema_editor() as editor:
+            editor.create_model(QuerysetPoint)
+        try:
+            for i, xy in enumerate([
+                (-118.2, 34.1),
+                (-118.3, 34.2),
+                (-118.2, 34.1),
+                (-118.25, 34.05),
+                (-118.3, 34.2),
+                (-118.2, 34.1),
+            ]):
+                QuerysetPoint.objects.create(
+                    name=str(i),
+                    point=Point(xy[0], xy[1], srid=4326)
+                )
+            self.assertNotEqual(
+                querysets.mean_xy(QuerysetPoint.objects.all(), 'point'),
+                querysets.UNSUPPORTED
+            )
+            self.assertEqual(
+                [obj.name for obj in querysets.shared_points(
+                    QuerysetPoint.objects.order_by('-name'),
+                    'point'
+                )],
+                ['5', '4', '2', '1', '0']
+            )
+            for qs in [
+                QuerysetPoint.objects.all(),
+                QuerysetPoint.objects.order_by('-name'),
+            ]:
+                results = []
+                for enabled in [True, False]:
+                    querysets.ENABLED = enabled
+                    center = calculate.mean_center(qs)
+                    results.append([
+                        center.x,
+                        center.y,
+                        calculate.standard_deviation_distance(qs),
+                    ])
+                    results.append([
+                        (obj.name, obj.point.x, obj.point.y)
+                        for obj in calculate.nudge_points(
+                            qs,
+                            changed_only=True
+                        )
+                    ])
+                for database, python in zip(results[0], results[2]):
+                    self.assertAlmostEqual(database, python)
+                self.assertEqual(results[1], results[3])
+        finally:
+            querysets.ENABLED = True
+            with connection.schema_editor() as editor:
+                editor.delete_model(QuerysetPoint)
+
     def test_random_point(self):
         ymin, xmin = 34.03743993275203, -118.27177047729492
         ymax, xmax = 34.0525171958097, -118.22404861450195
@@ -569,12 +1696,352 @@ class CalculateTest(BaseTest):
         self.assertEqual(random_point.x > xmin, True)
         self.assertEqual(random_point.y < ymax, True)
         self.assertEqual(random_point.y > ymin, True)
+        # A GeoDjango Point comes back when GeoDjango is installed
+        from calculate import geometry
+        if calculate.HAS_GEODJANGO:
+            self.assertEqual(type(random_point), Point)
+        else:
+            self.assertEqual(type(random_point), geometry.XY)
+
+    def test_random_points(self):
+        from calculate import geometry, numpy_backend
+        # A square with a square hole, plus a separate triangle
+        polygon = [
+            [
+                [(0, 0), (10, 0), (10, 10), (0, 10), (0, 0)],
+                [(2, 2), (8, 2), (8, 8), (2, 8)],
+            ],
+            [
+                [(20, 0), (30, 0), (20, 10)],
+            ],
+        ]
+
+        def inside(x, y):
+            if 0 <= x <= 10 and 0 <= y <= 10:
+                return not (2 < x < 8 and 2 < y < 8)
+            return x >= 20 and y >= 0 and x + y <= 30 + 1e-9
+
+        try:
+            for enabled in [True, False]:
+                numpy_backend.ENABLED = enabled
+                coords = calculate.random_points(polygon, 2000, seed=1)
+                self.assertEqual(len(coords), 4000)
+                self.assertEqual(
+                    coords,
+                    calculate.random_points(polygon, 2000, seed=1)
+                )
+                xs = coords[0::2]
+                ys = coords[1::2]
+                self.assertTrue(all(inside(x, y) for x, y in zip(xs, ys)))
+                # The triangle has 50 of the 114 units of area
+                share = sum(1 for x in xs if x >= 20) / 2000.0
+                self.assertTrue(0.4 < share < 0.48)
+                # A triangle's centroid is a third of the way up
+                triangle = calculate.random_points(polygon[1], 2000, seed=1)
+                self.assertTrue(3.1 < calculate.mean(triangle[1::2]) < 3.6)
+        finally:
+            numpy_backend.ENABLED = True
+
+        # A seed gives the same points with or without NumPy
+        coords = calculate.random_points(polygon, 500, seed=7)
+        try:
+            numpy_backend.ENABLED = False
+            self.assertEqual(
+                calculate.random_points(polygon, 500, seed=7),
+                coords
+            )
+        finally:
+            numpy_backend.ENABLED = True
+
+        points = calculate.random_points(polygon[1][0], 3, as_points=True)
+        self.assertEqual(len(points), 3)
+        self.assertEqual(type(points[0]), geometry.XY)
+        self.assertEqual(len(calculate.random_points(polygon, 0)), 0)
+        self.assertRaises(ValueError, calculate.random_points, polygon, -1)
+        self.assertRaises(
+            ValueError,
+            calculate.random_points,
+            [(0, 0), (1, 1), (2, 2)],
+            10
+        )
+        self.assertRaises(ValueError, calculate.random_points, [], 10)
 
     def test_range(self):
         self.assertEqual(calculate.range([1, 2, 3]), 2)
         self.assertRaises(ValueError, calculate.range, ['a', 1, 2])
         self.assertRaises(ValueError, calculate.range, [1])
 
+    def test_rank_index(self):
+        from calculate import rank_index
+        dict_list = [
+            {'name': 'Joan', 'value': 1},
+            {'name': 'Jane', 'value': 2},
+            {'name': 'Mary', 'value': 2},
+            {'name': 'Josh', 'value': 3},
+        ]
+        index = calculate.RankIndex(dict_list, 'value')
+        self.assertEqual(len(index), 4)
+        self.assertEqual(
+            [index.competition_rank(d) for d in dict_list],
+            [4, 2, 2, 1]
+        )
+        self.assertEqual(
+            [index.ordinal_rank(d) for d in dict_list],
+            [4, 2, 3, 1]
+        )
+        self.assertEqual(index.rank_value(2.5), 2)
+        self.assertEqual(index.ordinal_rank_value(2, 1), 2)
+        self.assertEqual(index.ordinal_rank_value(2, 2), 3)
+        self.assertEqual(index.ordinal_rank_value(2, 4), 4)
+        self.assertEqual(index.percentile(2), 75.0)
+        self.assertEqual(index.percentile(2, kind='strict'), 25.0)
+        self.assertEqual(index.percentile(2, kind='mean'), 50.0)
+        self.assertEqual(calculate.percentile(index, 2), 75.0)
+        self.assertEqual(calculate.percentile_many(index, [1, 3]),
+                         [25.0, 100.0])
+        self.assertEqual(calculate.decile(index, 2), 8)
+        self.assertEqual(index.at_percentile(50), 2.0)
+        self.assertEqual(calculate.at_percentile(index, [0, 100]), [1.0, 3.0])
+        self.assertEqual(list(index.values), [1, 2, 2, 3])
+
+        # Changes are picked up without starting over
+        dict_list[0]['value'] = 5
+        index.update(dict_list[0])
+        self.assertEqual(index.ordinal_rank(dict_list[0]), 1)
+        self.assertEqual(index.ordinal_rank(dict_list[3]), 2)
+        # Ties stay in the order the objects were added
+        dict_list[3]['value'] = 2
+        index.update(dict_list[3])
+        self.assertEqual(index.ordinal_rank(dict_list[3]), 4)
+        self.assertEqual(index.competition_rank(dict_list[3]), 2)
+        index.remove(dict_list[1])
+        self.assertFalse(dict_list[1] in index)
+        self.assertEqual(index.competition_rank(dict_list[1]), None)
+        self.assertRaises(ValueError, index.ordinal_rank, dict_list[1])
+        self.assertRaises(ValueError, index.remove, dict_list[1])
+        index.insert({'name': 'Lou', 'value': 0})
+        self.assertEqual(list(index.values), [0, 2, 2, 5])
+        index_asc = calculate.RankIndex(dict_list, 'value', direction='asc')
+        self.assertEqual(index_asc.ordinal_rank(dict_list[2]), 2)
+        self.assertRaises(ValueError, calculate.RankIndex, [], 'value', 'up')
+
+        # Plain values, matched up by equality
+        index = calculate.RankIndex([3, 1, 2, 3])
+        self.assertEqual(index.competition_rank(3), 1)
+        self.assertEqual(index.ordinal_rank(2), 3)
+        index.remove(3)
+        self.assertEqual(index.ordinal_rank(3), 1)
+        self.assertTrue(3 in index)
+
+        # Lots of changes, with the buckets kept small so they have
+        # to be split up and dropped along the way
+        try:
+            rank_index.LOAD = 4
+            values = [random.randint(0, 20) for i in range(50)]
+            objs = [{'value': v} for v in values]
+            index = calculate.RankIndex(objs, 'value', direction='asc')
+            for i in range(300):
+                if i % 3 == 0 and objs:
+                    index.remove(objs.pop(random.randrange(len(objs))))
+                elif i % 3 == 1:
+                    objs.append({'value': random.randint(0, 20)})
+                    index.insert(objs[-1])
+                else:
+                    obj = random.choice(objs)
+                    obj['value'] = random.randint(0, 20)
+                    index.update(obj)
+                self.assertEqual(
+                    list(index.values),
+                    sorted(o['value'] for o in objs)
+                )
+            self.assertEqual(
+                [index.ordinal_rank(o) for o in objs],
+                calculate.ordinal_ranks(objs, 'value', direction='asc')
+            )
+            self.assertEqual(
+                [index.competition_rank(o) for o in objs],
+                calculate.competition_ranks(objs, 'value', direction='asc')
+            )
+        finally:
+            rank_index.LOAD = 1000
+
+    def test_sample(self):
+        from array import array
+        from calculate import numpy_backend, sample
+        data = [random.uniform(0, 100) for i in range(501)]
+        s = calculate.Sample(data)
+        self.assertEqual(len(s), 501)
+        self.assertEqual(list(s.values), sorted(data))
+        self.assertEqual(calculate.median(s), calculate.median(data))
+        self.assertEqual(s.median(), calculate.median(data))
+        self.assertEqual(
+            calculate.at_percentile(s, [0, 10, 33.3, 50, 99, 100]),
+            calculate.at_percentile(data, [0, 10, 33.3, 50, 99, 100])
+        )
+        self.assertEqual(
+            s.at_percentile(25, interpolation='lower'),
+            calculate.at_percentile(data, 25, interpolation='lower')
+        )
+        self.assertEqual(
+            calculate.percentile(s, data[7]),
+            calculate.percentile(data, data[7])
+        )
+        self.assertEqual(
+            calculate.decile(s, data[7]),
+            calculate.decile(data, data[7])
+        )
+        self.assertEqual(
+            calculate.equal_sized_breakpoints(s, 4),
+            calculate.equal_sized_breakpoints(data, 4)
+        )
+        even = calculate.Sample(array('i', [4, 1, 3, 2]))
+        self.assertEqual(calculate.median(even), 2.5)
+        self.assertRaises(ValueError, calculate.Sample, ['a', 1])
+
+        # The cache sorts each list once
+        cache = calculate.SampleCache(max_values=1100)
+        self.assertTrue(cache.get(data) is cache.get(data))
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.size, 501)
+        # A changed list is sorted again
+        first = cache.get(data)
+        data.append(1000.0)
+        self.assertFalse(cache.get(data) is first)
+        data.pop()
+        # The least recently used samples are dropped to make room
+        other = list(range(400))
+        cache.get(data)
+        cache.get(other)
+        self.assertEqual(cache.size, 901)
+        self.assertEqual(len(cache), 2)
+        self.assertTrue(cache.get(data) is first)
+        # Iterators aren't kept
+        cache.get(iter(other))
+        self.assertEqual(len(cache), 2)
+        # Too big to keep at all
+        self.assertEqual(len(cache.get(list(range(2000)))), 2000)
+        self.assertEqual(len(cache), 2)
+        cache.invalidate(data)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.size, 400)
+        cache.invalidate()
+        self.assertEqual((len(cache), cache.size), (0, 0))
+
+        # The functions can share one
+        try:
+            sample.CACHE = calculate.SampleCache()
+            self.assertEqual(calculate.median(data), s.median())
+            self.assertEqual(len(sample.CACHE), 1)
+            calculate.at_percentile(data, 25)
+            calculate.percentile(data, 50)
+            calculate.equal_sized_breakpoints(data, 3)
+            self.assertEqual(len(sample.CACHE), 1)
+            self.assertEqual(calculate.median(iter([1, 2, 3])), 2)
+            self.assertEqual(len(sample.CACHE), 1)
+
+            # Changes are caught even when Python's hash misses them,
+            # since hash(-1) == hash(-2)
+            data = [-1, 5, 7]
+            self.assertEqual(calculate.at_percentile(data, 0), -1.0)
+            data[0] = -2
+            self.assertEqual(calculate.at_percentile(data, 0), -2.0)
+
+            # Buffers that skip over values are checksummed too
+            strided = memoryview(array('d', [5, 0, 1, 0, 3, 0]))[::2]
+            self.assertEqual(calculate.median(strided), 3.0)
+            self.assertAlmostEqual(calculate.percentile(strided, 3), 200 / 3.0)
+            strided[1] = 9
+            self.assertEqual(calculate.median(strided), 5.0)
+            if numpy_backend.HAS_NUMPY:
+                import numpy
+                strided = numpy.arange(10.)[::2]
+                self.assertEqual(calculate.median(strided), 4.0)
+                self.assertEqual(calculate.percentile(strided, 4), 60.0)
+                self.assertEqual(calculate.at_percentile(strided, 100), 8.0)
+        finally:
+            sample.CACHE = None
+
+    def test_selection(self):
+        from calculate import selection
+        self.assertEqual(selection.select([5, 1, 4, 2, 3], 1), 2)
+        self.assertEqual(
+            selection.select_many([5, 1, 4, 2, 3], [4, 0, 2]),
+            [5, 1, 3]
+        )
+        data = [(i * 7919) % 10007 for i in range(10007)]
+        expected = sorted(data)
+        positions = [0, 17, 5003, 10006]
+        self.assertEqual(
+            selection.select_many(data, positions),
+            [expected[i] for i in positions]
+        )
+        self.assertEqual(len(data), 10007)
+        self.assertEqual(
+            selection.select_many(data, list(range(0, 10007, 1000))),
+            expected[::1000]
+        )
+        self.assertEqual(
+            selection.select(data, 5003, overwrite=True),
+            expected[5003]
+        )
+        self.assertEqual(data, [])
+        self.assertRaises(IndexError, selection.select, [1, 2, 3], 3)
+        self.assertRaises(IndexError, selection.select, [], 0)
+
+    def test_sketch(self):
+        data = [(i * 7919) % 10007 for i in range(10007)]
+        sketch = calculate.QuantileSketch(iter(data), k=100, seed=1)
+        self.assertEqual(len(sketch), 10007)
+        self.assertEqual(sketch.minimum, 0)
+        self.assertEqual(sketch.maximum, 10006)
+        # Small sketches are exact
+        small = calculate.QuantileSketch([1, 2, 3, 4])
+        self.assertEqual(calculate.at_percentile(small, 75), 3.25)
+        self.assertEqual(calculate.median(small), 2.5)
+        self.assertEqual(calculate.percentile(small, 3), 75)
+        # Big ones should land within a couple of points
+        for p in [1, 10, 25, 50, 75, 90, 99]:
+            value = calculate.at_percentile(sketch, p)
+            self.assertTrue(
+                abs(calculate.percentile(data, value) - p) < 2.5
+            )
+            self.assertTrue(
+                abs(calculate.percentile(sketch, p * 100.06) - p) < 2.5
+            )
+        self.assertEqual(calculate.at_percentile(sketch, [0, 100]), [0, 10006])
+        breaks = calculate.equal_sized_breakpoints(sketch, 4)
+        self.assertEqual(len(breaks), 5)
+        self.assertEqual(breaks[0], 0)
+        self.assertEqual(breaks[-1], 10006)
+        self.assertTrue(abs(calculate.median(sketch) - 5003) < 250)
+        # Serialize and merge
+        copy = calculate.QuantileSketch.from_bytes(sketch.to_bytes())
+        self.assertEqual(copy.to_bytes(), sketch.to_bytes())
+        self.assertEqual(calculate.median(copy), calculate.median(sketch))
+        other = calculate.QuantileSketch(range(10007, 20014), k=100, seed=2)
+        copy.merge(other)
+        self.assertEqual(len(copy), 20014)
+        self.assertEqual(copy.maximum, 20013)
+        self.assertTrue(abs(calculate.median(copy) - 10006) < 500)
+        self.assertRaises(ValueError, calculate.QuantileSketch, ['a', 1])
+        self.assertRaises(ValueError, calculate.QuantileSketch, k=2)
+        # Sketches with different capacities can't be mixed
+        self.assertRaises(
+            ValueError,
+            sketch.merge,
+            calculate.QuantileSketch([1, 2, 3], k=200)
+        )
+        # Empty sketches have nothing to estimate
+        empty = calculate.QuantileSketch()
+        self.assertRaises(ValueError, calculate.percentile, empty, 3)
+        self.assertRaises(ValueError, calculate.at_percentile, empty, 50)
+        self.assertRaises(ValueError, calculate.median, empty)
+        self.assertRaises(
+            ValueError,
+            calculate.QuantileSketch.from_bytes,
+            b'nope' + sketch.to_bytes()[4:]
+        )
+
     def test_split_at_breakpoints(self):
         l = list(range(1, 31))
         bp = calculate.equal_sized_breakpoints(l, 5)
@@ -589,6 +2056,44 @@ class CalculateTest(BaseTest):
                 [25, 26, 27, 28, 29, 30]
             ]
         )
+        self.assertEqual(
+            calculate.split_at_breakpoints([30, 7, 1, 12], bp),
+            [[1], [7, 12], [], [], [30]]
+        )
+        # Each group comes back sorted
+        self.assertEqual(
+            calculate.split_at_breakpoints([30, 12, 1, 7, 26, 25], bp),
+            [[1], [7, 12], [], [], [25, 26, 30]]
+        )
+        self.assertEqual(
+            calculate.split_at_breakpoints(
+                (i for i in [30, 7, 1, 12]),
+                bp,
+                indexes=True
+            ),
+            [4, 1, 0, 1]
+        )
+        # Neither list should be touched
+        data, breaks = [3, 1, 2], [3, 1, 2]
+        calculate.split_at_breakpoints(data, breaks)
+        self.assertEqual(data, [3, 1, 2])
+        self.assertEqual(breaks, [3, 1, 2])
+        self.assertEqual(
+            calculate.split_at_breakpoints([1, 2, 3], [1, 1, 3]),
+            [[], [1, 2, 3]]
+        )
+        self.assertRaises(
+            ValueError,
+            calculate.split_at_breakpoints,
+            [0, 1, 2],
+            bp,
+        )
+        self.assertRaises(
+            ValueError,
+            calculate.split_at_breakpoints,
+            [31],
+            bp,
+        )
         self.assertRaises(
             Exception,
             calculate.split_at_breakpoints,
@@ -602,6 +2107,117 @@ class CalculateTest(BaseTest):
             ['foo', 'bar', 'baz'],
         )
 
+    def test_standard_deviational_ellipse(self):
+        import math
+        from calculate import geometry, numpy_backend
+        ellipse = calculate.standard_deviational_ellipse(
+            [(0, 0), (1, 1), (2, 2)]
+        )
+        self.assertEqual(ellipse.center, geometry.XY(1.0, 1.0))
+        self.assertAlmostEqual(ellipse.major_axis, math.sqrt(4 / 3.0))
+        self.assertAlmostEqual(ellipse.minor_axis, 0)
+        self.assertAlmostEqual(ellipse.rotation, math.pi / 4)
+
+        # A cross that's twice as wide as it is tall, then turned upright
+        cross = [(-2, 0), (2, 0), (0, -1), (0, 1)]
+        ellipse = calculate.standard_deviational_ellipse(
+            cross,
+            standard_deviations=2
+        )
+        self.assertAlmostEqual(ellipse.major_axis, 2 * math.sqrt(2))
+        self.assertAlmostEqual(ellipse.minor_axis, 2 * math.sqrt(0.5))
+        self.assertAlmostEqual(ellipse.rotation, 0)
+        ellipse = calculate.standard_deviational_ellipse(
+            [(y, x) for x, y in cross]
+        )
+        self.assertAlmostEqual(ellipse.rotation, math.pi / 2)
+
+        # Weights count the same as repeating a point
+        records = [
+            {'point': (0, 0), 'weight': 2},
+            {'point': (3, 1), 'weight': 1},
+            {'point': (1, 4), 'weight': 1},
+        ]
+        weighted = calculate.standard_deviational_ellipse(
+            records,
+            weight='weight'
+        )
+        repeated = calculate.standard_deviational_ellipse(
+            [(0, 0), (0, 0), (3, 1), (1, 4)]
+        )
+        for a, b in zip(weighted[1:], repeated[1:]):
+            self.assertAlmostEqual(a, b)
+        self.assertAlmostEqual(weighted.center.x, repeated.center.x)
+
+        # Coordinates, with and without NumPy
+        xs = [random.uniform(-5, 5) for i in range(200)]
+        ys = [x * 0.5 + random.uniform(-1, 1) for x in xs]
+        weights = [random.random() for i in range(200)]
+        expected = calculate.standard_deviational_ellipse(
+            [{'point': (x, y), 'w': w} for x, y, w in zip(xs, ys, weights)],
+            weight='w'
+        )
+        try:
+            import numpy
+            for enabled in [True, False]:
+                numpy_backend.ENABLED = enabled
+                ellipse = calculate.standard_deviational_ellipse(
+                    calculate.Coordinates(numpy.array(xs), numpy.array(ys)),
+                    weight=numpy.array(weights)
+                )
+                for a, b in zip(ellipse[1:], expected[1:]):
+                    self.assertAlmostEqual(a, b)
+        except ImportError:
+            pass
+        finally:
+            numpy_backend.ENABLED = True
+
+        self.assertRaises(
+            ValueError,
+            calculate.standard_deviational_ellipse,
+            calculate.Coordinates(xs, ys),
+            weight=[1]
+        )
+        self.assertRaises(
+            ValueError,
+            calculate.standard_deviational_ellipse,
+            records,
+            standard_deviations=0
+        )
+        self.assertRaises(
+            ValueError,
+            calculate.standard_deviational_ellipse,
+            [{'point': (0, 0), 'weight': 0}],
+            weight='weight'
+        )
+
+    def test_standard_distance(self):
+        self.assertEqual(
+            calculate.standard_distance([(0, 0), (2, 0), (0, 2), (2, 2)]),
+            1.4142135623730951
+        )
+        self.assertEqual(calculate.standard_distance([(5, 5)]), 0)
+        self.assertAlmostEqual(
+            calculate.standard_distance(
+                [(0, 0), (3, 4)],
+                weight=lambda p: 3 if p == (0, 0) else 1
+            ),
+            calculate.standard_distance([(0, 0), (0, 0), (0, 0), (3, 4)])
+        )
+        # The sum of the squared ellipse axes
+        points = [(0, 0), (3, 1), (1, 4), (2, 2)]
+        ellipse = calculate.standard_deviational_ellipse(points)
+        self.assertAlmostEqual(
+            calculate.standard_distance(points) ** 2,
+            ellipse.major_axis ** 2 + ellipse.minor_axis ** 2
+        )
+        # Big coordinates don't lose precision
+        self.assertAlmostEqual(
+            calculate.standard_distance([(1e9, 1e9), (1e9 + 2, 1e9)]),
+            1.0
+        )
+        self.assertRaises(ValueError, calculate.standard_distance, [])
+
     def test_standard_deviation(self):
         self.assertEqual(
             calculate.standard_deviation([2, 3, 3, 4]),
@@ -662,6 +2278,30 @@ class CalculateTest(BaseTest):
             0.0003720200725858596
         )
 
+    def test_values_array(self):
+        from array import array
+        self.assertEqual(
+            calculate.values_array([1, 2.5, '3']),
+            array('d', [1, 2.5, 3])
+        )
+        self.assertEqual(
+            calculate.values_array((i for i in [1, None, 2]), skip_nulls=True),
+            array('d', [1, 2])
+        )
+        self.assertRaises(ValueError, calculate.values_array, [1, None])
+        self.assertRaises(ValueError, calculate.values_array, [1, [2]])
+        self.assertRaises(
+            ValueError,
+            calculate.values_array,
+            [{'value': 1}],
+            'value'
+        )
+        self.assertEqual(
+            calculate.median(calculate.values_array([3, 1, None, 2],
+                                                    skip_nulls=True)),
+            2
+        )
+
     def test_variation_coefficient(self):
         self.assertEqual(
             calculate.variation_coefficient([1, 2, -2, 4, -3]),
@@ -677,11 +2317,99 @@ class CalculateTest(BaseTest):
             ['a', 2, 3, 3, 4]
         )
 
+        # Without NumPy, buffers are read in place
+        from array import array
+        from calculate import numpy_backend
+        try:
+            numpy_backend.ENABLED = False
+            self.assertEqual(
+                calculate.variation_coefficient(array('i', [1, 2, -2, 4, -3])),
+                6.442049363362563
+            )
+        finally:
+            numpy_backend.ENABLED = True
+
+    def test_summary_accumulator(self):
+        data = [1, 2, -2, 4, -3, 4, 7.5]
+        acc = calculate.SummaryAccumulator(i for i in data)
+        self.assertEqual(acc.n, 7)
+        self.assertEqual(acc.mean, calculate.mean(data))
+        self.assertEqual(acc.median, calculate.median(data))
+        self.assertEqual(acc.mode, calculate.mode(data))
+        self.assertEqual(acc.range, calculate.range(data))
+        self.assertEqual(acc.minimum, -3)
+        self.assertEqual(acc.maximum, 7.5)
+        self.assertAlmostEqual(
+            acc.standard_deviation,
+            calculate.standard_deviation(data)
+        )
+        self.assertAlmostEqual(
+            acc.variation_coefficient,
+            calculate.variation_coefficient(data)
+        )
+        # Chunks merged together should match the whole
+        merged = calculate.SummaryAccumulator(data[:3])
+        merged.merge(calculate.SummaryAccumulator(data[3:]))
+        merged.merge(calculate.SummaryAccumulator())
+        self.assertEqual(merged.n, acc.n)
+        self.assertEqual(merged.median, acc.median)
+        self.assertEqual(merged.mode, acc.mode)
+        self.assertAlmostEqual(
+            merged.standard_deviation,
+            acc.standard_deviation
+        )
+        self.assertEqual(calculate.SummaryAccumulator([1, 2, 3]).mode, None)
+        self.assertEqual(calculate.SummaryAccumulator([1, 3, 2]).median, 2)
+        lean = calculate.SummaryAccumulator(data, counts=False)
+        self.assertEqual(lean.mean, acc.mean)
+        self.assertRaises(ValueError, getattr, lean, 'median')
+        self.assertRaises(ValueError, getattr, lean, 'mode')
+        self.assertRaises(
+            ValueError,
+            calculate.SummaryAccumulator,
+            ['a', 1, 2]
+        )
+        self.assertRaises(
+            ValueError,
+            getattr,
+            calculate.SummaryAccumulator([1]),
+            'range'
+        )
+
     def test_summary_stats(self):
         _stdout = sys.stdout
         sys.stdout = io.StringIO()
         calculate.summary_stats(list(range(1, 101)))
         sys.stdout = _stdout
+        stats = calculate.summary_stats(
+            (i for i in range(1, 101)),
+            verbose=False
+        )
+        self.assertEqual(stats.n, 100)
+        self.assertEqual(stats.mean, 50.5)
+        self.assertEqual(stats.median, 50.5)
+        self.assertEqual(stats.mode, None)
+        self.assertEqual(stats.maximum, 100)
+        self.assertEqual(stats.minimum, 1)
+        self.assertEqual(stats.range, 99)
+        self.assertAlmostEqual(stats.standard_deviation, 28.86607004772212)
+        self.assertEqual(stats._asdict()['n'], 100)
+
+        # The mode comes back just as it went in
+        stats = calculate.summary_stats([1, 3, 3, 2.5], verbose=False)
+        self.assertEqual(type(stats.mode), int)
+        self.assertEqual(str(stats.mode), '3')
+        stats = calculate.summary_stats([1, '3', '3', 3.0], verbose=False)
+        self.assertEqual(type(stats.mode), float)
+        self.assertEqual(
+            calculate.summary_stats([Decimal('1.5'), 2, 1.5],
+                                    verbose=False).mode,
+            Decimal('1.5')
+        )
+        from array import array
+        stats = calculate.summary_stats(array('i', [4, 4, 1]), verbose=False)
+        self.assertEqual(str(stats.mode), '4')
+        self.assertEqual(stats.median, 4.0)
 
 
 if __name__ == '__main__':
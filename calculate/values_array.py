@@ -0,0 +1,66 @@
+from array import array
+from calculate import querysets
+
+# How many rows to fetch from the database at a time
+CHUNK_SIZE = 2000
+
+
+def values_array(data_list, field=None, chunk_size=CHUNK_SIZE,
+                 skip_nulls=False):
+    """
+    Accepts a Django queryset and the name of a field. Returns the field's
+    values as a compact array of floats, ready to hand to calculate.mean,
+    calculate.median, calculate.percentile, calculate.summary_stats and
+    the rest.
+
+    Only that one column is fetched, "chunk_size" rows at a time, and no
+    model instances are made. Each value takes up eight bytes in the array,
+    rather than a Python object of its own, and NumPy can read it without
+    copying.
+
+    Querysets from values_list() with flat=True can be passed in without
+    a field. So can any other iterable of numbers.
+
+    Empty values raise a ValueError, unless the "skip_nulls" kwarg is True,
+    in which case they're left out.
+
+    h3. Example usage
+
+        >> import calculate
+        >> salaries = calculate.values_array(
+            Employee.objects.all(),
+            'salary',
+            skip_nulls=True
+        )
+        >> calculate.median(salaries)
+        54300.0
+        >> calculate.mean(salaries)
+        61342.87
+
+    h3. Documentation
+
+        * "QuerySet.iterator":https://docs.djangoproject.com/en/dev/ref/\
+models/querysets/#iterator
+    """
+    # Ask the database for just the one column, a chunk at a time
+    if querysets.is_queryset(data_list):
+        if field is not None:
+            data_list = data_list.values_list(field, flat=True)
+        data_list = data_list.iterator(chunk_size=chunk_size)
+    elif field is not None:
+        raise ValueError('A field can only be provided with a queryset')
+
+    # Pack the values into the array as they arrive
+    out_array = array('d')
+    append = out_array.append
+    try:
+        for value in data_list:
+            if value is None:
+                if skip_nulls:
+                    continue
+                raise ValueError('The values include a null. Set \
+skip_nulls to True to leave them out.')
+            append(float(value))
+    except TypeError:
+        raise ValueError('Input values should contain numbers')
+    return out_array
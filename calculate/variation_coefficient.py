@@ -1,4 +1,5 @@
 import calculate
+from calculate import columns, numpy_backend
 
 
 def variation_coefficient(data_list):
@@ -23,10 +24,15 @@ def variation_coefficient(data_list):
         * "coefficient of variation":http://en.wikipedia.org/wiki/\
 Coefficient_of_variation
     """
+    # Hand arrays and other buffers off to NumPy, if it's installed
+    array = numpy_backend.as_array(data_list)
+    if array is not None:
+        return numpy_backend.variation_coefficient(array)
+
     # Convert all the values to floats and test to make sure
     # there aren't any strings in there
     try:
-        data_list = list(map(float, data_list))
+        data_list = columns.floats(data_list)
     except ValueError:
         raise ValueError('Input values must contain numbers')
     std = calculate.standard_deviation(data_list)